@@ -6,10 +6,12 @@ from apigenerator.b_Workers.EnvironmentVariablesWorker import *
 from apigenerator.b_Workers.DirectoryManager import copy_domain_files
 from apigenerator.f_Builders.FlaskAdminBuilder import build_flask_admin_files
 from apigenerator.f_Builders.RedocBuilder import modify_redoc_related_files
+from apigenerator.f_Builders.ChangeFeedTriggersBuilder import build_change_feed_triggers_file
 
 
 def generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, db, db_params, base_project_exists,
-                             project_name, uid_type, db_secure_connection_params=None, db_authentication_method=None):
+                             project_name, uid_type, db_secure_connection_params=None, db_authentication_method=None,
+                             database_driver=None):
     try:
         print('Preparing to generate API...')
         proj_domain_folder = os.path.join(result_full_path, 'src', 'c_Domain')
@@ -23,9 +25,10 @@ def generate_python_rest_api(result_full_path, generated_domains_path, us_dateti
         # ---------------------------- Copying Database Files ---------------------------- #
         if not base_project_exists:
             if db_authentication_method:
-                install_database_files(result_full_path, db, script_absolute_path, db_authentication_method)
+                install_database_files(result_full_path, db, script_absolute_path, db_authentication_method,
+                                       database_driver)
             else:
-                install_database_files(result_full_path, db, script_absolute_path)
+                install_database_files(result_full_path, db, script_absolute_path, database_driver=database_driver)
 
         # ------------------------------------ Domain ------------------------------------ #
 
@@ -58,6 +61,9 @@ def generate_python_rest_api(result_full_path, generated_domains_path, us_dateti
         # ------------------------------------ Redoc -------------------------------------- #
         modify_redoc_related_files(
             result_full_path, proj_domain_folder, script_absolute_path)
+
+        # ---------------------------------- Change Feed ---------------------------------- #
+        build_change_feed_triggers_file(result_full_path, proj_domain_folder, db)
     except Exception as e:
         print(e)
         return
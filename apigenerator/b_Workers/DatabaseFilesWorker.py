@@ -6,13 +6,22 @@ directories = get_directory_data()
 db_dependencies = directories['db_dependencies']
 db_conn_files = directories['db_conn_files']
 db_conn_resolvers = directories['db_conn_resolvers']
+db_driver_conn_resolvers = directories['db_driver_conn_resolvers']
 
 
-def install_database_files(result_full_path, db, script_absolute_path, db_authentication_method=None):
+def install_database_files(result_full_path, db, script_absolute_path, db_authentication_method=None,
+                           database_driver=None):
 # Install database dependencies files, configures the database connection inside the application and their resolvers.
 
     print('installing selected database files and adding library to requirements...')
 
+    if not database_driver:
+        database_driver = get_default_database_driver()[db]
+
+    if database_driver not in get_database_driver_relation()[db]:
+        raise Exception(f"Database driver '{database_driver}' is not supported for '{db}' databases, supported "
+                        f"drivers are: {', '.join(get_database_driver_relation()[db])}")
+
     if db_authentication_method:
         copy_database_files(os.path.join(script_absolute_path, '{}/{}/{}'.format(db_conn_files, db, db_authentication_method)),
                             os.path.join(result_full_path, 'src', 'd_Repository', 'd_DbConnection'))
@@ -26,30 +35,40 @@ def install_database_files(result_full_path, db, script_absolute_path, db_authen
         copy_database_files(os.path.join(script_absolute_path, '{}/{}'.format(db_conn_resolvers, db)),
                             os.path.join(result_full_path, 'src', 'e_Infra', 'c_Resolvers'))
 
+    # Overriding default resolvers with the ones tuned for the selected driver, when available #
+    if os.path.exists(os.path.join(script_absolute_path, '{}/{}'.format(db_driver_conn_resolvers, database_driver))):
+        copy_database_files(os.path.join(script_absolute_path, '{}/{}'.format(db_driver_conn_resolvers, database_driver)),
+                            os.path.join(result_full_path, 'src', 'e_Infra', 'c_Resolvers'))
+
+    driver_requirement = get_database_driver_relation()[db][database_driver]
+
     if db == 'mysql':
         if 'ssh' in db_authentication_method:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymysql==1.1.0\nsshtunnel==0.4.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), f"{driver_requirement}\nsshtunnel==0.4.0")
         else:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymysql==1.1.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), driver_requirement)
+        modify_database_driver(result_full_path, "MySql", database_driver)
         modify_main_conn_resolver(result_full_path, "MySql", "mysql")
 
     if db == 'pgsql':
         if 'ssh' in db_authentication_method:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "psycopg2-binary==2.9.9\nsshtunnel==0.4.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), f"{driver_requirement}\nsshtunnel==0.4.0")
         else:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "psycopg2-binary==2.9.9")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), driver_requirement)
+        modify_database_driver(result_full_path, "PgSql", database_driver)
         modify_main_conn_resolver(result_full_path, "PgSql", "pgsql")
 
     if db == 'mssql':
         if 'ssh' in db_authentication_method:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymssql==2.2.11\nsshtunnel==0.4.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), f"{driver_requirement}\nsshtunnel==0.4.0")
         else:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymssql==2.2.11")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), driver_requirement)
         modify_main_conn_resolver(result_full_path, "MsSql", "mssql")
 
     if db == 'mariadb':
         if 'ssh' in db_authentication_method:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymysql==1.1.0\nsshtunnel==0.4.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), f"{driver_requirement}\nsshtunnel==0.4.0")
         else:
-            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), "pymysql==1.1.0")
+            append_database_library_to_requirements_file(os.path.join(result_full_path, "requirements.txt"), driver_requirement)
+        modify_database_driver(result_full_path, "MariaDb", database_driver)
         modify_main_conn_resolver(result_full_path, "MariaDb", "mariadb")
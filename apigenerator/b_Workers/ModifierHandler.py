@@ -1,6 +1,8 @@
 import os
+import re
 from os import listdir
 from apigenerator.g_Utils.OpenFileExeHandler import open
+from apigenerator.e_Enumerables.Enumerables import get_database_driver_replacements
 
 
 # Method modifies all operation files in a logical sequence #
@@ -41,6 +43,19 @@ def modify_main_conn_resolver(result_full_path, db_meta, db_string):
             main_conn_out.write(line)
 
 
+def modify_database_driver(result_full_path, db_meta, database_driver):
+    driver_replacements = get_database_driver_replacements().get(database_driver)
+    if not driver_replacements:
+        return
+    conn_file_path = os.path.join(result_full_path, 'src', 'd_Repository', 'd_DbConnection', db_meta + 'Connection.py')
+    with open(conn_file_path, "r") as conn_in:
+        content = conn_in.read()
+    for pattern, replacement in driver_replacements:
+        content = re.sub(pattern, replacement, content)
+    with open(conn_file_path, "w") as conn_out:
+        conn_out.write(content)
+
+
 def modify_domain_files_no_pk(result):
     for file in listdir(os.path.join(result, 'src', 'c_Domain')):
         if not file.startswith('_'):
@@ -6,6 +6,39 @@ def get_database_relation():
     return database_relation
 
 
+def get_database_driver_relation():
+    database_driver_relation = {
+        'mysql': {'pymysql': 'pymysql==1.1.0', 'mysqlclient': 'mysqlclient==2.2.4'},
+        'pgsql': {'psycopg2': 'psycopg2-binary==2.9.9', 'psycopg': 'psycopg[binary]==3.1.19'},
+        'mssql': {'pymssql': 'pymssql==2.2.11'},
+        'mariadb': {'pymysql': 'pymysql==1.1.0', 'mysqlclient': 'mysqlclient==2.2.4'}
+    }
+    return database_driver_relation
+
+
+def get_default_database_driver():
+    default_database_driver = {'mysql': 'pymysql', 'pgsql': 'psycopg2', 'mssql': 'pymssql', 'mariadb': 'pymysql'}
+    return default_database_driver
+
+
+# Replacements applied over the default connection files when a non default driver is selected #
+def get_database_driver_replacements():
+    database_driver_replacements = {
+        'mysqlclient': [
+            (r'# PyMysql Imports #', '# MySQLdb Imports #'),
+            (r'import pymysql', 'import MySQLdb'),
+            (r'mysql\+pymysql://', 'mysql+mysqldb://'),
+            (r"'ssl_verify_cert=true&' \\\s*\+ 'ssl_verify_identity=true'", "'ssl_check_hostname=true'")
+        ],
+        'psycopg': [
+            (r'# Psycopg2 Imports #', '# Psycopg Imports #'),
+            (r'import psycopg2', 'import psycopg'),
+            (r'postgresql\+psycopg2://', 'postgresql+psycopg://')
+        ]
+    }
+    return database_driver_replacements
+
+
 def get_directory_data():
     data = dict()
     data['domain_test_path'] = os.environ.get('domain_folder')
@@ -16,6 +49,7 @@ def get_directory_data():
     data['db_dependencies'] = "apigenerator/resources/1 - Project/2 - Database/database_dependencies/"
     data['db_conn_files'] = "apigenerator/resources/1 - Project/2 - Database/database_conn_files/"
     data['db_conn_resolvers'] = "apigenerator/resources/1 - Project/2 - Database/conn_resolvers/"
+    data['db_driver_conn_resolvers'] = "apigenerator/resources/1 - Project/2 - Database/driver_conn_resolvers/"
     return data
 
 
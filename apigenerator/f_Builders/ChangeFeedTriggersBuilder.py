@@ -0,0 +1,58 @@
+# System Imports #
+import os
+
+from apigenerator.a_Domain.SaMetaClass import get_sa_meta_class_attributes_object
+from apigenerator.b_Workers.DirectoryManager import get_domain_files_list
+
+
+# Trigger function notifying every row written on the change feed channel. Notifications are limited to 8000 bytes, #
+# so rows above it are notified with their primary key columns only, given as the trigger arguments #
+change_feed_function = """CREATE OR REPLACE FUNCTION pythonrest_notify_change() RETURNS trigger AS $$
+DECLARE
+    row_data jsonb;
+    payload text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+    payload := json_build_object('table', TG_TABLE_NAME, 'operation', lower(TG_OP), 'data', row_data)::text;
+    IF octet_length(payload) > 7900 THEN
+        SELECT json_build_object('table', TG_TABLE_NAME, 'operation', lower(TG_OP), 'truncated', true,
+                                 'data', coalesce(jsonb_object_agg(key, value), '{}'::jsonb))::text
+        INTO payload
+        FROM jsonb_each(row_data)
+        WHERE key = ANY(TG_ARGV);
+    END IF;
+    PERFORM pg_notify('pythonrest_change_feed', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+change_feed_trigger = """
+DROP TRIGGER IF EXISTS pythonrest_change_feed ON "{table_name}";
+CREATE TRIGGER pythonrest_change_feed AFTER INSERT OR UPDATE OR DELETE ON "{table_name}"
+    FOR EACH ROW EXECUTE PROCEDURE pythonrest_notify_change({primary_key_arguments});
+"""
+
+
+# Method writes the script installing the change feed triggers of every domain table, the ones the /<table>/_stream #
+# routes listen to when change_feed_source is notify. The script is run on the database by its owner, the API never #
+# changes the schema #
+def build_change_feed_triggers_file(result, domain_path, db):
+    if db != 'pgsql':
+        return
+    print('Creating change feed triggers script')
+    change_feed_script = change_feed_function
+    for domain in get_domain_files_list(domain_path):
+        sa_meta_class_attributes = get_sa_meta_class_attributes_object(domain_path, domain)
+        change_feed_script += change_feed_trigger.format(
+            table_name=sa_meta_class_attributes.meta_string,
+            primary_key_arguments=', '.join(
+                f"'{attr.row_attr}'" for attr in sa_meta_class_attributes.attr_list if attr.is_primary_key
+            )
+        )
+    with open(os.path.join(result, 'config', 'change_feed_triggers.sql'), 'w') as script_out:
+        script_out.write(change_feed_script)
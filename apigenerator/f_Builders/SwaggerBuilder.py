@@ -84,12 +84,15 @@ def build_swagger_yaml(script_absolute_path, domain_obj, data, id_from_file):
 
     # Iterating over attribute list #
     for attr in domain_obj.attr_list:
-        data['paths']["/" + domain_obj.meta_string.replace('_', '')]['get']['parameters'].append({"name": attr.row_attr,
-                                                                                                  "in": "query",
-                                                                                                  "schema": {
-                                                                                                  "type": attr.attr_type if hasattr(
-                                                                                                      attr,
-                                                                                                      'attr_type') else 'string'}})
+        # Set and aggregate routes share the same query filters #
+        for route_path in ("/" + domain_obj.meta_string.replace('_', ''),
+                           "/" + domain_obj.meta_string.replace('_', '') + "/_aggregate"):
+            data['paths'][route_path]['get']['parameters'].append({"name": attr.row_attr,
+                                                                   "in": "query",
+                                                                   "schema": {
+                                                                   "type": attr.attr_type if hasattr(
+                                                                       attr,
+                                                                       'attr_type') else 'string'}})
 
 
 def build_swagger_yaml_no_pk(script_absolute_path, domain_obj, data, id_from_file):
@@ -125,12 +128,15 @@ def build_swagger_yaml_no_pk(script_absolute_path, domain_obj, data, id_from_fil
 
     # Iterating over attribute list #
     for attr in domain_obj.attr_list:
-        data['paths']["/" + domain_obj.meta_string.replace('_', '')]['get']['parameters'].append({"name": attr.row_attr,
-                                                                                                  "in": "query",
-                                                                                                  "schema": {
-                                                                                                  "type": attr.attr_type if hasattr(
-                                                                                                      attr,
-                                                                                                      'attr_type') else 'string'}})
+        # Set and aggregate routes share the same query filters #
+        for route_path in ("/" + domain_obj.meta_string.replace('_', ''),
+                           "/" + domain_obj.meta_string.replace('_', '') + "/_aggregate"):
+            data['paths'][route_path]['get']['parameters'].append({"name": attr.row_attr,
+                                                                   "in": "query",
+                                                                   "schema": {
+                                                                   "type": attr.attr_type if hasattr(
+                                                                       attr,
+                                                                       'attr_type') else 'string'}})
 
 
 def modify_swagger_related_files(result, domain_path, script_absolute_path):
@@ -8,6 +8,8 @@ from src.a_Presentation.f_Redoc.RedocController import *
 from src.a_Presentation.b_Custom.FlaskAdminPanelController import *
 from src.a_Presentation.b_Custom.OptionsController import *
 from src.a_Presentation.b_Custom.SQLController import *
+from src.a_Presentation.b_Custom.MetricsController import *
+from src.a_Presentation.b_Custom.BatchController import *
 from src.a_Presentation.b_Custom.BeforeRequestController import *
 from src.a_Presentation.b_Custom.ExceptionHandlerController import *
 from src.a_Presentation.g_McpController.AskController import ask_bp
@@ -0,0 +1,14 @@
+# Flask Imports #
+from src.e_Infra.b_Builders.FlaskBuilder import *
+
+# Service Imports #
+from src.b_Application.b_Service.b_Custom.BatchService import *
+
+
+@app_handler.route('/_batch', methods=['POST'])
+def batch_route_post():
+    # Routing request to /_batch POST method #
+    result = execute_batch(
+        request.get_json(silent=True), {'HTTP_TRANSACTION': request.environ.get('HTTP_TRANSACTION')}
+    )
+    return result
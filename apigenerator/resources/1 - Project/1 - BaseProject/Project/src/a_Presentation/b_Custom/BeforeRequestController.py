@@ -8,6 +8,19 @@ from src.b_Application.b_Service.b_Custom.BeforeRequestService import *
 @app_handler.before_request
 def flask_before_request():
     try:
+        limit_user_request()
         print_user_request()
+        begin_idempotent_request()
+        admit_user_request()
     except ApplicationException as e:
         return e.response
+
+
+@app_handler.after_request
+def flask_after_request(response):
+    return release_admission_slot_on_close(compress_user_response(complete_idempotent_request(response)))
+
+
+@app_handler.teardown_request
+def flask_teardown_request(error=None):
+    release_user_request()
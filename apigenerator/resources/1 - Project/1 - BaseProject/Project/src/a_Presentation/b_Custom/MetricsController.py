@@ -0,0 +1,20 @@
+# Flask Imports #
+from src.e_Infra.b_Builders.FlaskBuilder import *
+
+# Infra Imports #
+from src.e_Infra.MetricsManager import get_metrics_snapshot, is_metrics_enabled
+from src.e_Infra.a_Handlers.SystemMessagesHandler import *
+
+# Builder Imports #
+from src.e_Infra.b_Builders.ProxyResponseBuilder import *
+
+
+@app_handler.route('/metrics', methods=['GET'])
+def metrics_route_get():
+    # Answering as an unknown route unless metrics are enabled #
+    if not is_metrics_enabled():
+        return build_proxy_response_insert_dumps(404, {
+            get_system_message('error_message'): get_system_message('route_not_found')
+        })
+    # Returning in-process metrics of the current worker #
+    return build_proxy_response_insert_dumps(200, get_metrics_snapshot())
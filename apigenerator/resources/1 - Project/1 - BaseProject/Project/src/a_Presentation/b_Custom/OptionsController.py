@@ -57,4 +57,11 @@ def apply_caching(response):
                 # If origin not allowed, don't set CORS headers at all
         
         response.headers["Access-Control-Allow-Headers"] = get_global_variable('headers')
+        # Browsers only let scripts read the total count and entity tag headers once exposed #
+        exposed_headers = [
+            header for header in ('X-Total-Count', 'X-Total-Count-Type', 'ETag', 'Last-Modified')
+            if header in response.headers
+        ]
+        if exposed_headers:
+            response.headers["Access-Control-Expose-Headers"] = ', '.join(exposed_headers)
     return response
\ No newline at end of file
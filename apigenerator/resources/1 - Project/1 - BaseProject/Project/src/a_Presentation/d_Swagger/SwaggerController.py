@@ -4,12 +4,17 @@ import yaml
 
 # Infra Imports #
 from src.e_Infra.b_Builders.FlaskBuilder import *
-from src.e_Infra.b_Builders.ApiSpecBuilder import build_swagger_html
+from src.e_Infra.b_Builders.ApiSpecBuilder import build_swagger_html, get_api_spec_page
 
 
 # /swagger route #
 @app_handler.route('/swagger', methods=['GET'])
 def swagger_ui():
+    return get_api_spec_page('swagger', build_swagger_page), 200, {'Content-Type': 'text/html'}
+
+
+# Method renders the Swagger page from the swagger file #
+def build_swagger_page():
     with open("config/swagger.yaml", "r") as yaml_file:
         data = yaml.safe_load(yaml_file)
 
@@ -18,4 +23,4 @@ def swagger_ui():
     data['servers'] = [{"url": ''}]
     swagger_json = json.dumps(data)
 
-    return render_template_string(build_swagger_html(api_title, swagger_json)), 200, {'Content-Type': 'text/html'}
+    return render_template_string(build_swagger_html(api_title, swagger_json))
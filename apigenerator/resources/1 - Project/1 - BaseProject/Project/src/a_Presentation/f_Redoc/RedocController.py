@@ -4,12 +4,17 @@ import yaml
 
 # Infra Imports #
 from src.e_Infra.b_Builders.FlaskBuilder import *
-from src.e_Infra.b_Builders.ApiSpecBuilder import build_redoc_html
+from src.e_Infra.b_Builders.ApiSpecBuilder import build_redoc_html, get_api_spec_page
 
 
 # /redoc route #
 @app_handler.route('/redoc', methods=['GET'])
 def redoc_ui():
+    return get_api_spec_page('redoc', build_redoc_page), 200, {'Content-Type': 'text/html'}
+
+
+# Method renders the Redoc page from the swagger file #
+def build_redoc_page():
     with open("config/swagger.yaml", "r") as yaml_file:
         data = yaml.safe_load(yaml_file)
 
@@ -17,4 +22,4 @@ def redoc_ui():
 
     redoc_json = json.dumps(data)
 
-    return render_template_string(build_redoc_html(api_title, redoc_json)), 200, {'Content-Type': 'text/html'}
+    return render_template_string(build_redoc_html(api_title, redoc_json))
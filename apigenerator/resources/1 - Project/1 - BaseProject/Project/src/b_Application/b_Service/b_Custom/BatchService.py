@@ -0,0 +1,157 @@
+# System Imports #
+import json
+
+# Flask Imports #
+from flask import g
+from src.e_Infra.b_Builders.FlaskBuilder import *
+
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.MainConnectionResolver import *
+
+# Handler Imports #
+from src.e_Infra.a_Handlers.SystemMessagesHandler import *
+from src.e_Infra.a_Handlers.ExceptionsHandler import *
+
+# Builder Imports #
+from src.e_Infra.b_Builders.ProxyResponseBuilder import *
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.ChangeFeedManager import deliver_change_event
+from src.e_Infra.EntityTagManager import bump_table_version
+
+
+# Methods of the operations a batch can carry #
+batch_operation_methods = ('GET', 'POST', 'PATCH', 'PUT', 'DELETE')
+
+
+def get_batch_max_operations():
+    batch_max_operations = get_global_variable('batch_max_operations')
+    return int(batch_max_operations) if batch_max_operations not in (None, '') else 100
+
+
+# Method validates the operations of a batch, raising the error of the first invalid one #
+def validate_batch_operations(request_data, transactional):
+    if not isinstance(request_data, list) or not request_data:
+        raise Exception('Batch body must be a non empty array of operations')
+    if len(request_data) > get_batch_max_operations():
+        raise Exception(f'Batch operations limit of {get_batch_max_operations()} exceeded')
+    for index, operation in enumerate(request_data):
+        if not isinstance(operation, dict) or set(operation) - {'method', 'path', 'headers', 'body'}:
+            raise Exception(f'Operation {index} must be an object with method, path, headers and body attributes')
+        if str(operation.get('method')).upper() not in batch_operation_methods:
+            raise Exception(f"Operation {index} method must be one of {', '.join(batch_operation_methods)}")
+        path = operation.get('path')
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise Exception(f'Operation {index} path must start with /')
+        route_path = path.split('?')[0]
+        if route_path == '/_batch' or route_path.endswith('/_stream'):
+            raise Exception(f'Operation {index} path {route_path} cannot be sent in a batch')
+        # /sql routes run on connections of their own, out of the batch transaction #
+        if transactional and route_path.startswith('/sql'):
+            raise Exception(f'Operation {index} path {route_path} cannot be sent in a transactional batch')
+        if not isinstance(operation.get('headers', dict()), dict):
+            raise Exception(f'Operation {index} headers must be an object')
+
+
+# Method dispatches an operation to its route in process, skipping the WSGI round trip and the before and after #
+# request handlers the batch request already went through. Each operation gets an application context of its own, #
+# so its teardown leaves the batch request admission slot alone #
+def dispatch_batch_operation(operation, batch_transaction):
+    path, _, query_string = operation['path'].partition('?')
+    headers = {key: str(value) for key, value in operation.get('headers', dict()).items()}
+    body = operation.get('body')
+    with app_handler.app_context(), app_handler.test_request_context(
+            path, method=operation['method'].upper(), query_string=query_string, headers=headers,
+            json=body if body is not None else None
+    ):
+        g.batch_transaction = batch_transaction
+        try:
+            if request.routing_exception is not None:
+                raise request.routing_exception
+            response = app_handler.make_response(
+                app_handler.view_functions[request.url_rule.endpoint](**request.view_args)
+            )
+        except Exception as e:
+            response = app_handler.make_response(app_handler.handle_user_exception(e))
+
+        response_body = response.get_data()
+        if response.is_json and response_body:
+            response_body = json.loads(response_body)
+        else:
+            response_body = response_body.decode('utf-8', 'replace') if response_body else None
+        return {
+            'Status': response.status_code,
+            'Headers': {key: value for key, value in response.headers.items()
+                        if key not in ('Content-Length', 'Content-Type')},
+            'Body': response_body
+        }
+
+
+# Method runs the operations of a batch in order, each one answered as if it had been sent on its own. #
+# Transactional batches run every operation in a single database transaction, each operation commit releasing a #
+# savepoint of it, and are committed only when every operation succeeds. The first failed operation rolls the #
+# whole batch back and the following ones are not run #
+def execute_batch(request_data, header_args):
+    transactional = str(header_args.get('HTTP_TRANSACTION')).lower() == 'true'
+    try:
+        validate_batch_operations(request_data, transactional)
+    except Exception as e:
+        return build_proxy_response_insert_dumps(400, {get_system_message('error_message'): e.args[0]})
+
+    if not transactional:
+        return build_proxy_response_insert_dumps(200, {
+            'Operations': [dispatch_batch_operation(operation, None) for operation in request_data]
+        })
+
+    # Connecting to database #
+    try:
+        main_connection_session = get_main_connection_session()
+        connection = main_connection_session.get_bind().connect()
+    except Exception as e:
+        return handle_custom_exception(get_system_message('invalid_connection_parameters'))
+
+    # The batch session replaces the thread session while the batch runs, so every operation writes through it #
+    previous_session = main_connection_session.registry() if main_connection_session.registry.has() else None
+    batch_transaction = {'change_events': list(), 'table_versions': set()}
+    operation_results = list()
+    committed = False
+    try:
+        transaction = connection.begin()
+        main_connection_session.registry.set(main_connection_session.session_factory(
+            bind=connection, join_transaction_mode='create_savepoint'
+        ))
+        for operation in request_data:
+            operation_result = dispatch_batch_operation(operation, batch_transaction)
+            operation_results.append(operation_result)
+            if operation_result['Status'] >= 400:
+                break
+        else:
+            main_connection_session.close()
+            transaction.commit()
+            committed = True
+        if not committed:
+            main_connection_session.close()
+            transaction.rollback()
+    except Exception as e:
+        return handle_custom_exception(e)
+    finally:
+        if previous_session is not None:
+            main_connection_session.registry.set(previous_session)
+        else:
+            main_connection_session.registry.clear()
+        connection.close()
+
+    if committed:
+        for table_name in batch_transaction['table_versions']:
+            bump_table_version(table_name)
+        for table_name, operation, object_dict_list in batch_transaction['change_events']:
+            for object_dict in object_dict_list:
+                deliver_change_event(table_name, operation, object_dict)
+
+    for _ in range(len(operation_results), len(request_data)):
+        operation_results.append({
+            'Status': 424, 'Headers': dict(),
+            'Body': {get_system_message('error_message'): get_system_message('batch_operation_not_run')}
+        })
+    return build_proxy_response_insert_dumps(200, {'Operations': operation_results, 'Committed': committed})
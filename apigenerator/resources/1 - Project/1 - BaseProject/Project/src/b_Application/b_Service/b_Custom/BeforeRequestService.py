@@ -2,13 +2,22 @@
 import json
 
 # Flask Imports #
-from flask import request
+from flask import request, g
 
 # Handler Imports #
 from src.e_Infra.a_Handlers.ApplicationExceptionClassHandler import *
 from src.e_Infra.a_Handlers.SystemMessagesHandler import *
 from src.e_Infra.a_Handlers.ExceptionsHandler import *
 
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.MainConnectionResolver import *
+
+# Infra Imports #
+from src.e_Infra.AdmissionControlManager import *
+from src.e_Infra.StatementTimeoutManager import *
+from src.e_Infra.CompressionManager import compress_response
+from src.e_Infra.IdempotencyManager import *
+
 
 def print_user_request():
     try:
@@ -28,3 +37,118 @@ def print_user_request():
         "Headers": dict(request.headers)
     }
     print(json.dumps(user_request, default=str))
+
+
+# Method resolves the request statement timeout and rate limits the client #
+def limit_user_request():
+    route_class = get_route_class(request.path, request.method)
+    if route_class is None:
+        return
+
+    # Resolving the statement timeout applied to every transaction begun by the request #
+    if is_statement_timeout_enabled() or request.environ.get('HTTP_TIMEOUT') is not None:
+        try:
+            g.statement_timeout_ms = get_statement_timeout(route_class, request.environ.get('HTTP_TIMEOUT'))
+        except Exception:
+            raise ApplicationException(build_proxy_response_insert_dumps(
+                400, {get_system_message('error_message'): get_system_message('malformed_header_params')}
+            ))
+
+    rate_limit_key_header = get_global_variable('rate_limit_key_header')
+    client_key = request.headers.get(rate_limit_key_header) if rate_limit_key_header else None
+    retry_after = consume_rate_limit_token(client_key or request.remote_addr or '')
+    if retry_after:
+        raise ApplicationException(build_proxy_response_retry_after(
+            429, {get_system_message('error_message'): get_system_message('rate_limit_exceeded')}, retry_after
+        ))
+
+
+# Method acquires a concurrency slot for the request route class. It runs once the request is known to be run, after #
+# its Idempotency-Key wait, so duplicates waiting for the first response hold no slot #
+def admit_user_request():
+    route_class = get_route_class(request.path, request.method)
+    if route_class is None:
+        return
+
+    admission = acquire_admission_slot(route_class)
+    if admission == 'rejected':
+        raise ApplicationException(build_proxy_response_retry_after(
+            503, {get_system_message('error_message'): get_system_message('server_busy')},
+            get_admission_retry_after()
+        ))
+    if admission == 'admitted':
+        g.admission_route_class = route_class
+
+
+# Method deduplicates the POST, PUT and PATCH requests sent with an Idempotency-Key header. Retries are answered with #
+# the stored response of the first request, without running again, while duplicates sent as it runs wait for it #
+def begin_idempotent_request():
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is None or request.method not in idempotent_methods or not is_idempotency_enabled():
+        return
+
+    store_key = f'{request.method} {request.path} {idempotency_key}'
+    # Import bodies are streamed to the database, so they are fingerprinted by their length instead of being read #
+    request_body = str(request.content_length).encode() if request.path.endswith('/_import') else request.get_data()
+    claim, stored_response = claim_idempotency_key(store_key, get_idempotency_fingerprint(
+        request.method, request.path, request.query_string, request_body
+    ))
+    if claim == 'claimed':
+        g.idempotency_store_key = store_key
+    elif claim == 'replay':
+        raise ApplicationException(build_proxy_response_idempotent_replay(
+            stored_response['status'], stored_response['headers'], stored_response['body']
+        ))
+    elif claim == 'mismatch':
+        raise ApplicationException(build_proxy_response_insert_dumps(
+            422, {get_system_message('error_message'): get_system_message('idempotency_key_mismatch')}
+        ))
+    else:
+        raise ApplicationException(build_proxy_response_retry_after(
+            409, {get_system_message('error_message'): get_system_message('idempotency_key_in_flight')}, 1
+        ))
+
+
+# Method stores the response of the request that claimed its Idempotency-Key, before it is compressed #
+def complete_idempotent_request(response):
+    store_key = g.pop('idempotency_store_key', None)
+    if store_key is not None:
+        if response.is_streamed:
+            release_idempotency_key(store_key)
+        else:
+            complete_idempotency_key(store_key, response.status_code, {
+                key: value for key, value in response.headers.items() if key != 'Content-Length'
+            }, response.get_data())
+    return response
+
+
+# Streamed responses are consumed after the request teardown, so their concurrency slot is released once the #
+# response is closed instead #
+def release_admission_slot_on_close(response):
+    if response.is_streamed:
+        route_class = g.pop('admission_route_class', None)
+        if route_class is not None:
+            response.call_on_close(lambda: release_admission_slot(route_class))
+    return response
+
+
+# Method releases the concurrency slot acquired by the request, if any, and ends its session transaction #
+def release_user_request():
+    # Requests ended by an unhandled error leave their Idempotency-Key claimed, it is released for their retries #
+    store_key = g.pop('idempotency_store_key', None)
+    if store_key is not None:
+        release_idempotency_key(store_key)
+    # Ending the request session transaction, so the next request begins a new one carrying its own timeout #
+    if g.pop('statement_timeout_ms', None) is not None:
+        try:
+            get_main_connection_session().close()
+        except Exception as e:
+            del e
+    route_class = g.pop('admission_route_class', None)
+    if route_class is not None:
+        release_admission_slot(route_class)
+
+
+# Method compresses the response with the encoding accepted by the client #
+def compress_user_response(response):
+    return compress_response(response, request.headers.get('Accept-Encoding'), request.method, request.path)
@@ -1,46 +1,45 @@
-# System Imports #
-import re
-
 # Resolver Imports #
 from src.e_Infra.c_Resolvers.MainConnectionResolver import *
+from src.e_Infra.c_Resolvers.SqlClassifierResolver import get_sql_query_verdict
 
 # Handler Imports #
 from src.e_Infra.a_Handlers.SystemMessagesHandler import *
 from src.e_Infra.a_Handlers.ExceptionsHandler import *
 
+# Infra Imports #
+from src.e_Infra.StatementTimeoutManager import is_statement_timeout_error, cancel_connection_statement
+from src.e_Infra.EntityTagManager import bump_table_version
+
 # Repository Imports #
-from src.d_Repository.GenericRepository import execute_sql_stored_procedure, get_result_list
+from src.d_Repository.GenericRepository import execute_sql_stored_procedure
+from src.d_Repository.b_Transactions.StoredProcedureTransaction import validate_stored_procedure_definitions
 
 # SqlAlchemy Imports #
 from sqlalchemy.sql import text
 
 
 # Method to validate if the query is using invalid SQL command and trying to run SQL Injections
-def validate_query_injection(reduced_query):
-    # Iterating over list of prohibited verbs #
-    for verb in black_list_sql_verbs():
-        # validating verb in query #
-        if is_verb(reduced_query, verb):
-            # Returning API built response #
-            return build_proxy_response_insert_dumps(
-                400, {
-                    get_system_message('error_message'): get_system_message('invalid_sql_injection')
-                }
-            )
+def validate_query_injection(query_verdict):
+    # Validating prohibited verbs in query #
+    if not query_verdict['words'].isdisjoint(black_list_sql_verbs()):
+        # Returning API built response #
+        return build_proxy_response_insert_dumps(
+            400, {
+                get_system_message('error_message'): get_system_message('invalid_sql_injection')
+            }
+        )
 
 
 # Method to validate if the query is using invalid SQL command for the request method
-def validate_query_method(reduced_query, method):
-    # Iterating over list of prohibited verbs #
-    for verb in black_list_method(method):
-        # validating verb in query #
-        if is_verb(reduced_query, verb):
-            # Returning API built response #
-            return build_proxy_response_insert_dumps(
-                400, {
-                    get_system_message('error_message'): get_system_message('invalid_sql_method')
-                }
-            )
+def validate_query_method(query_verdict, method):
+    # Validating prohibited verbs for request method in query #
+    if not query_verdict['words'].isdisjoint(black_list_method(method)):
+        # Returning API built response #
+        return build_proxy_response_insert_dumps(
+            400, {
+                get_system_message('error_message'): get_system_message('invalid_sql_method')
+            }
+        )
 
 
 # Method that executes a SQL query on database
@@ -56,11 +55,25 @@ def execute_query(request_args, method):
             }
         )
 
-    # Extracting reduced query for method validation #
-    reduced_query = reduce_query_statement(query)
+    if method == 'GET':
+        try:
+            # Retrieving row cap and result format for GET streamed results #
+            max_rows, result_format = get_query_stream_options(request_args)
+        except Exception:
+            return build_proxy_response_insert_dumps(
+                400, {
+                    get_system_message('error_message'): get_system_message('malformed_header_params')
+                }
+            )
+
+    try:
+        # Retrieving query verdict, repeated queries are classified only once #
+        query_verdict = get_sql_query_verdict(query)
+    except:
+        return handle_custom_exception(get_system_message('invalid_sql'))
 
     if method == 'PATCH' or method == 'DELETE':
-        if 'where' not in reduced_query:
+        if 'where' not in query_verdict['words']:
             return build_proxy_response_insert_dumps(
                 400, {
                     get_system_message('error_message'): get_system_message('where_is_required')
@@ -68,13 +81,13 @@ def execute_query(request_args, method):
             )
 
     try:
-        # Validating SQL injection in reduced query #
-        query_injection_error = validate_query_injection(reduced_query)
+        # Validating SQL injection in query verdict #
+        query_injection_error = validate_query_injection(query_verdict)
         if query_injection_error is not None:
             return query_injection_error
 
-        # Validating SQL verb in reduced query for HTTP method #
-        query_method_error = validate_query_method(reduced_query, method)
+        # Validating SQL verb in query verdict for HTTP method #
+        query_method_error = validate_query_method(query_verdict, method)
         if query_method_error is not None:
             return query_method_error
     except:
@@ -89,60 +102,146 @@ def execute_query(request_args, method):
     # Retrieving database engine #
     engine = connection_session.bind
 
-    # Open engine connection with database #
-    with engine.connect() as con:
-        # Executing query #
-        try:
+    # Open engine connection with database, GET connections are closed once their result is streamed #
+    con = engine.connect()
+    # Executing query #
+    try:
+        if method == 'GET':
+            # Using server-side cursors so rows are fetched from database while they are streamed #
+            result = con.execution_options(
+                stream_results=True, yield_per=get_sql_stream_chunk_size()
+            ).execute(text(query))
+        else:
             result = con.execute(text(query))
+            con.commit()
+            # Queries may write any table #
+            bump_table_version()
+    except Exception as e:
+        con.close()
+        error_kind_check = build_sql_error_table_does_not_exist(e.args[0])
+        if error_kind_check:
+            return build_proxy_response_insert_dumps(404, {get_system_message('error_message'):
+                                                           get_system_message(
+                'table_does_not_exist')})
+        error_kind_check = build_sql_error_invalid_syntax(e.args[0])
+        if error_kind_check:
+            return build_proxy_response_insert_dumps(400, {get_system_message('error_message'):
+                                                           get_system_message(
+                'invalid_syntax')})
+        error_kind_check = build_sql_error_duplicate_entry(e.args[0])
+        if error_kind_check is not None:
+            return build_proxy_response_insert_dumps(409, {get_system_message('error_message'):
+                                                           error_kind_check})
+        error_kind_check = build_sql_error_missing_foreign_key(e.args[0])
+        if error_kind_check is not None:
+            return build_proxy_response_insert_dumps(409, {get_system_message('error_message'):
+                                                           error_kind_check})
+        error_kind_check = build_sql_error_no_default_value(e.args[0])
+        if error_kind_check is not None:
+            return build_proxy_response_insert_dumps(400, {get_system_message('error_message'):
+                                                           error_kind_check})
+        if is_statement_timeout_error(e):
+            return build_proxy_response_insert_dumps(504, {get_system_message('error_message'):
+                                                           get_system_message('statement_timeout')})
+        return handle_custom_exception(get_system_message('invalid_sql'))
 
-            if method == 'GET':
-                pass
-            else:
-                con.commit()
-        except Exception as e:
-            error_kind_check = build_sql_error_table_does_not_exist(e.args[0])
-            if error_kind_check:
-                return build_proxy_response_insert_dumps(404, {get_system_message('error_message'):
-                                                               get_system_message(
-                    'table_does_not_exist')})
-            error_kind_check = build_sql_error_invalid_syntax(e.args[0])
-            if error_kind_check:
-                return build_proxy_response_insert_dumps(400, {get_system_message('error_message'):
-                                                               get_system_message(
-                    'invalid_syntax')})
-            error_kind_check = build_sql_error_duplicate_entry(e.args[0])
-            if error_kind_check is not None:
-                return build_proxy_response_insert_dumps(409, {get_system_message('error_message'):
-                                                               error_kind_check})
-            error_kind_check = build_sql_error_missing_foreign_key(e.args[0])
-            if error_kind_check is not None:
-                return build_proxy_response_insert_dumps(409, {get_system_message('error_message'):
-                                                               error_kind_check})
-            error_kind_check = build_sql_error_no_default_value(e.args[0])
-            if error_kind_check is not None:
-                return build_proxy_response_insert_dumps(400, {get_system_message('error_message'):
-                                                               error_kind_check})
-            return handle_custom_exception(get_system_message('invalid_sql'))
-
-        # Retrieving JSON if method is GET #
-        if method == 'GET':
-            # Retrieving result cursor #
-            cursor = result.cursor
+    # Streaming JSON if method is GET #
+    if method == 'GET':
+        return build_proxy_response_stream(
+            200, stream_query_result(con, result, max_rows, result_format),
+            sql_result_format_content_types[result_format],
+            {'X-Max-Rows': str(max_rows)} if max_rows is not None else None
+        )
+    else:
+        con.close()
+        # Building success message flask response #
+        return build_proxy_response_insert_dumps(
+            200, {
+                get_system_message('message'): get_system_message('query_success')
+            }
+        )
 
-            # Retrieving JSON result #
-            result = get_result_list(result, cursor)
 
-            # Building result flask response #
-            return build_proxy_response_insert_dumps(
-                200, result
-            )
-        else:
-            # Building success message flask response #
-            return build_proxy_response_insert_dumps(
-                200, {
-                    get_system_message('message'): get_system_message('query_success')
-                }
-            )
+# Content types of the /sql GET result formats #
+sql_result_format_content_types = {
+    'objects': 'application/json',
+    'compact': 'application/json',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def get_sql_stream_chunk_size():
+    sql_stream_chunk_size = get_global_variable('sql_stream_chunk_size')
+    return int(sql_stream_chunk_size) if sql_stream_chunk_size not in (None, '') else 500
+
+
+# Method retrieves the row cap (None meaning no cap) and result format of a /sql GET request #
+def get_query_stream_options(request_args):
+    sql_max_rows = get_global_variable('sql_max_rows')
+    max_rows = None if sql_max_rows in (None, '*') else int(sql_max_rows)
+
+    # Header row cap can only lower the configured one #
+    if request_args.get('HTTP_MAXROWS') is not None:
+        requested_max_rows = int(request_args['HTTP_MAXROWS'])
+        if requested_max_rows < 1:
+            raise ValueError('maxrows header must be greater than 0')
+        max_rows = requested_max_rows if max_rows is None else min(requested_max_rows, max_rows)
+
+    result_format = (request_args.get('HTTP_FORMAT') or 'objects').lower()
+    if result_format not in sql_result_format_content_types:
+        raise ValueError(f"format header must be one of {', '.join(sql_result_format_content_types)}")
+
+    return max_rows, result_format
+
+
+# Method streams a query result in chunks, as a JSON array of row objects, a compact JSON object of columns and #
+# rows or newline delimited row objects, closing the connection once done. When the row cap is reached or the #
+# client disconnects before the end, the running statement is cancelled #
+def stream_query_result(connection, result, max_rows, result_format):
+    row_count = 0
+    truncated = False
+    exhausted = False
+    try:
+        field_names = list(result.keys())
+        if result_format == 'objects':
+            yield '['
+        elif result_format == 'compact':
+            yield '{"columns": ' + json.dumps(field_names) + ', "rows": ['
+
+        chunk = list()
+        for row in result:
+            if max_rows is not None and row_count >= max_rows:
+                truncated = True
+                break
+            if result_format == 'compact':
+                row_json = json.dumps(list(row), default=str)
+            else:
+                row_json = json.dumps(dict(zip(field_names, row)), sort_keys=True, default=str)
+            if result_format == 'ndjson':
+                chunk.append(row_json + '\n')
+            else:
+                chunk.append(row_json if row_count == 0 else ',' + row_json)
+            row_count += 1
+            if len(chunk) >= get_sql_stream_chunk_size():
+                yield ''.join(chunk)
+                chunk = list()
+        exhausted = not truncated
+        yield ''.join(chunk)
+
+        if result_format == 'objects':
+            yield ']'
+        elif result_format == 'compact':
+            yield '], "truncated": ' + json.dumps(truncated) + '}'
+        elif truncated:
+            yield json.dumps({'truncated': True}) + '\n'
+    finally:
+        if not exhausted:
+            cancel_connection_statement(connection)
+        try:
+            result.close()
+        finally:
+            connection.close()
+        print_logs(json.dumps({"statusCode": 200, "body": f"{row_count} row(s) streamed", "truncated": truncated}))
 
 
 # Method that defines a list of forbidden SQL Data Definition Language (DDL) commands for all routes
@@ -170,33 +269,17 @@ def black_list_method(method):
         return ['insert', 'update']
 
 
-# Method to transform query into acceptable queries for databases (Possible work for MySQL Only)
-def reduce_query_statement(query):
-    # Convert query string different quotation marks to single one #
-    query = query.replace("\'", '"').replace('`', '"')
-    # list of all string inside quotation marks #
-    strings = re.findall('"([^"]*)"', query)
-    # Iterating over list of string #
-    for string in strings:
-        # Removing strings from query #
-        query = query.replace(f'"{string}"', "")
-    # Adapting reduced query with safe spaces and returning it #
-    return " " + query.replace(';', ' ; ').lower()
-
-
-# Method verifies SQL rules on query
-def is_verb(reduced_query, verb):
-    # Create a regular expression pattern for the verb with word boundaries
-    pattern = r'\b' + re.escape(verb) + r'\b'
-
-    # Search for the verb in the reduced_query using the pattern
-    match = re.search(pattern, reduced_query)
-
-    return match is not None
-
-
 # Method that executes a SQL stored procedure on database
 def execute_post_route_sql_stored_procedure(request_headers, request_body):
     stored_procedure_name = request_headers.get('HTTP_STOREDPROCEDURE')
     stored_procedure_params = json.loads(json.dumps(request_body))
-    return execute_sql_stored_procedure(stored_procedure_name, stored_procedure_params)
+    result_format = (request_headers.get('HTTP_FORMAT') or 'objects').lower()
+    try:
+        if result_format not in sql_result_format_content_types:
+            raise ValueError(f"format header must be one of {', '.join(sql_result_format_content_types)}")
+        validate_stored_procedure_definitions(stored_procedure_name, stored_procedure_params.get('out', {}))
+    except Exception as e:
+        return build_proxy_response_insert_dumps(400, {get_system_message('error_message'): str(e)})
+    return execute_sql_stored_procedure(
+        stored_procedure_name, stored_procedure_params, result_format, get_sql_stream_chunk_size()
+    )
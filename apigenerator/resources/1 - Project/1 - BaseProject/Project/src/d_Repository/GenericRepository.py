@@ -16,9 +16,25 @@ from src.e_Infra.b_Builders.ProxyResponseBuilder import *
 # Resolver Imports #
 from src.e_Infra.c_Resolvers.MainConnectionResolver import *
 
+# Infra Imports #
+from src.e_Infra.WriteCoalescerManager import is_write_coalescing_enabled, insert_coalesced_object
+from src.e_Infra.EntityTagManager import *
+
 # SqlAlchemy Imports #
 from sqlalchemy.sql import text
 
+# Transaction Imports #
+from src.d_Repository.b_Transactions.StoredProcedureTransaction import *
+from src.d_Repository.b_Transactions.TotalCountTransaction import select_all_object_list_with_total_count
+from src.d_Repository.b_Transactions.ExpandTransaction import dump_expanded_objects
+from src.d_Repository.b_Transactions.ChangesTransaction import *
+from src.d_Repository.b_Transactions.ChangeFeedTransaction import *
+from src.d_Repository.b_Transactions.ImportTransaction import *
+
+# System Imports #
+import itertools
+import time
+
 
 # Method retrieves an entity set by its given 'request_args' parameters #
 def get_all(declarative_meta, request_args, header_args):
@@ -32,13 +48,17 @@ def get_all(declarative_meta, request_args, header_args):
         )
 
         validate_request_data_object(
-            declarative_meta, request_args
+            declarative_meta, get_attribute_request_args(request_args)
         )
 
         validate_header_args(
             declarative_meta, header_args
         )
 
+        validate_expand_response_format(
+            header_args
+        )
+
     except Exception as e:
         return build_proxy_response_insert_dumps(
             400, {get_system_message('error_message'): e.args[0].replace(
@@ -52,25 +72,154 @@ def get_all(declarative_meta, request_args, header_args):
     except Exception as e:
         return handle_custom_exception(get_system_message('invalid_connection_parameters'))
 
+    # Answering up to date clients without querying the database #
+    version_entity_tag = get_version_entity_tag(declarative_meta, request_args, header_args)
+    if version_entity_tag is not None and is_not_modified(header_args, *version_entity_tag):
+        return build_proxy_response_not_modified(get_entity_tag_headers(*version_entity_tag))
+
     try:
+        response_format = get_response_format(header_args.get('HTTP_ACCEPT'))
+        total_count = None
         # Retrieving results #
-        result_set = select_all_objects(
-            declarative_meta, request_args, main_connection_session, header_args
-        )
-        if result_set == '[]':
-            # Return items not found when list is empty #
-            return build_proxy_response_insert_dumps(
+        if header_args.get('HTTP_TOTALCOUNT'):
+            result_set, total_count, total_count_type = select_all_object_list_with_total_count(
+                declarative_meta, request_args, main_connection_session, header_args
+            )
+            if response_format == 'objects':
+                result_set = dump_object_set(declarative_meta, result_set, main_connection_session, header_args)
+        elif response_format == 'objects':
+            result_set = dump_object_set(declarative_meta, select_all_object_list(
+                declarative_meta, request_args, main_connection_session, header_args
+            ), main_connection_session, header_args)
+        elif response_format not in row_count_response_formats:
+            # Rows are fetched from the database while they are streamed, the first chunk being read up front so an #
+            # empty set is still answered with 404 #
+            row_chunks = stream_all_object_rows(
+                declarative_meta, request_args, main_connection_session, header_args, get_response_stream_chunk_size()
+            )
+            first_row_chunk = next(row_chunks, None)
+            if first_row_chunk is None:
+                return build_proxy_response_insert_dumps(
+                    404, {get_system_message('error_message'): get_system_message('get_no_items_found')}
+                )
+            return apply_entity_tag(build_proxy_response_rows(
+                200, response_format, get_object_row_columns(declarative_meta, header_args),
+                itertools.chain([first_row_chunk], row_chunks), None
+            ), header_args, version_entity_tag)
+        else:
+            result_set = select_all_object_list(
+                declarative_meta, request_args, main_connection_session, header_args
+            )
+        if result_set == '[]' or len(result_set) == 0:
+            # Return items not found when list is empty, pages past the last row still telling the total count #
+            response = build_proxy_response_insert_dumps(
                 404, {get_system_message('error_message'): get_system_message('get_no_items_found')}
             )
+            if total_count:
+                response.headers['X-Total-Count'] = str(total_count)
+                response.headers['X-Total-Count-Type'] = total_count_type
+            return response
         else:
             # Otherwise, return API built response with items #
-            return build_proxy_response(
-                200, result_set
-            )
+            response = build_object_set_response(declarative_meta, result_set, header_args, response_format)
+            if total_count is not None:
+                response.headers['X-Total-Count'] = str(total_count)
+                response.headers['X-Total-Count-Type'] = total_count_type
+            return apply_entity_tag(response, header_args, version_entity_tag)
     except Exception as e:
         return handle_custom_exception(e)
 
 
+# Method retrieves aggregates (count, sum, avg, min and max) of an entity set filtered by its given 'request_args' #
+# parameters, grouped by the group by header attributes #
+def get_aggregate(declarative_meta, request_args, header_args):
+    try:
+        cast_request_args(
+            request_args, declarative_meta
+        )
+
+        cast_headers_args(
+            header_args
+        )
+
+        validate_request_data_object(
+            declarative_meta, get_attribute_request_args(request_args)
+        )
+
+        validate_header_args(
+            declarative_meta, header_args
+        )
+
+    except Exception as e:
+        return build_proxy_response_insert_dumps(
+            400, {get_system_message('error_message'): e.args[0].replace(
+                '__init__()', declarative_meta.__table__.name
+            )}
+        )
+
+    # Connecting to database #
+    try:
+        main_connection_session = get_main_connection_session()
+    except Exception as e:
+        return handle_custom_exception(get_system_message('invalid_connection_parameters'))
+
+    try:
+        response_format = get_response_format(header_args.get('HTTP_ACCEPT'))
+        aggregate_rows = select_aggregate_rows(
+            declarative_meta, request_args, main_connection_session, header_args
+        )
+        if response_format == 'objects':
+            response = build_proxy_response_insert_dumps(200, aggregate_rows)
+            response.headers['Vary'] = 'Accept'
+            return response
+        chunk_size = get_response_stream_chunk_size()
+        return build_proxy_response_rows(
+            200, response_format, get_aggregate_columns(header_args),
+            (aggregate_rows[index:index + chunk_size] for index in range(0, len(aggregate_rows), chunk_size)),
+            len(aggregate_rows)
+        )
+    except Exception as e:
+        return handle_custom_exception(e)
+
+
+# Streamed formats whose header carries the number of rows, so their rows are selected before being streamed #
+row_count_response_formats = ('msgpack',)
+
+
+def get_response_stream_chunk_size():
+    response_stream_chunk_size = get_global_variable('response_stream_chunk_size')
+    return int(response_stream_chunk_size) if response_stream_chunk_size not in (None, '') else 500
+
+
+# Expanded relationships are nested objects, which only the JSON format holds #
+def validate_expand_response_format(header_args):
+    if header_args.get('HTTP_EXPAND') and get_response_format(header_args.get('HTTP_ACCEPT')) != 'objects':
+        raise Exception('expand is only available on application/json responses')
+
+
+# Method dumps the selected objects into a JSON set with the projection schema, along with their expanded relationships #
+def dump_object_set(declarative_meta, object_list, session, header_args):
+    if header_args.get('HTTP_EXPAND'):
+        return json.dumps(dump_expanded_objects(
+            declarative_meta, object_list, session, header_args, get_batch_get_chunk_size()
+        ), default=str)
+    return get_projection_schema(declarative_meta, header_args).dumps(object_list)
+
+
+# Method builds a GET route response on the negotiated format, the JSON set already dumped by the domain schema or #
+# the selected objects streamed in chunks on any other format #
+def build_object_set_response(declarative_meta, result_set, header_args, response_format):
+    if response_format == 'objects':
+        response = build_proxy_response(200, result_set)
+        response.headers['Vary'] = 'Accept'
+        return response
+    return build_proxy_response_rows(
+        200, response_format, get_object_row_columns(declarative_meta, header_args),
+        iterate_object_rows(declarative_meta, result_set, get_response_stream_chunk_size(), header_args),
+        len(result_set)
+    )
+
+
 # Method retrieves a given entity by its given 'id' and 'request_args' parameters #
 def get_by_id(declarative_meta, id_value_list, request_args, id_name_list, header_args):
     try:
@@ -83,13 +232,17 @@ def get_by_id(declarative_meta, id_value_list, request_args, id_name_list, heade
         )
 
         validate_request_data_object(
-            declarative_meta, request_args
+            declarative_meta, get_attribute_request_args(request_args)
         )
 
         validate_header_args(
             declarative_meta, header_args
         )
 
+        validate_expand_response_format(
+            header_args
+        )
+
     except Exception as e:
         return build_proxy_response_insert_dumps(
             400, {get_system_message('error_message'): e.args[0].replace(
@@ -103,25 +256,247 @@ def get_by_id(declarative_meta, id_value_list, request_args, id_name_list, heade
     except Exception as e:
         return handle_custom_exception(get_system_message('invalid_connection_parameters'))
 
+    # Answering up to date clients without querying the database #
+    version_entity_tag = get_version_entity_tag(declarative_meta, dict(request_args, id=id_value_list), header_args)
+    if version_entity_tag is not None and is_not_modified(header_args, *version_entity_tag):
+        return build_proxy_response_not_modified(get_entity_tag_headers(*version_entity_tag))
+
     try:
+        response_format = get_response_format(header_args.get('HTTP_ACCEPT'))
         # Retrieving results #
-        result_set = select_object_by_id(
-            declarative_meta, id_value_list, id_name_list, request_args, main_connection_session, header_args
-        )
+        if response_format == 'objects':
+            result_set = dump_object_set(declarative_meta, select_object_list_by_id(
+                declarative_meta, id_value_list, id_name_list, request_args, main_connection_session, header_args
+            ), main_connection_session, header_args)
+        else:
+            result_set = select_object_list_by_id(
+                declarative_meta, id_value_list, id_name_list, request_args, main_connection_session, header_args
+            )
 
         # Returning API built response #
-        if result_set == '[]':
+        if result_set == '[]' or len(result_set) == 0:
             return build_proxy_response_insert_dumps(
                 404, {get_system_message('error_message'): f"Object with given parameter '{id_value_list[0]}' "
                                                            f"not found."}
             )
         else:
-            return build_proxy_response(200, result_set)
+            return apply_entity_tag(
+                build_object_set_response(declarative_meta, result_set, header_args, response_format), header_args,
+                version_entity_tag
+            )
+
+    except Exception as e:
+        return handle_custom_exception(e)
+
+
+def get_batch_get_max_ids():
+    batch_get_max_ids = get_global_variable('batch_get_max_ids')
+    return int(batch_get_max_ids) if batch_get_max_ids not in (None, '') else 10000
+
+
+def get_batch_get_chunk_size():
+    batch_get_chunk_size = get_global_variable('batch_get_chunk_size')
+    return int(batch_get_chunk_size) if batch_get_chunk_size not in (None, '') else 500
+
+
+# Method retrieves the primary key values of a batch get request item, a single value or an object with every #
+# primary key attribute, cast to the attributes types #
+def get_batch_get_id_values(declarative_meta, request_item, id_name_list):
+    if isinstance(request_item, dict) and sorted(request_item) == sorted(id_name_list):
+        id_values = [request_item[id_name] for id_name in id_name_list]
+    elif len(id_name_list) == 1 and isinstance(request_item, (str, int, float)) and not isinstance(request_item, bool):
+        id_values = [request_item]
+    else:
+        raise Exception(
+            f"Expected an object with the {', '.join(id_name_list)} attributes, received '{request_item}'"
+        )
+    try:
+        return tuple(
+            declarative_meta.__annotations__[id_name](id_value) for id_name, id_value in zip(id_name_list, id_values)
+        )
+    except Exception:
+        raise Exception(f"Invalid primary key value '{request_item}'")
+
+
+# Method retrieves the entities of a batch of primary keys, in the order they were requested. Keys without an #
+# entity get a {"NotFound": key} marker in their place #
+def get_by_id_batch(declarative_meta, request_data, id_name_list, header_args):
+    try:
+        cast_headers_args(
+            header_args
+        )
+
+        validate_header_args(
+            declarative_meta, header_args
+        )
+
+        if not isinstance(request_data, list):
+            raise Exception('Expected a list of primary keys')
+        if len(request_data) > get_batch_get_max_ids():
+            raise Exception(f'A batch get request can have at most {get_batch_get_max_ids()} primary keys')
+        id_value_tuples = [
+            get_batch_get_id_values(declarative_meta, request_item, id_name_list) for request_item in request_data
+        ]
+
+    except Exception as e:
+        return build_proxy_response_insert_dumps(
+            400, {get_system_message('error_message'): e.args[0].replace(
+                '__init__()', declarative_meta.__table__.name
+            )}
+        )
 
+    # Connecting to database #
+    try:
+        main_connection_session = get_main_connection_session()
+    except Exception as e:
+        return handle_custom_exception(get_system_message('invalid_connection_parameters'))
+
+    try:
+        object_list = select_object_list_by_id_batch(
+            declarative_meta, list(dict.fromkeys(id_value_tuples)), id_name_list, main_connection_session,
+            header_args, get_batch_get_chunk_size()
+        )
+        # Keys are compared as strings, so they match whatever type the database driver returns #
+        objects_by_id = {
+            tuple(str(getattr(selected_object, id_name)) for id_name in id_name_list): dumped_object
+            for selected_object, dumped_object in zip(
+                object_list, get_projection_schema(declarative_meta, header_args).dump(object_list)
+            )
+        }
+        result_list = [
+            objects_by_id.get(tuple(str(id_value) for id_value in id_value_tuple), {'NotFound': request_item})
+            for id_value_tuple, request_item in zip(id_value_tuples, request_data)
+        ]
+        return build_proxy_response(200, json.dumps(result_list, default=str))
     except Exception as e:
         return handle_custom_exception(e)
 
 
+# Method retrieves a page of the entities written after the position of the 'since' token, ordered by the domain #
+# watermark, along with the token of the page last position. Without 'since', changes are read from the start #
+def get_changes(declarative_meta, request_args, header_args):
+    if getattr(declarative_meta, 'changes_watermark', None) is None:
+        return build_proxy_response_insert_dumps(
+            404, {get_system_message('error_message'): f"Changes are not tracked on "
+                                                       f"{declarative_meta.__table__.name}"}
+        )
+
+    try:
+        cast_headers_args(
+            header_args
+        )
+
+        for key in request_args:
+            if key != 'since':
+                raise Exception(
+                    f"{declarative_meta.__table__.name} changes got an unexpected keyword argument '{key}'"
+                )
+        since_token = request_args.get('since') or None
+        position_values, since_shape = decode_changes_token(declarative_meta, since_token) \
+            if since_token is not None else (list(), None)
+        page_size = header_args.get('HTTP_LIMIT')
+        page_size = get_changes_page_size() if page_size in (None, '*') else min(page_size, get_changes_page_size())
+        if page_size < 1:
+            raise Exception(f"'{header_args.get('HTTP_LIMIT')}' is not a valid limit")
+
+    except Exception as e:
+        return build_proxy_response_insert_dumps(
+            400, {get_system_message('error_message'): e.args[0].replace(
+                '__init__()', declarative_meta.__table__.name
+            )}
+        )
+
+    # Connecting to database #
+    try:
+        main_connection_session = get_main_connection_session()
+    except Exception as e:
+        return handle_custom_exception(get_system_message('invalid_connection_parameters'))
+
+    try:
+        # One more object than the page is selected, telling whether there are more changes to read #
+        object_list, position_list = select_changed_object_list(
+            declarative_meta, position_values, since_shape, page_size + 1, main_connection_session
+        )
+        has_more = len(object_list) > page_size
+        object_list, position_list = object_list[:page_size], position_list[:page_size]
+        return build_proxy_response(200, json.dumps({
+            'Changes': declarative_meta.schema.dump(object_list),
+            'NextToken': encode_changes_token(position_list[-1]) if position_list else since_token,
+            'HasMore': has_more
+        }, default=str))
+    except Exception as e:
+        return handle_custom_exception(e)
+
+
+# Method streams the insert, update and delete events of a given entity as server-sent events #
+def get_change_stream(declarative_meta, request_args):
+    if request_args:
+        return build_proxy_response_insert_dumps(
+            400, {get_system_message('error_message'): f"{declarative_meta.__table__.name} stream got an unexpected "
+                                                       f"keyword argument '{next(iter(request_args))}'"}
+        )
+
+    subscriber = subscribe_change_feed(declarative_meta.__table__.name)
+    if subscriber is None:
+        return build_proxy_response_retry_after(
+            503, {get_system_message('error_message'): get_system_message('change_feed_busy')},
+            max(1, int(get_change_feed_heartbeat_interval()))
+        )
+
+    try:
+        start_change_feed(declarative_meta)
+    except Exception as e:
+        unsubscribe_change_feed(declarative_meta.__table__.name, subscriber)
+        return handle_custom_exception(e)
+
+    return build_proxy_response_stream(
+        200, iterate_change_events(declarative_meta.__table__.name, subscriber), 'text/event-stream',
+        {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+# Method imports a CSV or NDJSON stream of a given entity through the fastest load path of the database, reporting #
+# the load rate along with the line and error of each rejected object #
+def import_object_set(declarative_meta, stream, header_args):
+    try:
+        import_format = get_import_format(header_args.get('CONTENT_TYPE'))
+    except Exception as e:
+        return build_proxy_response_insert_dumps(415, {get_system_message('error_message'): e.args[0]})
+    try:
+        import_rows = open_import_rows(declarative_meta, stream, import_format)
+    except Exception as e:
+        return build_proxy_response_insert_dumps(400, {get_system_message('error_message'): str(e)})
+
+    # Connecting to database #
+    try:
+        main_connection_session = get_main_connection_session()
+    except Exception as e:
+        return handle_custom_exception(get_system_message('invalid_connection_parameters'))
+
+    import_report = {'imported': 0, 'rejects': {'count': 0, 'list': list()}}
+    import_start = time.perf_counter()
+    import_error = None
+    try:
+        import_object_stream(declarative_meta, import_rows, import_format, main_connection_session, import_report)
+    except Exception as e:
+        main_connection_session.rollback()
+        import_error = str(e)
+    import_seconds = time.perf_counter() - import_start
+
+    response_body = {
+        'Imported': import_report['imported'],
+        'Rejected': import_report['rejects']['count'],
+        'Rejects': sorted(import_report['rejects']['list'], key=lambda reject: reject['Line']),
+        'Seconds': round(import_seconds, 3),
+        'RowsPerSecond': round(import_report['imported'] / import_seconds) if import_seconds else 0
+    }
+    # Chunks committed before a stream failure are kept and reported along with its error #
+    if import_error is not None:
+        response_body[get_system_message('error_message')] = import_error
+        return build_proxy_response_insert_dumps(400, response_body)
+    return build_proxy_response_insert_dumps(200, response_body)
+
+
 # Method deletes a given entity by its given 'id' #
 def delete_by_id(declarative_meta, id_value_list, id_name_list):
     # Connecting to database #
@@ -173,6 +548,11 @@ def put_object_set(request_data, declarative_meta, id_name_list):
         if type(request_data) != list:
             request_data = [request_data]
 
+        # Sorting objects to update by primary key so concurrent batches acquire row locks in the same order, inserts #
+        # keep the order sent by the client, which sets the order of their generated keys #
+        if request.method != 'POST':
+            request_data = sort_request_data_by_primary_key(request_data, declarative_meta)
+
         # Iterating over objects in request_data param #
         for request_data_object in request_data:
 
@@ -192,9 +572,9 @@ def put_object_set(request_data, declarative_meta, id_name_list):
                 continue
 
             if request.method == 'POST':
-                # Executing insert block #
+                # Executing insert block, single object requests may be coalesced with concurrent ones #
                 insert_result = insert_object_from_set(
-                    declarative_meta, request_data_object, main_connection_session
+                    declarative_meta, request_data_object, main_connection_session, len(request_data) == 1
                 )
 
                 # Validating insert results #
@@ -358,6 +738,23 @@ def put_object_set(request_data, declarative_meta, id_name_list):
         return handle_custom_exception(e)
 
 
+# Method sorts a request_data list by its primary key values, keeping objects without them at the end #
+def sort_request_data_by_primary_key(request_data, declarative_meta):
+    id_name_list = [column.key for column in declarative_meta.__table__.primary_key.columns]
+
+    def primary_key_values(request_data_object):
+        if type(request_data_object) != dict:
+            return True, tuple()
+        values = tuple(request_data_object.get(id_name) for id_name in id_name_list)
+        return (True, tuple()) if None in values else (False, values)
+
+    try:
+        return sorted(request_data, key=primary_key_values)
+    except TypeError:
+        # Mixed primary key value types can not be compared, falling back to their string representation #
+        return sorted(request_data, key=lambda request_data_object: str(primary_key_values(request_data_object)))
+
+
 # Method inserts a given entity set #
 def insert_object_set(request_data, declarative_meta):
     # Returning definitions from put method #
@@ -375,7 +772,7 @@ def update_object_set(request_data, declarative_meta, id_name_list):
 
 
 # Method inserts a given entity or return its error in case of failure #
-def insert_object_from_set(declarative_meta, request_data_object, main_connection_session):
+def insert_object_from_set(declarative_meta, request_data_object, main_connection_session, coalesce=False):
     try:
         # Filling guid in primary key when not available #
         auto_fill_guid_in_request_body(
@@ -386,9 +783,14 @@ def insert_object_from_set(declarative_meta, request_data_object, main_connectio
             declarative_meta, request_data_object
         )
         # Result for insert transaction method #
-        result = insert_object(
-            transact_object, main_connection_session
-        )
+        if coalesce and is_write_coalescing_enabled():
+            result = insert_coalesced_object(
+                transact_object, main_connection_session
+            )
+        else:
+            result = insert_object(
+                transact_object, main_connection_session
+            )
     except Exception as e:
         # Returning custom handle exception for repository transactions #
         return handle_repository_exception(e)
@@ -441,6 +843,9 @@ def delete_set_by_full_match(request_data, declarative_meta):
         if type(request_data) != list:
             request_data = [request_data]
 
+        # Sorting objects by primary key so concurrent batches acquire row locks in the same order #
+        request_data = sort_request_data_by_primary_key(request_data, declarative_meta)
+
         # Iterating over objects in request_data param #
         for request_data_object in request_data:
             if request_data_object == dict():
@@ -498,7 +903,8 @@ def delete_set_by_full_match(request_data, declarative_meta):
 
 
 # Executes a stored procedure on the database #
-def execute_sql_stored_procedure(stored_procedure_name, stored_procedure_args):
+def execute_sql_stored_procedure(stored_procedure_name, stored_procedure_args, result_format='objects',
+                                 chunk_size=500):
     try:
         # Connecting to the database and getting the engine
         main_connection_session = get_main_connection_session()
@@ -506,67 +912,96 @@ def execute_sql_stored_procedure(stored_procedure_name, stored_procedure_args):
     except Exception as e:
         return handle_custom_exception(get_system_message('invalid_connection_parameters'))
 
-    with engine.connect() as con:
-        # Set OUT parameters as variables in the SQL session
-        out_params = stored_procedure_args.get("out", {})
-        for key, value in out_params.items():
-            con.execute(text(f"SET @{key} = {value}"))
-
-        in_values = ', '.join(
-            [f"'{value}'" for value in stored_procedure_args.get("in", [])])
-        call_proc = text(
-            f"CALL {stored_procedure_name}({in_values}"
-            f"{', ' if (out_params and in_values) else ''}"
-            f"{', '.join([f'@{key}' for key in out_params])})"
+    # Connection is closed once every result set is consumed #
+    con = engine.connect()
+    out_params = stored_procedure_args.get("out", {})
+    try:
+        stored_procedure_result, fetch_out_params = call_stored_procedure(
+            con, stored_procedure_name, stored_procedure_args.get("in", []), out_params
         )
+        out_values = dict()
+        result_sets = iterate_stored_procedure_result_sets(
+            stored_procedure_result, chunk_size, out_values
+        ) if stored_procedure_result is not None and stored_procedure_result.cursor is not None else iter(list())
+        first_result_set = next(result_sets, None)
+    except Exception as e:
+        con.close()
+        return handle_custom_exception(e)
 
+    # Result sets are only discarded when just the OUT parameters are requested #
+    if first_result_set is None or (out_params and result_format == 'objects'):
         try:
-            stored_procedure_result = con.execute(call_proc)
+            for _, row_chunks in ([first_result_set] if first_result_set is not None else list()):
+                for _ in row_chunks:
+                    pass
+            for _, row_chunks in result_sets:
+                for _ in row_chunks:
+                    pass
+            fetched_out_params = fetch_out_params() if fetch_out_params is not None else None
             con.commit()
+            # Stored procedures may write any table #
+            bump_table_version()
         except Exception as e:
             return handle_custom_exception(e)
-
-        cursor = stored_procedure_result.cursor
+        finally:
+            con.close()
 
         if out_params:
-            # Fetch the OUT parameters
-            fetched_out_params = {}
-            for key in out_params:
-                result = con.execute(text(f"SELECT @{key}"))
-                fetched_out_params[key] = result.scalar()
             return build_proxy_response_insert_dumps(
-                200, fetched_out_params
+                200, fetched_out_params if fetched_out_params is not None else out_values
             )
+        return build_proxy_response_insert_dumps(
+            200, {get_system_message(
+                'message'): get_system_message('query_success')}
+        )
+
+    return build_proxy_response_stream(
+        200, stream_stored_procedure_result(con, first_result_set, result_sets, fetch_out_params, out_values,
+                                            result_format),
+        'application/x-ndjson' if result_format == 'ndjson' else 'application/json'
+    )
 
-        if cursor is not None:
-            result = get_result_list(stored_procedure_result, cursor)
-            return build_proxy_response_insert_dumps(
-                200, result
-            )
-        else:
-            return build_proxy_response_insert_dumps(
-                200, {get_system_message(
-                    'message'): get_system_message('query_success')}
-            )
 
+# Method streams the result sets of a stored procedure call. objects format is a JSON array of the rows of every #
+# result set, compact format keeps each result set columns and rows apart along with the OUT parameters and #
+# ndjson format writes a row object per line followed by an OUT parameters line #
+def stream_stored_procedure_result(con, first_result_set, result_sets, fetch_out_params, out_values, result_format):
+    row_count = 0
+    try:
+        yield '{"result_sets": [' if result_format == 'compact' else '[' if result_format == 'objects' else ''
+        for result_set_index, (columns, row_chunks) in enumerate(itertools.chain([first_result_set], result_sets)):
+            if result_format == 'compact':
+                yield (',' if result_set_index else '') + '{"columns": ' + json.dumps(columns) + ', "rows": ['
+            result_set_row_count = 0
+            for rows in row_chunks:
+                chunk = list()
+                for row in rows:
+                    if result_format == 'compact':
+                        row_json = json.dumps(list(row), default=str)
+                    else:
+                        row_json = json.dumps(dict(zip(columns, row)), sort_keys=True, default=str)
+                    if result_format == 'ndjson':
+                        chunk.append(row_json + '\n')
+                    else:
+                        is_first_row = (result_set_row_count if result_format == 'compact' else row_count) == 0
+                        chunk.append(row_json if is_first_row else ',' + row_json)
+                    result_set_row_count += 1
+                    row_count += 1
+                yield ''.join(chunk)
+            if result_format == 'compact':
+                yield ']}'
+
+        fetched_out_params = fetch_out_params() if fetch_out_params is not None else None
+        out_json = json.dumps(fetched_out_params if fetched_out_params is not None else out_values, default=str)
+        if result_format == 'compact':
+            yield '], "out": ' + out_json + '}'
+        elif result_format == 'objects':
+            yield ']'
+        elif out_values or fetched_out_params:
+            yield '{"out": ' + out_json + '}\n'
+        con.commit()
+        bump_table_version()
+    finally:
+        con.close()
+        print_logs(json.dumps({"statusCode": 200, "body": f"{row_count} row(s) streamed"}))
 
-# Method that retrieves a result list from database
-def get_result_list(result, cursor):
-    # Retrieving list of fields name #
-    field_names = [i[0] for i in cursor.description]
-
-    # Initializing result list #
-    result_list = list()
-
-    # Iterating over result #
-    for result_object in result:
-        # Creating new column dictionary #
-        new_object = dict()
-        # Iterating over field names #
-        for i in range(len(field_names)):
-            # Constructing column dict with field name #
-            new_object[field_names[i]] = result_object[i]
-        # Appending column dict in result list #
-        result_list.append(new_object)
-    # Returning result list #
-    return result_list
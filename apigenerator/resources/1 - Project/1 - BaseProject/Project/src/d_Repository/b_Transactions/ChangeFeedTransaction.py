@@ -0,0 +1,109 @@
+# System Imports #
+import json
+import select
+import time
+
+# Transaction Imports #
+from src.d_Repository.b_Transactions.ChangesTransaction import *
+
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.MainConnectionResolver import *
+
+# Infra Imports #
+from src.e_Infra.ChangeFeedManager import *
+
+
+# Method starts what feeds the change events of a table: the listener of the database notifications, or the poller #
+# of its watermark for the writes made outside of the API #
+def start_change_feed(declarative_meta):
+    if get_change_feed_source() == 'notify':
+        start_change_feed_thread('change_feed_listener', listen_change_notifications)
+    elif getattr(declarative_meta, 'changes_watermark', None) is not None and get_change_feed_poll_interval() > 0:
+        start_change_feed_thread(
+            f'change_feed_poller_{declarative_meta.__table__.name}', poll_change_watermark, declarative_meta
+        )
+
+
+# Method polls the objects written after the last position of a table while it has subscribers, publishing them as #
+# upsert events. Objects written by the API are published once by the API and once by the poller, so subscribers get #
+# every change at least once #
+def poll_change_watermark(declarative_meta):
+    table_name = declarative_meta.__table__.name
+    position_values = None
+    while True:
+        with change_feed_subscribers_lock:
+            if not change_feed_subscribers.get(table_name):
+                change_feed_threads.pop(f'change_feed_poller_{table_name}', None)
+                return
+        try:
+            main_connection_session = get_main_connection_session()
+            try:
+                if position_values is None:
+                    end_position = main_connection_session.execute(build_changes_end_query(declarative_meta)).first()
+                    position_values = list(end_position) if end_position is not None else list()
+                else:
+                    since_shape = tuple(
+                        encode_changes_token_value(value)[0] for value in position_values
+                    ) if position_values else None
+                    object_list, position_list = select_changed_object_list(
+                        declarative_meta, position_values, since_shape, get_changes_page_size(),
+                        main_connection_session
+                    )
+                    for object_dict in declarative_meta.schema.dump(object_list):
+                        deliver_change_event(table_name, 'upsert', object_dict)
+                    if position_list:
+                        position_values = position_list[-1]
+                        # A full page means more changes are waiting, they are read without sleeping #
+                        if len(position_list) == get_changes_page_size():
+                            continue
+            finally:
+                main_connection_session.close()
+        except Exception as e:
+            increment_metric('change_feed_poll_errors')
+            print(f'Change feed poll of {table_name} failed: {e}')
+        time.sleep(get_change_feed_poll_interval())
+
+
+# Method listens to the notifications of the generated PostgreSQL triggers on a connection of its own, delivering #
+# them to the subscribers of their table. The connection is opened again whenever it is lost #
+def listen_change_notifications():
+    while True:
+        try:
+            raw_connection = get_main_connection_session().get_bind().raw_connection()
+            # The connection is kept out of the pool, since it stays busy listening #
+            raw_connection.detach()
+            driver_connection = getattr(raw_connection, 'driver_connection', None) or raw_connection.connection
+            try:
+                driver_connection.autocommit = True
+                cursor = driver_connection.cursor()
+                cursor.execute(f'LISTEN {change_feed_channel}')
+                cursor.close()
+                for notification_payload in iterate_change_notifications(driver_connection):
+                    deliver_change_notification(notification_payload)
+            finally:
+                raw_connection.close()
+        except Exception as e:
+            increment_metric('change_feed_listen_errors')
+            print(f'Change feed listener failed: {e}')
+        time.sleep(get_change_feed_poll_interval() or 1)
+
+
+# Method retrieves the payloads of the notifications received by a listening connection, as psycopg 3 and psycopg2 #
+# give them #
+def iterate_change_notifications(driver_connection):
+    if hasattr(driver_connection, 'notifies') and callable(driver_connection.notifies):
+        for notification in driver_connection.notifies():
+            yield notification.payload
+    else:
+        while True:
+            if select.select([driver_connection], [], [], get_change_feed_heartbeat_interval()) != ([], [], []):
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    yield driver_connection.notifies.pop(0).payload
+
+
+# Method delivers a trigger notification to the subscribers of its table, with the row as json written by the #
+# database. Rows too large for a notification carry their primary key only #
+def deliver_change_notification(notification_payload):
+    notification = json.loads(notification_payload)
+    deliver_change_event(notification['table'], notification['operation'], notification['data'])
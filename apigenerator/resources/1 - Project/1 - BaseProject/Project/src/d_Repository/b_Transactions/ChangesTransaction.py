@@ -0,0 +1,77 @@
+# System Imports #
+import base64
+import datetime
+import decimal
+import json
+
+# Transaction Imports #
+from src.d_Repository.b_Transactions.GenericDatabaseTransaction import *
+
+
+# Position values are tagged by kind in changes tokens, so they are read back with the type they were written with #
+changes_token_value_encoders = (
+    (bytes, 'bytes', lambda value: value.hex()),
+    (datetime.datetime, 'datetime', lambda value: value.isoformat()),
+    (datetime.date, 'date', lambda value: value.isoformat()),
+    (datetime.time, 'time', lambda value: value.isoformat()),
+    (decimal.Decimal, 'decimal', str),
+)
+changes_token_value_decoders = {
+    'bytes': bytes.fromhex,
+    'datetime': datetime.datetime.fromisoformat,
+    'date': datetime.date.fromisoformat,
+    'time': datetime.time.fromisoformat,
+    'decimal': decimal.Decimal,
+}
+
+
+def get_changes_page_size():
+    changes_page_size = get_global_variable('changes_page_size')
+    return int(changes_page_size) if changes_page_size not in (None, '') else 1000
+
+
+def encode_changes_token_value(value):
+    for value_type, kind, encode_value in changes_token_value_encoders:
+        if isinstance(value, value_type):
+            return [kind, encode_value(value)]
+    return [None, value]
+
+
+# Method builds the opaque token of a changes route position, its watermark followed by its primary key values #
+def encode_changes_token(position_values):
+    return base64.urlsafe_b64encode(json.dumps(
+        [encode_changes_token_value(value) for value in position_values], separators=(',', ':')
+    ).encode()).decode().rstrip('=')
+
+
+# Method reads back the position values of a changes token, along with their kinds #
+def decode_changes_token(declarative_meta, changes_token):
+    try:
+        encoded_values = json.loads(base64.urlsafe_b64decode(changes_token + '=' * (-len(changes_token) % 4)))
+        if len(encoded_values) != len(declarative_meta.__table__.primary_key.columns) + 1:
+            raise ValueError
+        position_values = [
+            changes_token_value_decoders[kind](value) if kind is not None else value for kind, value in encoded_values
+        ]
+        return position_values, tuple(kind for kind, _ in encoded_values)
+    except Exception:
+        raise Exception(f"'{changes_token}' is not a valid since token")
+
+
+# Generic database transaction for selecting up to a page of objects changed after a position, along with the #
+# position of each one #
+def select_changed_object_list(declarative_meta, position_values, since_shape, page_size, session):
+    try:
+        statement = build_changes_query(declarative_meta, since_shape)
+        bind_values = {f'changes_since_{index}': value for index, value in enumerate(position_values)}
+        bind_values['changes_limit'] = page_size
+        rows = session.execute(statement, bind_values).all()
+        object_list = validate_non_serializable_types([row[0] for row in rows], declarative_meta)
+        position_list = [
+            [row[1]] + [getattr(row[0], column.key) for column in declarative_meta.__table__.primary_key]
+            for row in rows
+        ]
+        return object_list, position_list
+    except Exception as e:
+        session.rollback()
+        raise e
@@ -0,0 +1,64 @@
+# Transaction Imports #
+from src.d_Repository.b_Transactions.GenericDatabaseTransaction import *
+
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.RelationshipResolver import get_expand_relationship, get_expand_max_fan_out
+
+
+# Method builds the expand tree of the expand header paths, e.g. customer,product.customer gives #
+# {'customer': {}, 'product': {'customer': {}}} #
+def build_expand_tree(expand_paths):
+    expand_tree = dict()
+    for expand_path in expand_paths:
+        expand_node = expand_tree
+        for relationship_name in expand_path:
+            expand_node = expand_node.setdefault(relationship_name, dict())
+    return expand_tree
+
+
+# Method nests the related objects of every relationship of the expand tree into the dumped objects. Each relationship #
+# is loaded by one select in query per chunk of keys, whatever the number of objects, and its related objects are #
+# expanded in turn by the next level of the tree #
+def expand_object_dict_list(declarative_meta, object_dict_list, expand_tree, session, chunk_size):
+    for relationship_name, expand_subtree in expand_tree.items():
+        kind, key, related_declarative_meta, related_key = get_expand_relationship(declarative_meta, relationship_name)
+        key_values = list(dict.fromkeys(
+            object_dict[key] for object_dict in object_dict_list if object_dict.get(key) is not None
+        ))
+        related_object_list = list()
+        for index in range(0, len(key_values), chunk_size):
+            statement = build_expand_query(related_declarative_meta, related_key, kind)
+            related_object_list.extend(session.execute(statement, {
+                'expand_keys': key_values[index:index + chunk_size], 'expand_fan_out': get_expand_max_fan_out()
+            }).scalars().all())
+        related_object_dict_list = related_declarative_meta.schema.dump(
+            validate_non_serializable_types(related_object_list, related_declarative_meta)
+        )
+        if expand_subtree:
+            expand_object_dict_list(
+                related_declarative_meta, related_object_dict_list, expand_subtree, session, chunk_size
+            )
+
+        # Keys are compared as strings, so they match whatever type the database driver returns #
+        related_objects_by_key = dict()
+        for related_object_dict in related_object_dict_list:
+            related_objects_by_key.setdefault(str(related_object_dict[related_key]), list()).append(related_object_dict)
+        for object_dict in object_dict_list:
+            related_objects = related_objects_by_key.get(str(object_dict.get(key)), list())
+            if kind == 'one':
+                object_dict[relationship_name] = related_objects[0] if related_objects else None
+            else:
+                object_dict[relationship_name] = related_objects
+    return object_dict_list
+
+
+# Method dumps the selected objects with the projection schema, nesting the relationships of the expand header #
+def dump_expanded_objects(declarative_meta, object_list, session, header_args, chunk_size):
+    try:
+        return expand_object_dict_list(
+            declarative_meta, get_projection_schema(declarative_meta, header_args).dump(object_list),
+            build_expand_tree(header_args['HTTP_EXPAND']), session, chunk_size
+        )
+    except Exception as e:
+        session.rollback()
+        raise e
@@ -4,16 +4,77 @@ from src.e_Infra.b_Builders.DomainBuilder import *
 # Infra Imports #
 from src.e_Infra.CustomVariables import *
 
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.TransactionRetryResolver import run_with_transaction_retry
+
+# SqlAlchemy Imports #
+from sqlalchemy.sql import text
+
+# Infra Imports #
+from src.e_Infra.StatementCacheManager import get_statement_cache_size
+from src.e_Infra.EntityTagManager import bump_table_version
+from src.e_Infra.ChangeFeedManager import publish_change_event
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# System Imports #
+import threading
+from collections import OrderedDict
+
+
+# Statements creating an empty session temporary table for large [or] filter values, by dialect #
+filter_temp_table_statements = {
+    'postgresql': ['CREATE TEMPORARY TABLE IF NOT EXISTS {table_name} (value {value_type})',
+                   'DELETE FROM {table_name}'],
+    'mysql': ['CREATE TEMPORARY TABLE IF NOT EXISTS {table_name} (value {value_type})',
+              'DELETE FROM {table_name}'],
+    'mssql': ["IF OBJECT_ID('tempdb..{table_name}') IS NULL CREATE TABLE {table_name} (value {value_type})",
+              'DELETE FROM {table_name}'],
+}
+
+# Global projection schemas keyed by domain and selected attributes (least recently used ones are evicted first) #
+projection_schemas = OrderedDict()
+projection_schemas_lock = threading.Lock()
+
+
+# Method retrieves the schema dumping the selected attributes only, so narrow projections skip the fields left out. #
+# Schemas are built once for each set of selected attributes #
+def get_projection_schema(declarative_meta, header_args):
+    select_columns = tuple(key for key in (header_args.get('HTTP_SELECT') or list()) if key != '')
+    if not select_columns:
+        return declarative_meta.schema
+    schema_key = (declarative_meta, frozenset(select_columns))
+    with projection_schemas_lock:
+        schema = projection_schemas.get(schema_key)
+        if schema is not None:
+            projection_schemas.move_to_end(schema_key)
+            return schema
+
+    schema = type(declarative_meta.schema)(many=True, only=select_columns)
+    with projection_schemas_lock:
+        projection_schemas[schema_key] = schema
+        while len(projection_schemas) > get_statement_cache_size():
+            projection_schemas.popitem(last=False)
+    return schema
+
 
 # Generic database transaction for selecting objects with argument options #
 def select_all_objects(declarative_meta, request_args, session, header_args):
+    # Invoking ORM schema for JSON format result #
+    return get_projection_schema(declarative_meta, header_args).dumps(
+        select_all_object_list(declarative_meta, request_args, session, header_args)
+    )
+
+
+# Generic database transaction for selecting a list of objects #
+def select_all_object_list(declarative_meta, request_args, session, header_args):
     try:
         # Invoking domain builder #
-        query = build_query_from_api_request(
-            declarative_meta, request_args, session, header_args, True
+        statement, bind_values = build_query_from_api_request(
+            declarative_meta, request_args, header_args, True
         )
-        # Invoking ORM schema for JSON format result #
-        return declarative_meta.schema.dumps(query)
+        return execute_select_statement(declarative_meta, statement, bind_values, session)
     except Exception as e:
         session.rollback()
         raise e
@@ -21,79 +82,159 @@ def select_all_objects(declarative_meta, request_args, session, header_args):
 
 # Generic database transaction for selecting objects by their id #
 def select_object_by_id(declarative_meta, id_value_list, id_name_list, request_args, session, header_args):
+    # Invoking ORM schema for JSON format result #
+    return get_projection_schema(declarative_meta, header_args).dumps(select_object_list_by_id(
+        declarative_meta, id_value_list, id_name_list, request_args, session, header_args
+    ))
+
+
+# Generic database transaction for selecting a list of objects by their id #
+def select_object_list_by_id(declarative_meta, id_value_list, id_name_list, request_args, session, header_args):
     try:
-        # Executing query according to existence of request_args parameter #
-        if request_args != get_system_empty_dict() or header_args != get_system_empty_dict():
-            query = build_query_from_api_request(
-                declarative_meta, request_args, session, header_args
-            )
+        # Invoking domain builder with id filters #
+        statement, bind_values = build_query_from_api_request(
+            declarative_meta, request_args, header_args, id_name_list=id_name_list, id_value_list=id_value_list
+        )
+        return execute_select_statement(declarative_meta, statement, bind_values, session)
+    except Exception as e:
+        session.rollback()
+        raise e
 
-            for i in range(len(id_value_list)):
-                query = query.filter(getattr(declarative_meta, id_name_list[i]) == id_value_list[i])
 
-        else:
-            query = session.query(
-                declarative_meta
+# Generic database transaction for selecting the objects of a batch of primary keys, a chunk of keys per query #
+def select_object_list_by_id_batch(declarative_meta, id_value_tuples, id_name_list, session, header_args, chunk_size):
+    chunk_size = get_id_batch_chunk_size(id_name_list, chunk_size)
+    try:
+        object_list = list()
+        for index in range(0, len(id_value_tuples), chunk_size):
+            statement, bind_values = build_select_by_id_batch_query(
+                declarative_meta, id_name_list, id_value_tuples[index:index + chunk_size], header_args
             )
-            for i in range(len(id_value_list)):
-                query = query.filter(getattr(declarative_meta, id_name_list[i]) == id_value_list[i])
-        # Invoking ORM schema for JSON format result #
-        return declarative_meta.schema.dumps(query)
+            object_list.extend(execute_select_statement(declarative_meta, statement, bind_values, session))
+        return object_list
     except Exception as e:
         session.rollback()
         raise e
 
 
-# Generic database transaction for inserting an object #
-def insert_object(transaction_obj, session):
+# Generic database transaction for selecting aggregates of the filtered objects, grouped by the group by header #
+def select_aggregate_rows(declarative_meta, request_args, session, header_args):
+    try:
+        statement, bind_values = build_aggregate_query_from_api_request(declarative_meta, request_args, header_args)
+        return [dict(row) for row in execute_filtered_statement(statement, bind_values, session).mappings()]
+    except Exception as e:
+        session.rollback()
+        raise e
+
+
+# Method dumps objects already selected with the projection schema a chunk at a time, for the streamed formats of #
+# responses needing their rows up front #
+def iterate_object_rows(declarative_meta, object_list, chunk_size, header_args):
+    schema = get_projection_schema(declarative_meta, header_args)
+    for index in range(0, len(object_list), chunk_size):
+        yield schema.dump(object_list[index:index + chunk_size])
+
+
+# Method streams the objects selected by an API request in chunks dumped by the projection schema, fetching them #
+# from a server side cursor while the response is written. Rows are read on a session of their own, closed with the #
+# stream, as the response outlives the request session. Transactional batches keep reading through their session #
+def stream_all_object_rows(declarative_meta, request_args, main_connection_session, header_args, chunk_size):
+    in_batch_transaction = has_request_context() and g.get('batch_transaction') is not None
+    session = main_connection_session if in_batch_transaction else main_connection_session.session_factory()
     try:
+        statement, bind_values = build_query_from_api_request(
+            declarative_meta, request_args, header_args, True
+        )
+        result = execute_filtered_statement(
+            statement.execution_options(stream_results=True, yield_per=chunk_size), bind_values, session
+        )
+        if statement.column_descriptions[0]['expr'] is declarative_meta:
+            result = result.scalars()
+        schema = get_projection_schema(declarative_meta, header_args)
+        for object_list in result.partitions(chunk_size):
+            yield schema.dump(validate_non_serializable_types(object_list, declarative_meta))
+    finally:
+        if not in_batch_transaction:
+            session.close()
+
+
+# Method retrieves the attributes of the dumped objects, restricted to the selected ones when there are any #
+def get_object_row_columns(declarative_meta, header_args):
+    return list(get_projection_schema(declarative_meta, header_args).dump_fields)
+
+
+# Method executes a statement template, loading the temporary tables of its large [or] filters beforehand #
+def execute_filtered_statement(statement, bind_values, session):
+    filter_temp_tables = bind_values.pop('filter_temp_tables', dict())
+    dialect = session.get_bind().dialect
+    for table_name, (value_type, values) in filter_temp_tables.items():
+        for temp_table_statement in filter_temp_table_statements[dialect.name]:
+            session.execute(text(temp_table_statement.format(
+                table_name=table_name, value_type=value_type.compile(dialect=dialect)
+            )))
+        session.execute(
+            table(table_name, column('value')).insert(), [{'value': value} for value in values]
+        )
+    return session.execute(statement, bind_values)
+
+
+# Method executes a select statement template, returning entities or rows according to its selected columns #
+def execute_select_statement(declarative_meta, statement, bind_values, session):
+    result = execute_filtered_statement(statement, bind_values, session)
+    if statement.column_descriptions[0]['expr'] is declarative_meta:
+        result = result.scalars()
+    # Validate column type non serialiable #
+    return validate_non_serializable_types(result.all(), declarative_meta)
+
+
+# Generic database transaction for inserting an object, retried when chosen as a deadlock victim #
+def insert_object(transaction_obj, session):
+    def transaction():
         # Executing insert query according to given transaction_obj #
         session.add(
             transaction_obj
         )
         # Returning session commit response #
-        return session.commit()
-    except Exception as e:
-        session.rollback()
-        raise e
+        result = session.commit()
+        bump_table_version(transaction_obj.__table__.name)
+        publish_change_event(
+            transaction_obj.__table__.name, 'insert', lambda: type(transaction_obj).schema.dump([transaction_obj])
+        )
+        return result
+
+    return run_with_transaction_retry(session, transaction)
 
 
-# Generic database transaction for updating an object #
+# Generic database transaction for updating an object, retried when chosen as a deadlock victim #
 def update_object(declarative_meta, request_data, id_name_list, session):
-    try:
+    statement, bind_values = build_update_by_id_query(declarative_meta, request_data, id_name_list)
+
+    def transaction():
         # Executing update query according to given id parameter #
-        query = session.query(
-            declarative_meta
-        )
-        for id_name in id_name_list:
-            query = query.filter(
-                getattr(
-                    declarative_meta, id_name
-                ) == request_data[id_name]
-            )
-        result = query.update(
-            request_data
-        )
+        result = session.execute(statement, bind_values).rowcount
         # Returning session commit response #
         session.commit()
+        bump_table_version(declarative_meta.__table__.name)
+        if result:
+            publish_change_event(declarative_meta.__table__.name, 'update', lambda: [request_data])
         return result
-    except Exception as e:
-        session.rollback()
-        raise e
+
+    return run_with_transaction_retry(session, transaction)
 
 
 # Generic database transaction for deleting an object #
 def delete_object_by_id(declarative_meta, id_value_list, id_name_list, session):
     try:
         # Executing delete query according to given id parameter #
-        query = session.query(
-            declarative_meta
-        )
-        for i in range(len(id_value_list)):
-            query = query.filter(getattr(declarative_meta, id_name_list[i]) == id_value_list[i])
-        result = query.delete()
+        statement, bind_values = build_delete_by_id_query(declarative_meta, id_value_list, id_name_list)
+        result = session.execute(statement, bind_values).rowcount
         # Returning session commit response #
         session.commit()
+        bump_table_version(declarative_meta.__table__.name)
+        if result:
+            publish_change_event(
+                declarative_meta.__table__.name, 'delete', lambda: [dict(zip(id_name_list, id_value_list))]
+            )
         # Returning number of fetched objects #
         return result
     except Exception as e:
@@ -104,13 +245,12 @@ def delete_object_by_id(declarative_meta, id_value_list, id_name_list, session):
 # Generic database transaction for deleting an object by providing all fields of the object table #
 def delete_object_by_full_match(declarative_meta, request_data, session):
     try:
-        query = build_query_from_api_request(
-            declarative_meta, request_data, session
-        )
-        result = query.delete(
-            synchronize_session='fetch'
-        )
+        statement, bind_values = build_delete_query_from_api_request(declarative_meta, request_data)
+        result = execute_filtered_statement(statement, bind_values, session).rowcount
         session.commit()
+        bump_table_version(declarative_meta.__table__.name)
+        if result:
+            publish_change_event(declarative_meta.__table__.name, 'delete', lambda: [request_data])
         return result
     except Exception as e:
         session.rollback()
@@ -0,0 +1,361 @@
+# System Imports #
+import csv
+import datetime
+import io
+import json
+
+# Transaction Imports #
+from src.d_Repository.b_Transactions.GenericDatabaseTransaction import *
+
+# Handler Imports #
+from src.e_Infra.a_Handlers.ExceptionsHandler import handle_repository_exception
+
+# Validator Imports #
+from src.e_Infra.d_Validators.SqlAlchemyDataValidator import get_valid_datetime_masks
+
+# Infra Imports #
+from src.e_Infra.MetricsManager import *
+
+# SqlAlchemy Imports #
+import sqlalchemy as sa
+
+
+# Import body formats by their content type #
+import_formats = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+}
+
+# Boolean values accepted on CSV imports #
+import_boolean_values = {'true': True, 't': True, '1': True, 'yes': True,
+                         'false': False, 'f': False, '0': False, 'no': False}
+
+# SQL Server statements accept up to 2100 parameters and multi-row VALUES lists up to 1000 rows #
+mssql_max_parameters = 2099
+mssql_max_values_rows = 1000
+
+
+def get_import_chunk_size():
+    import_chunk_size = get_global_variable('import_chunk_size')
+    return int(import_chunk_size) if import_chunk_size not in (None, '') else 5000
+
+
+def get_import_max_rejects():
+    import_max_rejects = get_global_variable('import_max_rejects')
+    return int(import_max_rejects) if import_max_rejects not in (None, '') else 1000
+
+
+def get_import_format(content_type):
+    import_format = import_formats.get(str(content_type).split(';')[0].strip().lower())
+    if import_format is None:
+        raise Exception(f"Import content type must be one of {', '.join(import_formats)}")
+    return import_format
+
+
+# Method opens the rows of an import body, yielding each line number along with its object or its parse error. #
+# CSV headers are read and validated before any row, empty CSV values being read as null #
+def open_import_rows(declarative_meta, stream, import_format):
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if import_format == 'ndjson':
+        return iterate_ndjson_import_rows(text_stream)
+
+    reader = csv.reader(text_stream)
+    header = [key.strip() for key in next(reader, list())]
+    if not header:
+        raise Exception('CSV import body must start with a header row')
+    unexpected_keys = [key for key in header if key not in declarative_meta.__table__.columns]
+    if unexpected_keys:
+        raise Exception(f"{declarative_meta.__table__.name} import got an unexpected keyword argument "
+                        f"'{unexpected_keys[0]}'")
+    if len(set(header)) != len(header):
+        raise Exception('CSV import header must not repeat attributes')
+    return iterate_csv_import_rows(reader, header)
+
+
+def iterate_csv_import_rows(reader, header):
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != len(header):
+            yield reader.line_num, None, f'Expected {len(header)} values but received {len(row)}'
+            continue
+        yield reader.line_num, {key: value if value != '' else None for key, value in zip(header, row)}, None
+
+
+def iterate_ndjson_import_rows(text_stream):
+    for line_number, line in enumerate(text_stream, 1):
+        if not line.strip():
+            continue
+        try:
+            request_data_object = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Malformed JSON line'
+            continue
+        if type(request_data_object) != dict:
+            yield line_number, None, 'JSON line must be an object'
+            continue
+        yield line_number, request_data_object, None
+
+
+# Method builds the datetime caster of a column, trying first the mask its previous value matched, as the values of #
+# a column usually share the same one #
+def build_import_datetime_caster(column, masks, convert):
+    def cast(value):
+        if not isinstance(value, str):
+            raise Exception(f"Expected type 'str' for attribute '{column.key}' but received type "
+                            f"'{type(value).__name__}'")
+        for index, mask in enumerate(masks):
+            try:
+                converted_value = convert(datetime.datetime.strptime(value, mask))
+            except ValueError:
+                continue
+            if index:
+                masks.insert(0, masks.pop(index))
+            return converted_value
+        raise Exception(f'Invalid {str(column.type).lower()} value for {column.name} attribute')
+
+    return cast
+
+
+# Method retrieves the Python type of a column, None when its type has none, such as some dialect specific types #
+def get_column_python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+# Method builds the caster of a column, reading CSV text values or checking NDJSON typed values against the domain #
+# annotations the same way single object requests are validated. Date and time columns are told by their Python #
+# type, so every variant such as DATETIME(6), DATETIME2 or TIMESTAMP WITHOUT TIME ZONE gets the datetime caster #
+def build_import_value_caster(column, annotation, import_format):
+    column_python_type = get_column_python_type(column)
+    if column_python_type is datetime.datetime:
+        return build_import_datetime_caster(column, list(get_valid_datetime_masks()), lambda value: value)
+    if column_python_type is datetime.date:
+        return build_import_datetime_caster(column, [
+            mask.strip() for mask in get_global_variable('date_valid_masks').split(',')
+        ], lambda value: value.date())
+    if column_python_type is datetime.time:
+        return build_import_datetime_caster(column, [
+            mask.strip() for mask in get_global_variable('time_valid_masks').split(',')
+        ], lambda value: value.timetz())
+
+    max_length = getattr(column.type, 'length', None) if isinstance(column.type, sa.String) else None
+
+    def cast(value):
+        if import_format == 'csv' and annotation != str:
+            if annotation == bool:
+                if value.strip().lower() not in import_boolean_values:
+                    raise ValueError
+                return import_boolean_values[value.strip().lower()]
+            if annotation in (int, float):
+                return annotation(value)
+            return json.loads(value)
+        if type(value) != annotation:
+            if annotation == float and type(value) == int:
+                return float(value)
+            raise ValueError
+        if max_length is not None and len(value) > max_length:
+            raise Exception(f"Attribute '{column.key}' is longer than {max_length} characters")
+        return value
+
+    def cast_or_raise(value):
+        try:
+            return cast(value)
+        except ValueError:
+            raise Exception(f"Expected type '{annotation.__name__}' for attribute '{column.key}' but received "
+                            f"{repr(value) if import_format == 'csv' else repr(type(value).__name__)}")
+
+    return cast_or_raise
+
+
+# Method builds the casters of every domain attribute once per import #
+def build_import_value_casters(declarative_meta, import_format):
+    return {
+        column.key: build_import_value_caster(column, declarative_meta.__annotations__.get(column.key, str),
+                                              import_format)
+        for column in declarative_meta.__table__.columns
+    }
+
+
+# Attributes an imported object must carry a value for, the ones filled by the database or by guid generation #
+# being left out #
+def get_import_required_keys(declarative_meta):
+    table = declarative_meta.__table__
+    return {
+        column.key for column in table.columns
+        if not column.nullable and column.default is None and column.server_default is None
+        and column is not table.autoincrement_column
+    }
+
+
+# Method validates a chunk of imported objects column by column, casting their values in place and appending the #
+# rejected ones to the rejects. It returns the valid objects along with their line numbers #
+def validate_import_chunk(declarative_meta, import_casters, required_keys, import_chunk, rejects):
+    table_name = declarative_meta.__table__.name
+    chunk_errors = [None] * len(import_chunk)
+    for index, (line_number, request_data_object) in enumerate(import_chunk):
+        auto_fill_guid_in_request_body(declarative_meta, request_data_object)
+        unexpected_key = next((key for key in request_data_object if key not in import_casters), None)
+        if unexpected_key is not None:
+            chunk_errors[index] = f"{table_name} import got an unexpected keyword argument '{unexpected_key}'"
+
+    for key, cast in import_casters.items():
+        is_required = key in required_keys
+        for index, (line_number, request_data_object) in enumerate(import_chunk):
+            if chunk_errors[index] is not None:
+                continue
+            value = request_data_object.get(key)
+            if value is None:
+                if is_required:
+                    chunk_errors[index] = f"Attribute '{key}' cannot be null"
+                continue
+            try:
+                request_data_object[key] = cast(value)
+            except Exception as e:
+                chunk_errors[index] = e.args[0]
+
+    valid_chunk = list()
+    for index, (line_number, request_data_object) in enumerate(import_chunk):
+        if chunk_errors[index] is None:
+            try:
+                declarative_meta.validate_custom_rules(request_data_object)
+            except Exception as e:
+                chunk_errors[index] = e.args[0]
+        if chunk_errors[index] is None:
+            valid_chunk.append((line_number, request_data_object))
+        else:
+            append_import_reject(rejects, line_number, chunk_errors[index])
+    return valid_chunk
+
+
+# Method counts a rejected object, keeping its error while under the maximum number of reported rejects #
+def append_import_reject(rejects, line_number, error):
+    rejects['count'] += 1
+    if len(rejects['list']) < get_import_max_rejects():
+        rejects['list'].append({'Line': line_number, 'Error': error})
+
+
+# Method writes a value on a PostgreSQL COPY csv body, nulls being the only unquoted empty values #
+def format_copy_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+# Method loads rows through COPY FROM STDIN, falling back to executemany on drivers without COPY support #
+def copy_import_rows(table, attribute_keys, row_list, session):
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    if not attribute_keys or not (hasattr(cursor, 'copy_expert') or hasattr(cursor, 'copy')):
+        cursor.close()
+        return execute_many_import_rows(table, attribute_keys, row_list, session)
+
+    preparer = session.get_bind().dialect.identifier_preparer
+    copy_statement = (
+        f"COPY {preparer.format_table(table)} "
+        f"({', '.join(preparer.quote(table.columns[key].name) for key in attribute_keys)}) FROM STDIN WITH (FORMAT csv)"
+    )
+    copy_body = ''.join(
+        ','.join(format_copy_value(row[key]) for key in attribute_keys) + '\n' for row in row_list
+    )
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2 #
+            cursor.copy_expert(copy_statement, io.StringIO(copy_body))
+        else:
+            # psycopg #
+            with cursor.copy(copy_statement) as copy:
+                copy.write(copy_body)
+    finally:
+        cursor.close()
+
+
+# Method loads rows through multi-row INSERT statements sized to the SQL Server parameter limits #
+def insert_values_import_rows(table, attribute_keys, row_list, session):
+    if not attribute_keys:
+        return execute_many_import_rows(table, attribute_keys, row_list, session)
+    rows_by_statement = max(1, min(mssql_max_values_rows, mssql_max_parameters // len(attribute_keys)))
+    for start in range(0, len(row_list), rows_by_statement):
+        session.execute(sa.insert(table).values(row_list[start:start + rows_by_statement]))
+
+
+# Method loads rows through the driver executemany, which MySQL drivers rewrite into multi-row INSERT statements #
+def execute_many_import_rows(table, attribute_keys, row_list, session):
+    session.execute(sa.insert(table), row_list)
+
+
+# Fastest native load path by dialect, executemany being used by the other ones #
+import_loaders = {
+    'postgresql': copy_import_rows,
+    'mssql': insert_values_import_rows,
+}
+
+
+# Method loads a chunk of valid objects in a single transaction. Objects are grouped by their attributes so omitted #
+# ones keep their database defaults. When the chunk fails, it is loaded again one object at a time so each rejected #
+# object gets its own error. It returns the loaded objects #
+def load_import_chunk(declarative_meta, valid_chunk, session, rejects):
+    table = declarative_meta.__table__
+    import_loader = import_loaders.get(session.get_bind().dialect.name, execute_many_import_rows)
+    row_groups = dict()
+    for line_number, request_data_object in valid_chunk:
+        row_groups.setdefault(tuple(sorted(request_data_object)), list()).append(request_data_object)
+
+    try:
+        for attribute_keys, row_list in row_groups.items():
+            import_loader(table, attribute_keys, row_list, session)
+        session.commit()
+        return [request_data_object for line_number, request_data_object in valid_chunk]
+    except Exception:
+        session.rollback()
+        increment_metric('import_fallbacks')
+
+    loaded_list = list()
+    for line_number, request_data_object in valid_chunk:
+        try:
+            session.execute(sa.insert(table), [request_data_object])
+            session.commit()
+            loaded_list.append(request_data_object)
+        except Exception as e:
+            session.rollback()
+            append_import_reject(rejects, line_number, handle_repository_exception(e))
+    return loaded_list
+
+
+# Method imports the objects of a CSV or NDJSON stream chunk by chunk, each chunk being validated and committed on #
+# its own. Rejected objects are counted and reported by line, the loaded ones being kept #
+def import_object_stream(declarative_meta, import_rows, import_format, session, import_report):
+    import_casters = build_import_value_casters(declarative_meta, import_format)
+    required_keys = get_import_required_keys(declarative_meta)
+    rejects = import_report['rejects']
+    import_chunk = list()
+
+    def flush_import_chunk():
+        valid_chunk = validate_import_chunk(declarative_meta, import_casters, required_keys, import_chunk, rejects)
+        import_chunk.clear()
+        if not valid_chunk:
+            return
+        loaded_list = load_import_chunk(declarative_meta, valid_chunk, session, rejects)
+        if loaded_list:
+            import_report['imported'] += len(loaded_list)
+            bump_table_version(declarative_meta.__table__.name)
+            publish_change_event(declarative_meta.__table__.name, 'insert', lambda: loaded_list)
+        observe_metric('import_chunk_size', len(valid_chunk))
+
+    for line_number, request_data_object, error in import_rows:
+        if error is not None:
+            append_import_reject(rejects, line_number, error)
+            continue
+        import_chunk.append((line_number, request_data_object))
+        if len(import_chunk) >= get_import_chunk_size():
+            flush_import_chunk()
+    if import_chunk:
+        flush_import_chunk()
@@ -0,0 +1,165 @@
+# System Imports #
+import re
+import threading
+
+# SqlAlchemy Imports #
+from sqlalchemy.sql import text
+
+
+# Global stored procedure signatures read from the database catalog, keyed by dialect and procedure name #
+stored_procedure_signatures = dict()
+stored_procedure_signatures_lock = threading.Lock()
+
+# Stored procedure and parameter names are part of the statement, so only plain identifiers are accepted #
+stored_procedure_name_pattern = re.compile(r'^[A-Za-z_][\w$]*(\.[A-Za-z_][\w$]*)?$')
+stored_procedure_parameter_pattern = re.compile(r'^@?[A-Za-z_]\w*$')
+
+# Column alias prefix of the SQL Server OUTPUT parameters result set #
+mssql_out_parameter_prefix = '__out_'
+
+
+def validate_stored_procedure_definitions(stored_procedure_name, out_params):
+    if stored_procedure_name is None or not stored_procedure_name_pattern.match(stored_procedure_name):
+        raise Exception(f"Invalid stored procedure name '{stored_procedure_name}'")
+    for key in out_params:
+        if not stored_procedure_parameter_pattern.match(key):
+            raise Exception(f"Invalid stored procedure parameter name '{key}'")
+
+
+# Method retrieves a stored procedure signature from cache, reading it from the database catalog when not found #
+def get_stored_procedure_signature(con, stored_procedure_name):
+    signature_key = (con.dialect.name, stored_procedure_name.lower())
+    with stored_procedure_signatures_lock:
+        signature = stored_procedure_signatures.get(signature_key)
+
+    if signature is None:
+        if con.dialect.name == 'postgresql':
+            signature = get_pgsql_stored_procedure_signature(con, stored_procedure_name)
+        elif con.dialect.name == 'mssql':
+            signature = get_mssql_stored_procedure_signature(con, stored_procedure_name)
+        else:
+            signature = dict()
+        with stored_procedure_signatures_lock:
+            stored_procedure_signatures[signature_key] = signature
+
+    return signature
+
+
+# Method reads if a PostgreSQL routine is a procedure or a function, looking it up on the search path #
+def get_pgsql_stored_procedure_signature(con, stored_procedure_name):
+    schema_name, routine_name = stored_procedure_name.split('.') if '.' in stored_procedure_name \
+        else (None, stored_procedure_name)
+    routine = con.execute(text(
+        "SELECT p.prokind FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace "
+        "WHERE p.proname = lower(:routine_name) AND (n.nspname = lower(CAST(:schema_name AS text)) "
+        "OR (CAST(:schema_name AS text) IS NULL AND n.nspname = ANY(current_schemas(true)))) "
+        "ORDER BY array_position(current_schemas(true), n.nspname) LIMIT 1"
+    ), {'routine_name': routine_name, 'schema_name': schema_name}).first()
+    if routine is None:
+        raise Exception(f"Stored procedure '{stored_procedure_name}' not found")
+    return {'kind': 'procedure' if routine[0] == 'p' else 'function'}
+
+
+# Method reads the type declarations of a SQL Server procedure OUTPUT parameters #
+def get_mssql_stored_procedure_signature(con, stored_procedure_name):
+    parameters = con.execute(text(
+        "SELECT p.name, TYPE_NAME(p.user_type_id), p.max_length, p.precision, p.scale FROM sys.parameters p "
+        "WHERE p.object_id = OBJECT_ID(:stored_procedure_name) AND p.is_output = 1 ORDER BY p.parameter_id"
+    ), {'stored_procedure_name': stored_procedure_name}).all()
+    return {'out_types': {
+        parameter[0].lstrip('@').lower(): build_mssql_type_declaration(*parameter[1:]) for parameter in parameters
+    }}
+
+
+def build_mssql_type_declaration(type_name, max_length, precision, scale):
+    if type_name in ('varchar', 'char', 'varbinary', 'binary'):
+        return f"{type_name}({'max' if max_length == -1 else max_length})"
+    if type_name in ('nvarchar', 'nchar'):
+        return f"{type_name}({'max' if max_length == -1 else max_length // 2})"
+    if type_name in ('decimal', 'numeric'):
+        return f'{type_name}({precision}, {scale})'
+    if type_name in ('datetime2', 'time', 'datetimeoffset'):
+        return f'{type_name}({scale})'
+    return type_name
+
+
+# Method calls a stored procedure with bound parameters using the dialect calling convention. Returns the call #
+# result (None when it has no result sets) and a method retrieving the OUT parameter values once every result set #
+# is consumed #
+def call_stored_procedure(con, stored_procedure_name, in_values, out_params):
+    validate_stored_procedure_definitions(stored_procedure_name, out_params)
+    signature = get_stored_procedure_signature(con, stored_procedure_name)
+
+    out_names = [key.lstrip('@') for key in out_params]
+    bind_values = {f'in_{i}': value for i, value in enumerate(in_values)}
+    bind_values.update({f'out_{name}': value for name, value in zip(out_names, out_params.values())})
+    in_args = [f':in_{i}' for i in range(len(in_values))]
+
+    if con.dialect.name == 'postgresql':
+        if signature['kind'] == 'function':
+            # Function OUT parameters are not arguments, they are the columns of its result #
+            result = con.execute(text(f"SELECT * FROM {stored_procedure_name}({', '.join(in_args)})"), bind_values)
+            if not out_names:
+                return result, None
+            out_row = result.mappings().first() or dict()
+            out_values = {name: out_row.get(name) for name in out_names}
+            return None, lambda: out_values
+        # Procedure OUT and INOUT values are returned as the single row of the call #
+        args = ', '.join(in_args + [f':out_{name}' for name in out_names])
+        result = con.execute(text(f'CALL {stored_procedure_name}({args})'), bind_values)
+        out_values = dict(zip(out_names, result.first() or tuple())) if out_names else None
+        return None, lambda: out_values
+
+    if con.dialect.name == 'mssql':
+        statements = [
+            f"DECLARE @{mssql_out_parameter_prefix}{name} "
+            f"{signature['out_types'].get(name.lower(), 'sql_variant')} = :out_{name};" for name in out_names
+        ]
+        exec_args = ', '.join(in_args + [f'@{name} = @{mssql_out_parameter_prefix}{name} OUTPUT' for name in out_names])
+        statements.append(f'EXEC {stored_procedure_name} {exec_args};')
+        # OUTPUT values are selected in the same batch as its last result set #
+        if out_names:
+            statements.append('SELECT ' + ', '.join(
+                f'@{mssql_out_parameter_prefix}{name} AS [{mssql_out_parameter_prefix}{name}]' for name in out_names
+            ) + ';')
+        return con.execute(text(' '.join(statements)), bind_values), None
+
+    # MySQL and MariaDB OUT parameters are session variables, initialized and read with a single statement each #
+    if out_names:
+        con.execute(text('SET ' + ', '.join(f'@{name} = :out_{name}' for name in out_names)), bind_values)
+    args = ', '.join(in_args + [f'@{name}' for name in out_names])
+    result = con.execute(text(f'CALL {stored_procedure_name}({args})'), bind_values)
+
+    def fetch_out_params():
+        if not out_names:
+            return None
+        return dict(con.execute(
+            text('SELECT ' + ', '.join(f'@{name} AS {name}' for name in out_names))
+        ).mappings().first())
+
+    return result, fetch_out_params
+
+
+# Method iterates over every result set of a stored procedure call, yielding its column names and a generator of #
+# row chunks. SQL Server OUTPUT values are not yielded, being stored on out_values instead #
+def iterate_stored_procedure_result_sets(result, chunk_size, out_values):
+    cursor = result.cursor
+    while True:
+        if cursor.description is not None:
+            columns = [column[0] for column in cursor.description]
+            if columns and all(column.startswith(mssql_out_parameter_prefix) for column in columns):
+                out_values.update(zip([column[len(mssql_out_parameter_prefix):] for column in columns],
+                                      cursor.fetchone() or tuple()))
+            else:
+                yield columns, iterate_cursor_chunks(cursor, chunk_size)
+        # Drivers without multiple result sets support have no nextset method #
+        if not hasattr(cursor, 'nextset') or not cursor.nextset():
+            break
+
+
+def iterate_cursor_chunks(cursor, chunk_size):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
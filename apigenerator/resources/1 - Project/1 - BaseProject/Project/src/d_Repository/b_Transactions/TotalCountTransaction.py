@@ -0,0 +1,90 @@
+# System Imports #
+import threading
+import time
+
+# SqlAlchemy Imports #
+from sqlalchemy.sql import text
+
+# Transaction Imports #
+from src.d_Repository.b_Transactions.GenericDatabaseTransaction import *
+
+
+# Global table row estimates read from the database catalog, keyed by dialect and table name, with their read time #
+table_row_estimates = dict()
+table_row_estimates_lock = threading.Lock()
+
+# Catalog queries estimating a table row count without scanning it, by dialect #
+table_row_estimate_queries = {
+    # Negative when the table was never vacuumed nor analyzed #
+    'postgresql': "SELECT CAST(reltuples AS bigint) FROM pg_class WHERE oid = to_regclass(:table_name)",
+    'mysql': "SELECT TABLE_ROWS FROM information_schema.TABLES "
+             "WHERE TABLE_SCHEMA = COALESCE(:schema_name, DATABASE()) AND TABLE_NAME = :table_name",
+    'mssql': "SELECT SUM(rows) FROM sys.partitions WHERE object_id = OBJECT_ID(:table_name) AND index_id IN (0, 1)",
+}
+
+
+def get_total_count_exact_threshold():
+    total_count_exact_threshold = get_global_variable('total_count_exact_threshold')
+    return int(total_count_exact_threshold) if total_count_exact_threshold not in (None, '') else 100000
+
+
+def get_total_count_estimate_ttl():
+    total_count_estimate_ttl = get_global_variable('total_count_estimate_ttl')
+    return int(total_count_estimate_ttl) if total_count_estimate_ttl not in (None, '') else 60
+
+
+# Method retrieves a table row estimate from cache, reading it from the database catalog when not found or expired. #
+# Returns None when the dialect has no catalog estimate or the table was never analyzed #
+def get_table_row_estimate(session, declarative_meta):
+    dialect_name = session.get_bind().dialect.name
+    table = declarative_meta.__table__
+    estimate_key = (dialect_name, table.fullname)
+    now = time.monotonic()
+    with table_row_estimates_lock:
+        row_estimate = table_row_estimates.get(estimate_key)
+    if row_estimate is not None and now - row_estimate[1] < get_total_count_estimate_ttl():
+        return row_estimate[0]
+
+    if dialect_name not in table_row_estimate_queries:
+        return None
+    estimate = session.execute(text(table_row_estimate_queries[dialect_name]), {
+        'table_name': table.name if dialect_name == 'mysql' else table.fullname, 'schema_name': table.schema
+    }).scalar()
+    estimate = int(estimate) if estimate is not None and estimate >= 0 else None
+    with table_row_estimates_lock:
+        table_row_estimates[estimate_key] = (estimate, now)
+    return estimate
+
+
+# Method selects a list of objects along with the total count of the objects matching the request and its type. #
+# Unfiltered requests on tables whose catalog estimate reaches total_count_exact_threshold get the estimate, every #
+# other request gets the exact count from a window function on the same statement #
+def select_all_object_list_with_total_count(declarative_meta, request_args, session, header_args):
+    if not request_args and not [key for key in (header_args.get('HTTP_GROUPBY') or list()) if key != '']:
+        row_estimate = get_table_row_estimate(session, declarative_meta)
+        if row_estimate is not None and row_estimate >= get_total_count_exact_threshold():
+            return select_all_object_list(declarative_meta, request_args, session, header_args), row_estimate, \
+                'estimated'
+
+    try:
+        statement, bind_values = build_query_from_api_request(
+            declarative_meta, request_args, header_args, True, total_count=True
+        )
+        rows = execute_filtered_statement(statement, bind_values, session).all()
+        # Every row carries the total count as its last column. Pages past the last row carry none, so the matching #
+        # rows are counted on their own #
+        if rows:
+            total_count = rows[0][-1]
+        elif 'pagination_offset' in bind_values:
+            count_statement, count_bind_values = build_count_query_from_api_request(
+                declarative_meta, request_args, header_args
+            )
+            total_count = execute_filtered_statement(count_statement, count_bind_values, session).scalar()
+        else:
+            total_count = 0
+    except Exception as e:
+        session.rollback()
+        raise e
+    if statement.column_descriptions[0]['expr'] is declarative_meta:
+        rows = [row[0] for row in rows]
+    return validate_non_serializable_types(rows, declarative_meta), total_count, 'exact'
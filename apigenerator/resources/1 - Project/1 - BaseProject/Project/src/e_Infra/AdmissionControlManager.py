@@ -0,0 +1,186 @@
+# System Imports #
+import math
+import sqlite3
+import threading
+import time
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Global concurrency slots by route class, each one with its semaphore and number of queued requests #
+admission_slots = dict()
+admission_slots_lock = threading.Lock()
+
+# Global in-process token buckets by client key #
+rate_limit_buckets = dict()
+rate_limit_buckets_lock = threading.Lock()
+
+# Shared storage connections, one per thread #
+rate_limit_storage_connections = threading.local()
+
+# The shared storage is pruned of idle buckets once every this many tokens consumed by the process, the first one #
+# included #
+rate_limit_storage_prune_interval = 1000
+rate_limit_storage_call_count = 0
+rate_limit_storage_call_count_lock = threading.Lock()
+
+
+def get_integer_global_variable(variable_name, default_value):
+    variable_value = get_global_variable(variable_name)
+    return int(variable_value) if variable_value not in (None, '') else default_value
+
+
+def get_float_global_variable(variable_name, default_value):
+    variable_value = get_global_variable(variable_name)
+    return float(variable_value) if variable_value not in (None, '') else default_value
+
+
+# Method retrieves the route class used for concurrency limits, documentation and metrics routes are not limited #
+def get_route_class(path, method):
+    if method == 'OPTIONS' or path == '/metrics' or path.startswith(('/swagger', '/redoc', '/static')):
+        return None
+    # Change feed streams stay open as long as their clients listen, they are bounded by their own subscribers limit #
+    if path.endswith('/_stream'):
+        return None
+    if path.startswith('/sql'):
+        return 'sql'
+    if method in ('GET', 'HEAD'):
+        return 'read'
+    return 'write'
+
+
+def get_admission_slot(route_class, concurrency_limit):
+    with admission_slots_lock:
+        if route_class not in admission_slots:
+            admission_slots[route_class] = {
+                'semaphore': threading.BoundedSemaphore(concurrency_limit), 'waiting': 0
+            }
+        return admission_slots[route_class]
+
+
+# Method acquires a concurrency slot for the route class, returning 'unlimited', 'admitted' or 'rejected' #
+def acquire_admission_slot(route_class):
+    concurrency_limit = get_integer_global_variable(f'admission_{route_class}_concurrency', 0)
+    if concurrency_limit <= 0:
+        return 'unlimited'
+
+    slot = get_admission_slot(route_class, concurrency_limit)
+    if slot['semaphore'].acquire(blocking=False):
+        increment_metric('admission_admitted')
+        return 'admitted'
+
+    # Rejecting right away when the wait queue is full #
+    with admission_slots_lock:
+        if slot['waiting'] >= get_integer_global_variable('admission_queue_size', 64):
+            increment_metric('admission_rejected_queue_full')
+            return 'rejected'
+        slot['waiting'] += 1
+
+    wait_start = time.perf_counter()
+    try:
+        admitted = slot['semaphore'].acquire(
+            timeout=get_integer_global_variable('admission_queue_timeout_ms', 1000) / 1000
+        )
+    finally:
+        with admission_slots_lock:
+            slot['waiting'] -= 1
+    observe_metric('admission_wait_ms', round((time.perf_counter() - wait_start) * 1000, 3))
+
+    if not admitted:
+        increment_metric('admission_rejected_timeout')
+        return 'rejected'
+    increment_metric('admission_admitted')
+    return 'admitted'
+
+
+def release_admission_slot(route_class):
+    with admission_slots_lock:
+        slot = admission_slots.get(route_class)
+    if slot is not None:
+        slot['semaphore'].release()
+
+
+def get_admission_retry_after():
+    return get_integer_global_variable('admission_retry_after', 1)
+
+
+# Method refills a token bucket by the elapsed time and consumes one token, returning the bucket tokens and the #
+# seconds to wait for the next token when none is available #
+def consume_token_bucket(tokens, updated_at, now, rate, burst):
+    tokens = burst if tokens is None else min(burst, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+# Method consumes a rate limit token of the client key, returning 0 when allowed or the seconds to retry after #
+def consume_rate_limit_token(client_key):
+    rate = get_float_global_variable('rate_limit_per_second', 0)
+    if rate <= 0:
+        return 0
+    burst = max(get_float_global_variable('rate_limit_burst', 0), rate, 1)
+    now = time.time()
+
+    if get_global_variable('rate_limit_storage'):
+        retry_after = consume_shared_rate_limit_token(client_key, now, rate, burst)
+    else:
+        with rate_limit_buckets_lock:
+            tokens, updated_at = rate_limit_buckets.get(client_key, (None, now))
+            tokens, retry_after = consume_token_bucket(tokens, updated_at, now, rate, burst)
+            rate_limit_buckets[client_key] = (tokens, now)
+            # Dropping buckets already refilled, they behave exactly as new ones #
+            if len(rate_limit_buckets) > 10000:
+                for key in [key for key, (_, bucket_updated_at) in rate_limit_buckets.items()
+                            if now - bucket_updated_at > burst / rate]:
+                    del rate_limit_buckets[key]
+
+    if retry_after:
+        increment_metric('rate_limit_rejected')
+        return math.ceil(retry_after)
+    return 0
+
+
+# Method consumes a token from a sqlite database shared by all workers of the host, e.g. placed on /dev/shm #
+def consume_shared_rate_limit_token(client_key, now, rate, burst):
+    connection = getattr(rate_limit_storage_connections, 'connection', None)
+    if connection is None:
+        connection = sqlite3.connect(get_global_variable('rate_limit_storage'), timeout=1, isolation_level=None)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_buckets (client_key TEXT PRIMARY KEY, tokens REAL, updated_at REAL)'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)'
+        )
+        rate_limit_storage_connections.connection = connection
+
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        bucket = connection.execute(
+            'SELECT tokens, updated_at FROM rate_limit_buckets WHERE client_key = ?', (client_key,)
+        ).fetchone()
+        tokens, updated_at = bucket if bucket is not None else (None, now)
+        tokens, retry_after = consume_token_bucket(tokens, updated_at, now, rate, burst)
+        connection.execute(
+            'INSERT OR REPLACE INTO rate_limit_buckets (client_key, tokens, updated_at) VALUES (?, ?, ?)',
+            (client_key, tokens, now)
+        )
+        connection.execute('COMMIT')
+    except Exception as e:
+        connection.execute('ROLLBACK')
+        raise e
+    if is_rate_limit_storage_prune_due():
+        # Dropping buckets already refilled, they behave exactly as new ones #
+        connection.execute('DELETE FROM rate_limit_buckets WHERE updated_at < ?', (now - burst / rate,))
+    return retry_after
+
+
+# Method tells if a token consumed from the shared storage should prune it, so the pruning cost is paid once every #
+# few calls only #
+def is_rate_limit_storage_prune_due():
+    global rate_limit_storage_call_count
+
+    with rate_limit_storage_call_count_lock:
+        rate_limit_storage_call_count += 1
+        return (rate_limit_storage_call_count - 1) % rate_limit_storage_prune_interval == 0
@@ -0,0 +1,147 @@
+# System Imports #
+import json
+import queue
+import threading
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Global change feed subscribers keyed by table name, each one with its bounded event buffer #
+change_feed_subscribers = dict()
+change_feed_subscribers_lock = threading.Lock()
+
+# Global background threads feeding the change feed, keyed by the name of what they feed #
+change_feed_threads = dict()
+
+# Channel the generated PostgreSQL triggers notify the table writes on #
+change_feed_channel = 'pythonrest_change_feed'
+
+
+# Method retrieves the change feed source: 'process', the default, publishes the writes made by the API itself and #
+# polls the watermark of the tracked tables for the writes made outside of it, while 'notify' listens to the #
+# notifications of the generated PostgreSQL triggers, catching every write of the database. 'notify' is opt in, as #
+# streams stay silent until the triggers script is run on the database #
+def get_change_feed_source():
+    change_feed_source = get_global_variable('change_feed_source')
+    return change_feed_source if change_feed_source not in (None, '') else 'process'
+
+
+def get_change_feed_buffer_size():
+    change_feed_buffer_size = get_global_variable('change_feed_buffer_size')
+    return int(change_feed_buffer_size) if change_feed_buffer_size not in (None, '') else 1000
+
+
+def get_change_feed_max_subscribers():
+    change_feed_max_subscribers = get_global_variable('change_feed_max_subscribers')
+    return int(change_feed_max_subscribers) if change_feed_max_subscribers not in (None, '') else 100
+
+
+def get_change_feed_heartbeat_interval():
+    change_feed_heartbeat_interval = get_global_variable('change_feed_heartbeat_interval')
+    return float(change_feed_heartbeat_interval) if change_feed_heartbeat_interval not in (None, '') else 15
+
+
+def get_change_feed_poll_interval():
+    change_feed_poll_interval = get_global_variable('change_feed_poll_interval')
+    return float(change_feed_poll_interval) if change_feed_poll_interval not in (None, '') else 5
+
+
+def has_change_feed_subscribers(table_name):
+    with change_feed_subscribers_lock:
+        return bool(change_feed_subscribers.get(table_name))
+
+
+# Method sends an event to every subscriber of a table without ever blocking the writer. A subscriber whose buffer #
+# is full is marked as overflowed instead, and its stream ends telling the client to catch up from the changes route #
+def deliver_change_event(table_name, operation, object_dict):
+    with change_feed_subscribers_lock:
+        subscriber_list = list(change_feed_subscribers.get(table_name, list()))
+    for subscriber in subscriber_list:
+        if subscriber['overflowed']:
+            continue
+        try:
+            subscriber['events'].put_nowait((operation, object_dict))
+        except queue.Full:
+            subscriber['overflowed'] = True
+            increment_metric('change_feed_overflows')
+    increment_metric('change_feed_events')
+
+
+# Method publishes the committed writes of the API on a table, unless the database notifies them itself. The written #
+# objects are only dumped when the table has subscribers, and the writes of a transactional batch are kept until the #
+# batch commits #
+def publish_change_event(table_name, operation, get_object_dict_list):
+    if get_change_feed_source() != 'process' or not has_change_feed_subscribers(table_name):
+        return
+    object_dict_list = get_object_dict_list()
+    if has_request_context() and g.get('batch_transaction') is not None:
+        g.batch_transaction['change_events'].append((table_name, operation, object_dict_list))
+        return
+    for object_dict in object_dict_list:
+        deliver_change_event(table_name, operation, object_dict)
+
+
+# Method subscribes to the change events of a table, None being returned once the maximum number of subscribers is #
+# reached #
+def subscribe_change_feed(table_name):
+    subscriber = {'events': queue.Queue(maxsize=get_change_feed_buffer_size()), 'overflowed': False}
+    with change_feed_subscribers_lock:
+        if sum(len(subscriber_list) for subscriber_list in change_feed_subscribers.values()) \
+                >= get_change_feed_max_subscribers():
+            return None
+        change_feed_subscribers.setdefault(table_name, list()).append(subscriber)
+    return subscriber
+
+
+def unsubscribe_change_feed(table_name, subscriber):
+    with change_feed_subscribers_lock:
+        subscriber_list = change_feed_subscribers.get(table_name, list())
+        if subscriber in subscriber_list:
+            subscriber_list.remove(subscriber)
+        if not subscriber_list:
+            change_feed_subscribers.pop(table_name, None)
+
+
+# Method starts a background thread feeding the change feed, unless the one of the same name is still running. #
+# Threads whose target returns once there are no subscribers left are started again by the next subscriber #
+def start_change_feed_thread(thread_name, target, *args):
+    with change_feed_subscribers_lock:
+        thread = change_feed_threads.get(thread_name)
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(target=target, args=args, name=thread_name, daemon=True)
+        change_feed_threads[thread_name] = thread
+        thread.start()
+
+
+# Method formats a server-sent event, its data being a single json line #
+def format_change_event(event_name, data):
+    return f'event: {event_name}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+# Method streams the change events of a subscriber as server-sent events, sending a comment line whenever the #
+# heartbeat interval goes by without events so idle connections are kept open. The stream ends with an overflow #
+# event when the client reads slower than the table is written #
+def iterate_change_events(table_name, subscriber):
+    try:
+        yield ': connected\n\n'
+        while True:
+            try:
+                operation, object_dict = subscriber['events'].get(timeout=get_change_feed_heartbeat_interval())
+            except queue.Empty:
+                if subscriber['overflowed']:
+                    yield format_change_event('overflow', {'table': table_name})
+                    return
+                yield ': keep-alive\n\n'
+                continue
+            yield format_change_event(operation, object_dict)
+            if subscriber['overflowed'] and subscriber['events'].empty():
+                yield format_change_event('overflow', {'table': table_name})
+                return
+    finally:
+        unsubscribe_change_feed(table_name, subscriber)
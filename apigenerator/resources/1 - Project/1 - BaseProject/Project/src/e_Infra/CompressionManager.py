@@ -0,0 +1,209 @@
+# System Imports #
+import gzip
+import hashlib
+import threading
+import time
+import zlib
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+# Brotli and Zstandard encodings are only negotiated when their optional library is installed #
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Content type prefixes worth compressing, binary media is usually compressed already #
+compressible_content_types = (
+    'text/', 'application/json', 'application/x-ndjson', 'application/vnd.', 'application/javascript',
+    'application/xml', 'application/yaml', 'application/msgpack'
+)
+
+# Default and maximum compression levels by encoding #
+encoding_compression_levels = {
+    'gzip': {'default': 6, 'max': 9},
+    'br': {'default': 4, 'max': 11},
+    'zstd': {'default': 3, 'max': 22},
+}
+
+# Documentation pages are compressed once for each encoding and level, then served from memory #
+precompressed_paths = ('/swagger', '/redoc')
+precompressed_bodies = dict()
+precompressed_bodies_lock = threading.Lock()
+
+
+def is_compression_enabled():
+    return get_global_variable('compression_enabled') != 'False'
+
+
+def get_compression_min_size():
+    compression_min_size = get_global_variable('compression_min_size')
+    return int(compression_min_size) if compression_min_size not in (None, '') else 1024
+
+
+def is_encoding_available(encoding):
+    return encoding == 'gzip' or encoding == 'br' and brotli is not None or encoding == 'zstd' and zstandard is not None
+
+
+# Method retrieves the response encoding from the Accept-Encoding header. The client quality values come first and #
+# ties are broken by the compression_encodings order. Returns None when no available encoding is accepted #
+def get_response_encoding(accept_encoding):
+    server_encodings = [
+        encoding.strip() for encoding in (get_global_variable('compression_encodings') or 'zstd, br, gzip').split(',')
+        if is_encoding_available(encoding.strip())
+    ]
+    accepted_encodings = dict()
+    for coding in (accept_encoding or '').split(','):
+        encoding, *parameters = [part.strip() for part in coding.split(';')]
+        quality = 1.0
+        for parameter in parameters:
+            if parameter.startswith('q='):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted_encodings[encoding.lower()] = quality
+
+    candidate_encodings = [
+        (-accepted_encodings.get(encoding, accepted_encodings.get('*', 0)), index, encoding)
+        for index, encoding in enumerate(server_encodings)
+    ]
+    candidate_encodings = [candidate for candidate in sorted(candidate_encodings) if candidate[0] < 0]
+    return candidate_encodings[0][2] if candidate_encodings else None
+
+
+# Method retrieves the compression level of a content type for the given encoding. compression_levels holds #
+# 'content_type=level' pairs, optionally prefixed by the encoding, e.g. 'br:text/html=11, application/json=5' #
+def get_compression_level(encoding, content_type):
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    compression_level = None
+    for level_definition in (get_global_variable('compression_levels') or '').split(','):
+        if '=' not in level_definition:
+            continue
+        level_media_type, level = [part.strip() for part in level_definition.split('=', 1)]
+        level_encoding, _, level_media_type = level_media_type.rpartition(':')
+        if level_media_type.lower() == media_type and level_encoding in ('', encoding):
+            compression_level = int(level)
+            # Encoding specific levels take precedence over the generic ones #
+            if level_encoding == encoding:
+                break
+    if compression_level is None:
+        return encoding_compression_levels[encoding]['default']
+    return max(0 if encoding == 'br' else 1, min(compression_level, encoding_compression_levels[encoding]['max']))
+
+
+def compress_data(encoding, level, data):
+    if encoding == 'gzip':
+        return gzip.compress(data, level)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+# Method retrieves an incremental compressor whose chunks are flushed as they are produced, so streamed responses #
+# keep reaching the client while compressed #
+def get_stream_compressor(encoding, level):
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        return lambda chunk: compressor.process(chunk) + compressor.flush(), compressor.finish
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush)
+
+
+def observe_compression(encoding, compression_time, original_size, compressed_size):
+    observe_metric(f'compression_{encoding}_ms', round(compression_time * 1000, 3))
+    increment_metric('compression_bytes_in', original_size)
+    increment_metric('compression_bytes_out', compressed_size)
+    if original_size:
+        observe_metric('compression_ratio', round(compressed_size / original_size, 4))
+
+
+# Method compresses a response with the encoding negotiated by the Accept-Encoding header. Responses below #
+# compression_min_size are sent as is, while streamed responses are compressed chunk by chunk #
+def compress_response(response, accept_encoding, request_method, request_path):
+    if not is_compression_enabled() or request_method == 'HEAD' or response.direct_passthrough \
+            or response.status_code < 200 or response.status_code in (204, 304) \
+            or 'Content-Encoding' in response.headers \
+            or not (response.content_type or '').startswith(compressible_content_types):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = get_response_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    level = get_compression_level(encoding, response.content_type)
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < get_compression_min_size():
+            return response
+        started_at = time.perf_counter()
+        if request_path in precompressed_paths:
+            compressed_data = get_precompressed_body(encoding, level, data)
+        else:
+            compressed_data = compress_data(encoding, level, data)
+        observe_compression(encoding, time.perf_counter() - started_at, len(data), len(compressed_data))
+        response.set_data(compressed_data)
+
+    response.headers['Content-Encoding'] = encoding
+    # Each encoding is a representation of its own, tagged apart from the identity one #
+    entity_tag = response.headers.get('ETag')
+    if entity_tag is not None and entity_tag.endswith('"'):
+        response.headers['ETag'] = f'{entity_tag[:-1]}-{encoding}"'
+    return response
+
+
+# Method retrieves a documentation page compressed body from memory, compressing it when not found #
+def get_precompressed_body(encoding, level, data):
+    body_key = (encoding, level, hashlib.blake2b(data, digest_size=16).digest())
+    with precompressed_bodies_lock:
+        compressed_data = precompressed_bodies.get(body_key)
+    if compressed_data is None:
+        compressed_data = compress_data(encoding, level, data)
+        with precompressed_bodies_lock:
+            # Bodies of previous swagger versions are no longer requested #
+            if len(precompressed_bodies) > 32:
+                precompressed_bodies.clear()
+            precompressed_bodies[body_key] = compressed_data
+    return compressed_data
+
+
+# Method compresses a streamed body chunk by chunk, closing the original body once done so its resources are freed #
+def compress_stream(body, encoding, level):
+    compress_chunk, finish = get_stream_compressor(encoding, level)
+    original_size = 0
+    compressed_size = 0
+    compression_time = 0
+    try:
+        for chunk in body:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if not chunk:
+                continue
+            started_at = time.perf_counter()
+            compressed_chunk = compress_chunk(chunk)
+            compression_time += time.perf_counter() - started_at
+            original_size += len(chunk)
+            compressed_size += len(compressed_chunk)
+            yield compressed_chunk
+        compressed_chunk = finish()
+        compressed_size += len(compressed_chunk)
+        yield compressed_chunk
+        observe_compression(encoding, compression_time, original_size, compressed_size)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
@@ -0,0 +1,128 @@
+# System Imports #
+import hashlib
+import secrets
+import threading
+import time
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# Werkzeug Imports #
+from werkzeug.http import http_date, parse_date
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.RelationshipResolver import get_expand_relationship
+
+
+# Global table versions keyed by table name, each one with the time of its last write. Writes of unknown tables, #
+# such as the ones sent to the /sql route, bump the None key, which every table version depends on #
+table_versions = dict()
+table_versions_lock = threading.Lock()
+
+# Versions restart with the process, so a token tells the entity tags of each process apart #
+process_version_token = secrets.token_hex(4)
+process_started_at = int(time.time())
+
+# Request headers that make part of a conditional GET route response #
+conditional_header_names = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+
+# Method retrieves the entity tag strategy: 'version' tags responses with the table version counter bumped by the API #
+# writes, answering matching requests without querying the database, 'hash' tags responses with their body hash and #
+# 'False' disables entity tags #
+def get_etag_strategy():
+    return get_global_variable('etag_strategy') or 'hash'
+
+
+# Method bumps the version of a table after a committed write, or of every table when none is given. The writes of a #
+# transactional batch are kept until the batch commits, so no version is bumped for writes rolled back #
+def bump_table_version(table_name=None):
+    if has_request_context() and g.get('batch_transaction') is not None:
+        g.batch_transaction['table_versions'].add(table_name)
+        return
+    with table_versions_lock:
+        version, _ = table_versions.get(table_name, (0, process_started_at))
+        table_versions[table_name] = (version + 1, int(time.time()))
+
+
+# Method retrieves the current version and last write time of a table, writes of unknown tables included #
+def get_table_version(table_name):
+    with table_versions_lock:
+        version, last_modified = table_versions.get(table_name, (0, process_started_at))
+        global_version, global_last_modified = table_versions.get(None, (0, process_started_at))
+    return f'{version}.{global_version}', max(last_modified, global_last_modified)
+
+
+# Method retrieves the names of the tables a GET route request reads, the ones of its expanded relationships included #
+def get_request_table_names(declarative_meta, header_args):
+    table_names = [declarative_meta.__table__.name]
+    for expand_path in header_args.get('HTTP_EXPAND') or list():
+        path_declarative_meta = declarative_meta
+        for relationship_name in expand_path:
+            path_declarative_meta = get_expand_relationship(path_declarative_meta, relationship_name)[2]
+            table_names.append(path_declarative_meta.__table__.name)
+    return list(dict.fromkeys(table_names))
+
+
+# Method retrieves the version entity tag and last modified time of a GET route request, changing whenever one of the #
+# tables it reads is written or the request args and headers change. Returns None unless the 'version' strategy is set #
+def get_version_entity_tag(declarative_meta, request_args, header_args):
+    if get_etag_strategy() != 'version':
+        return None
+    table_versions_list = [
+        get_table_version(table_name) for table_name in get_request_table_names(declarative_meta, header_args)
+    ]
+    version = '.'.join(table_version for table_version, _ in table_versions_list)
+    last_modified = max(table_last_modified for _, table_last_modified in table_versions_list)
+    request_shape = repr((
+        declarative_meta.__table__.name, sorted(request_args.items(), key=str),
+        sorted((key, str(value)) for key, value in header_args.items() if key not in conditional_header_names)
+    ))
+    request_hash = hashlib.blake2b(request_shape.encode(), digest_size=8).hexdigest()
+    return f'"{process_version_token}.{version}.{request_hash}"', last_modified
+
+
+# Method checks if the client copy is up to date by the If-None-Match header, or by the If-Modified-Since header #
+# when there is no If-None-Match. Encoding suffixes added to compressed responses tags are ignored #
+def is_not_modified(header_args, entity_tag, last_modified=None):
+    if_none_match = header_args.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        for client_tag in if_none_match.split(','):
+            client_tag = client_tag.strip()
+            if client_tag.startswith('W/'):
+                client_tag = client_tag[2:]
+            if client_tag == '*' or client_tag.split('-')[0].rstrip('"') == entity_tag.rstrip('"'):
+                return True
+        return False
+    if_modified_since = parse_date(header_args.get('HTTP_IF_MODIFIED_SINCE') or '')
+    return last_modified is not None and if_modified_since is not None and \
+        last_modified <= int(if_modified_since.timestamp())
+
+
+def get_entity_tag_headers(entity_tag, last_modified=None):
+    headers = {'ETag': entity_tag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+# Method tags a GET route response with its version entity tag, or with its body hash on the 'hash' strategy, #
+# emptying it into a 304 Not Modified when the client copy is up to date. Streamed bodies are only tagged by version #
+def apply_entity_tag(response, header_args, version_entity_tag=None):
+    if version_entity_tag is not None:
+        entity_tag, last_modified = version_entity_tag
+    elif get_etag_strategy() == 'hash' and not response.is_streamed:
+        entity_tag, last_modified = f'"{hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()}"', None
+    else:
+        return response
+    response.headers.update(get_entity_tag_headers(entity_tag, last_modified))
+    if is_not_modified(header_args, entity_tag, last_modified):
+        increment_metric('etag_not_modified')
+        response.status_code = 304
+        response.set_data(b'')
+        response.headers.pop('Content-Type', None)
+    return response
@@ -0,0 +1,193 @@
+# System Imports #
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Global in-flight idempotency keys of this process, each one with the event set once its response is stored, so #
+# duplicates sent to the same process wake up right away instead of polling the store #
+in_flight_idempotency_keys = dict()
+in_flight_idempotency_keys_lock = threading.Lock()
+
+# The store table is created once per process #
+idempotency_store_ready = False
+idempotency_store_lock = threading.Lock()
+
+# Interval at which duplicates of a request in flight check the store for its response #
+idempotency_poll_interval = 0.05
+
+# The store is pruned once every this many keys claimed by the process, the first one included #
+idempotency_prune_interval = 100
+idempotency_claim_count = 0
+idempotency_claim_count_lock = threading.Lock()
+
+# Methods whose requests are deduplicated by the Idempotency-Key header #
+idempotent_methods = ('POST', 'PUT', 'PATCH')
+
+
+def is_idempotency_enabled():
+    return str(get_global_variable('idempotency_enabled')).lower() != 'false'
+
+
+def get_idempotency_store_path():
+    return get_global_variable('idempotency_store_path') or 'idempotency.sqlite3'
+
+
+def get_idempotency_ttl():
+    idempotency_ttl = get_global_variable('idempotency_ttl')
+    return int(idempotency_ttl) if idempotency_ttl not in (None, '') else 86400
+
+
+def get_idempotency_max_entries():
+    idempotency_max_entries = get_global_variable('idempotency_max_entries')
+    return int(idempotency_max_entries) if idempotency_max_entries not in (None, '') else 10000
+
+
+def get_idempotency_wait_timeout():
+    idempotency_wait_timeout = get_global_variable('idempotency_wait_timeout')
+    return float(idempotency_wait_timeout) if idempotency_wait_timeout not in (None, '') else 30
+
+
+# Method opens a connection to the idempotency store, a SQLite file shared by the API processes of the host. Each #
+# statement runs in a transaction of its own #
+def get_idempotency_store_connection():
+    global idempotency_store_ready
+
+    connection = sqlite3.connect(get_idempotency_store_path(), timeout=10, isolation_level=None)
+    if not idempotency_store_ready:
+        with idempotency_store_lock:
+            if not idempotency_store_ready:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS idempotency_keys (store_key TEXT PRIMARY KEY, fingerprint TEXT '
+                    'NOT NULL, created_at REAL NOT NULL, status INTEGER, headers TEXT, body BLOB)'
+                )
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS idempotency_keys_created_at ON idempotency_keys (created_at)'
+                )
+                idempotency_store_ready = True
+    return connection
+
+
+# Method builds the fingerprint of a request, telling a retry apart from another request reusing its key #
+def get_idempotency_fingerprint(method, path, query_string, body):
+    fingerprint = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query_string, body):
+        fingerprint.update(hashlib.sha256(part).digest())
+    return fingerprint.hexdigest()
+
+
+# Method tells if a claim should prune the store, so the pruning cost is paid once every few claims only #
+def is_idempotency_prune_due():
+    global idempotency_claim_count
+
+    with idempotency_claim_count_lock:
+        idempotency_claim_count += 1
+        return (idempotency_claim_count - 1) % idempotency_prune_interval == 0
+
+
+# Method removes the expired entries of the store, then the oldest ones past its maximum number of entries. Only #
+# answered entries are evicted, keys of requests in flight are kept so their duplicates never run again. Entries still #
+# unanswered past the TTL were left by a process that died, and are removed as well #
+def prune_idempotency_store(connection):
+    connection.execute('DELETE FROM idempotency_keys WHERE created_at < ?', (time.time() - get_idempotency_ttl(),))
+    connection.execute(
+        'DELETE FROM idempotency_keys WHERE store_key IN (SELECT store_key FROM idempotency_keys '
+        'WHERE status IS NOT NULL ORDER BY created_at LIMIT max(0, (SELECT count(*) FROM idempotency_keys '
+        'WHERE status IS NOT NULL) - ?))',
+        (get_idempotency_max_entries(),)
+    )
+
+
+# Method claims an idempotency key for a request. It returns ('claimed', None) when the request is the first one sent #
+# with the key, ('replay', stored response) when a previous request with the key was already answered, ('mismatch', #
+# None) when the key was sent with another request and ('in_flight', None) when the first request is still running #
+# after the wait timeout. Duplicates of a request in flight wait for its response #
+def claim_idempotency_key(store_key, fingerprint):
+    deadline = time.monotonic() + get_idempotency_wait_timeout()
+    connection = get_idempotency_store_connection()
+    try:
+        while True:
+            try:
+                connection.execute(
+                    'INSERT INTO idempotency_keys (store_key, fingerprint, created_at) VALUES (?, ?, ?)',
+                    (store_key, fingerprint, time.time())
+                )
+                with in_flight_idempotency_keys_lock:
+                    in_flight_idempotency_keys[store_key] = threading.Event()
+                if is_idempotency_prune_due():
+                    prune_idempotency_store(connection)
+                return 'claimed', None
+            except sqlite3.IntegrityError:
+                pass
+
+            stored_entry = connection.execute(
+                'SELECT fingerprint, status, headers, body, created_at FROM idempotency_keys WHERE store_key = ?',
+                (store_key,)
+            ).fetchone()
+            # The entry expired or its request failed in the meantime, the key is claimed again #
+            if stored_entry is None:
+                continue
+            stored_fingerprint, status, headers, body, created_at = stored_entry
+            # Expired entries the store was not pruned of yet are removed, so they are never replayed #
+            if created_at < time.time() - get_idempotency_ttl():
+                connection.execute(
+                    'DELETE FROM idempotency_keys WHERE store_key = ? AND created_at = ?', (store_key, created_at)
+                )
+                continue
+            if stored_fingerprint != fingerprint:
+                return 'mismatch', None
+            if status is not None:
+                increment_metric('idempotency_replays')
+                return 'replay', {'status': status, 'headers': json.loads(headers), 'body': body}
+            if time.monotonic() >= deadline:
+                return 'in_flight', None
+
+            increment_metric('idempotency_waits')
+            with in_flight_idempotency_keys_lock:
+                in_flight_event = in_flight_idempotency_keys.get(store_key)
+            if in_flight_event is not None:
+                in_flight_event.wait(idempotency_poll_interval)
+            else:
+                time.sleep(idempotency_poll_interval)
+    finally:
+        connection.close()
+
+
+# Method stores the response of a claimed idempotency key, waking up its duplicates. Server errors are not stored, #
+# the key is released instead so the next retry runs the request again #
+def complete_idempotency_key(store_key, status, headers, body):
+    connection = get_idempotency_store_connection()
+    try:
+        if status >= 500:
+            connection.execute('DELETE FROM idempotency_keys WHERE store_key = ?', (store_key,))
+        else:
+            connection.execute(
+                'UPDATE idempotency_keys SET status = ?, headers = ?, body = ? WHERE store_key = ?',
+                (status, json.dumps(headers), body, store_key)
+            )
+    finally:
+        connection.close()
+        with in_flight_idempotency_keys_lock:
+            in_flight_event = in_flight_idempotency_keys.pop(store_key, None)
+        if in_flight_event is not None:
+            in_flight_event.set()
+
+
+# Method releases a claimed idempotency key whose request ended without a response to store #
+def release_idempotency_key(store_key):
+    connection = get_idempotency_store_connection()
+    try:
+        connection.execute('DELETE FROM idempotency_keys WHERE store_key = ? AND status IS NULL', (store_key,))
+    finally:
+        connection.close()
+        with in_flight_idempotency_keys_lock:
+            in_flight_event = in_flight_idempotency_keys.pop(store_key, None)
+        if in_flight_event is not None:
+            in_flight_event.set()
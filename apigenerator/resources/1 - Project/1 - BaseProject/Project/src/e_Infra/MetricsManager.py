@@ -0,0 +1,41 @@
+# System Imports #
+import threading
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+
+
+# Global in-process metrics, each worker process keeps its own values #
+metrics = dict()
+metrics_lock = threading.Lock()
+
+
+# Method tells if the /metrics route is exposed, it is opt in as the route is not authenticated #
+def is_metrics_enabled():
+    return str(get_global_variable('metrics_enabled')).lower() == 'true'
+
+
+# Method increments a counter metric by its name #
+def increment_metric(metric_name, value=1):
+    with metrics_lock:
+        metrics[metric_name] = metrics.get(metric_name, 0) + value
+
+
+# Method records an observation (timing, ratio, size) keeping its count, total and max values #
+def observe_metric(metric_name, value):
+    with metrics_lock:
+        metrics[f'{metric_name}_count'] = metrics.get(f'{metric_name}_count', 0) + 1
+        metrics[f'{metric_name}_total'] = metrics.get(f'{metric_name}_total', 0) + value
+        metrics[f'{metric_name}_max'] = max(metrics.get(f'{metric_name}_max', value), value)
+
+
+# Method returns a copy of all metrics adding hit ratios for every hits/misses counter pair #
+def get_metrics_snapshot():
+    with metrics_lock:
+        snapshot = dict(metrics)
+    for metric_name in list(snapshot):
+        if metric_name.endswith('_hits'):
+            metric_prefix = metric_name[:-len('_hits')]
+            lookups = snapshot[metric_name] + snapshot.get(f'{metric_prefix}_misses', 0)
+            snapshot[f'{metric_prefix}_hit_ratio'] = round(snapshot[metric_name] / lookups, 4) if lookups else 0
+    return snapshot
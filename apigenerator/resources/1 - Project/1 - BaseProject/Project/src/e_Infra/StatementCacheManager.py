@@ -0,0 +1,39 @@
+# System Imports #
+import threading
+from collections import OrderedDict
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Global statement templates keyed by request shape (least recently used ones are evicted first) #
+statement_cache = OrderedDict()
+statement_cache_lock = threading.Lock()
+
+
+def get_statement_cache_size():
+    statement_cache_size = get_global_variable('statement_cache_size')
+    return int(statement_cache_size) if statement_cache_size not in (None, '') else 512
+
+
+# Method retrieves a statement template by its shape, building and caching it when not found #
+def get_cached_statement(shape, build_statement):
+    with statement_cache_lock:
+        statement = statement_cache.get(shape)
+        if statement is not None:
+            statement_cache.move_to_end(shape)
+
+    if statement is not None:
+        increment_metric('statement_cache_hits')
+        return statement
+
+    increment_metric('statement_cache_misses')
+    statement = build_statement()
+
+    with statement_cache_lock:
+        statement_cache[shape] = statement
+        while len(statement_cache) > get_statement_cache_size():
+            statement_cache.popitem(last=False)
+
+    return statement
@@ -0,0 +1,174 @@
+# System Imports #
+import json
+import threading
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# SqlAlchemy Imports #
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+from src.e_Infra.c_Resolvers.TransactionRetryResolver import get_database_error_code
+
+# Builder Imports #
+from src.e_Infra.b_Builders.ProxyResponseBuilder import print_logs
+
+
+# Database error codes of statements cancelled by a timeout, by dialect #
+statement_timeout_error_codes = {
+    # ER_QUERY_TIMEOUT (MySQL) and ER_STATEMENT_TIMEOUT (MariaDB) #
+    'mysql': {3024, 1969},
+    # query_canceled SQLSTATE #
+    'postgresql': {'57014'},
+    # Lock request time out period exceeded and query cancelled by the watchdog attention #
+    'mssql': {1222, 3617},
+}
+
+
+def get_timeout_global_variable(variable_name):
+    variable_value = get_global_variable(variable_name)
+    return int(variable_value) if variable_value not in (None, '') else 0
+
+
+# Method checks if any statement timeout is configured, when none is, connections are left untouched #
+def is_statement_timeout_enabled():
+    return any(
+        get_timeout_global_variable(f'statement_timeout_{route_class}_ms') > 0
+        for route_class in ('read', 'write', 'sql')
+    ) or get_timeout_global_variable('statement_timeout_max_ms') > 0
+
+
+# Method retrieves the statement timeout in milliseconds of a route class, the timeout header can override it up to #
+# statement_timeout_max_ms. Zero means no timeout #
+def get_statement_timeout(route_class, header_timeout=None):
+    timeout_ms = get_timeout_global_variable(f'statement_timeout_{route_class}_ms')
+    if header_timeout is not None:
+        timeout_ms = int(header_timeout)
+        if timeout_ms < 1:
+            raise ValueError('timeout header must be greater than 0')
+        max_timeout_ms = get_timeout_global_variable('statement_timeout_max_ms')
+        if max_timeout_ms > 0:
+            timeout_ms = min(timeout_ms, max_timeout_ms)
+    return timeout_ms
+
+
+# Method retrieves the statements setting a timeout on the transaction being begun, along with the ones resetting it #
+# when the connection is checked in, by dialect. PostgreSQL timeouts are set with SET LOCAL and end with their #
+# transaction, the other dialects only have session timeouts #
+def get_statement_timeout_statements(dialect, timeout_ms):
+    if dialect.name == 'postgresql':
+        return [f'SET LOCAL statement_timeout = {int(timeout_ms)}'], list()
+    if dialect.name == 'mysql':
+        if getattr(dialect, 'is_mariadb', False):
+            return [f'SET SESSION max_statement_time = {timeout_ms / 1000}'], \
+                ['SET SESSION max_statement_time = DEFAULT']
+        return [f'SET SESSION max_execution_time = {int(timeout_ms)}'], ['SET SESSION max_execution_time = DEFAULT']
+    if dialect.name == 'mssql':
+        return [f'SET LOCK_TIMEOUT {int(timeout_ms) if timeout_ms > 0 else -1}'], ['SET LOCK_TIMEOUT -1']
+    return list(), list()
+
+
+# Method sets the request statement timeout on every transaction begun while handling it, so each pooled #
+# connection used by the request carries the request timeout #
+@event.listens_for(Engine, 'begin')
+def apply_request_statement_timeout(connection):
+    if not has_request_context() or g.get('statement_timeout_ms') is None:
+        return
+    timeout_ms = g.statement_timeout_ms
+    statements, reset_statements = get_statement_timeout_statements(connection.dialect, timeout_ms)
+    if statements:
+        # Using the driver cursor so no SqlAlchemy events are fired while the transaction begins #
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        if reset_statements:
+            connection.info['statement_timeout_reset_statements'] = reset_statements
+
+    # SQL Server has no server side statement timeout, the statement is cancelled by a watchdog instead. The watchdog #
+    # is stopped when the transaction ends, before the connection is handed to another request #
+    if connection.dialect.name == 'mssql' and timeout_ms > 0:
+        stop_statement_timeout_watchdog(connection.info)
+        watchdog = threading.Timer(timeout_ms / 1000, cancel_connection_statement, (connection,))
+        watchdog.daemon = True
+        connection.info['statement_timeout_watchdog'] = watchdog
+        watchdog.start()
+
+
+# Method stops the statement watchdog of a connection, if any #
+def stop_statement_timeout_watchdog(connection_info):
+    watchdog = connection_info.pop('statement_timeout_watchdog', None)
+    if watchdog is not None:
+        watchdog.cancel()
+
+
+# Method stops the statement watchdog of a connection once its transaction ends #
+@event.listens_for(Engine, 'commit')
+@event.listens_for(Engine, 'rollback')
+def stop_transaction_statement_timeout_watchdog(connection):
+    try:
+        connection_info = connection.info
+    except Exception as e:
+        del e
+        return
+    stop_statement_timeout_watchdog(connection_info)
+
+
+# Method resets the session timeout set on a connection when it is checked in, so the next request using it does not #
+# inherit it. Connections failing to reset are discarded from the pool #
+@event.listens_for(Pool, 'checkin')
+def reset_connection_statement_timeout(dbapi_connection, connection_record):
+    stop_statement_timeout_watchdog(connection_record.info)
+    reset_statements = connection_record.info.pop('statement_timeout_reset_statements', None)
+    if not reset_statements or dbapi_connection is None:
+        return
+    try:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in reset_statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        dbapi_connection.rollback()
+    except Exception as e:
+        connection_record.invalidate(e)
+
+
+# Method cancels the statement running on a connection, releasing it as soon as possible #
+def cancel_connection_statement(connection):
+    try:
+        dbapi_connection = connection.connection.dbapi_connection
+        if connection.dialect.name == 'postgresql':
+            # Both psycopg2 and psycopg 3 connections send a cancel request to the server #
+            dbapi_connection.cancel()
+        elif connection.dialect.name == 'mssql':
+            getattr(dbapi_connection, '_conn', dbapi_connection).cancel()
+        elif connection.dialect.name == 'mysql':
+            # MySQL statements can only be killed from another connection #
+            kill_connection = connection.engine.raw_connection()
+            try:
+                kill_cursor = kill_connection.cursor()
+                kill_cursor.execute(f'KILL QUERY {int(dbapi_connection.thread_id())}')
+                kill_cursor.close()
+            finally:
+                kill_connection.close()
+        else:
+            return
+        increment_metric('statements_cancelled')
+    except Exception as e:
+        print_logs(json.dumps({"body": f'Failed to cancel statement: {e}'}))
+
+
+# Method checks if an exception was raised by a statement cancelled by its timeout on the main database #
+def is_statement_timeout_error(exception):
+    dialect_name = {'pgsql': 'postgresql', 'mariadb': 'mysql'}.get(
+        get_global_variable('main_db_conn'), get_global_variable('main_db_conn')
+    )
+    return get_database_error_code(exception) in statement_timeout_error_codes.get(dialect_name, set())
@@ -0,0 +1,119 @@
+# System Imports #
+import threading
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+from src.e_Infra.EntityTagManager import bump_table_version
+from src.e_Infra.ChangeFeedManager import publish_change_event
+
+
+# Global open insert batches keyed by table name, the request that opens a batch is the one that flushes it #
+pending_insert_batches = dict()
+pending_insert_batches_lock = threading.Lock()
+
+
+# Seconds a queued insert waits for its batch flush, past the coalescing window, when the request has no statement #
+# timeout bounding the flush #
+write_coalescing_flush_timeout = 30
+
+
+# Inserts of a transactional batch are never coalesced, they would be committed by the session of another request #
+def is_write_coalescing_enabled():
+    if has_request_context() and g.get('batch_transaction') is not None:
+        return False
+    return str(get_global_variable('write_coalescing_enabled')).lower() == 'true'
+
+
+def get_write_coalescing_window():
+    write_coalescing_window_ms = get_global_variable('write_coalescing_window_ms')
+    return (int(write_coalescing_window_ms) if write_coalescing_window_ms not in (None, '') else 5) / 1000
+
+
+def get_write_coalescing_max_batch():
+    write_coalescing_max_batch = get_global_variable('write_coalescing_max_batch')
+    return int(write_coalescing_max_batch) if write_coalescing_max_batch not in (None, '') else 500
+
+
+# Method retrieves the seconds a queued insert waits for the batch leader to flush it, the coalescing window followed #
+# by the request statement timeout #
+def get_write_coalescing_wait_timeout():
+    statement_timeout_ms = g.get('statement_timeout_ms') if has_request_context() else None
+    flush_timeout = statement_timeout_ms / 1000 if statement_timeout_ms else write_coalescing_flush_timeout
+    return get_write_coalescing_window() + flush_timeout
+
+
+# Method queues an insert with the concurrent ones of the same table, raising its individual error if any #
+def insert_coalesced_object(transact_object, session):
+    pending_insert = {'transact_object': transact_object, 'done': threading.Event(), 'error': None}
+    table_name = transact_object.__table__.name
+
+    with pending_insert_batches_lock:
+        batch = pending_insert_batches.get(table_name)
+        is_batch_leader = batch is None
+        if is_batch_leader:
+            batch = {'inserts': list(), 'full': threading.Event(), 'flushing': False}
+            pending_insert_batches[table_name] = batch
+        batch['inserts'].append(pending_insert)
+        # Closing batch when it reaches its maximum size, next inserts will open a new one #
+        if len(batch['inserts']) >= get_write_coalescing_max_batch():
+            pending_insert_batches.pop(table_name, None)
+            batch['full'].set()
+
+    if is_batch_leader:
+        # Waiting for concurrent inserts until the window ends or the batch is full #
+        batch['full'].wait(get_write_coalescing_window())
+        with pending_insert_batches_lock:
+            if pending_insert_batches.get(table_name) is batch:
+                pending_insert_batches.pop(table_name)
+            # From now on the inserts of the batch are flushed and can no longer be abandoned #
+            batch['flushing'] = True
+            pending_insert_list = list(batch['inserts'])
+        flush_pending_inserts(pending_insert_list, session)
+    elif not pending_insert['done'].wait(get_write_coalescing_wait_timeout()):
+        # The leader never started the flush, the insert is taken out of the batch so it is never written after its #
+        # error is answered, and the batch is closed so the next inserts open a new one #
+        with pending_insert_batches_lock:
+            is_abandoned = not batch['flushing']
+            if is_abandoned:
+                batch['inserts'].remove(pending_insert)
+                if pending_insert_batches.get(table_name) is batch:
+                    pending_insert_batches.pop(table_name)
+        if is_abandoned:
+            increment_metric('write_coalescer_timeouts')
+            raise Exception('Coalesced insert was not flushed by its batch in time')
+        # The flush holding the insert is running, its outcome is awaited so the response tells what was written #
+        pending_insert['done'].wait()
+
+    if pending_insert['error'] is not None:
+        raise pending_insert['error']
+
+
+# Method inserts a batch in a single transaction, retrying one by one on failure so each insert gets its own error #
+def flush_pending_inserts(pending_insert_list, session):
+    try:
+        session.add_all([pending_insert['transact_object'] for pending_insert in pending_insert_list])
+        session.commit()
+        increment_metric('write_coalescer_flushes')
+        observe_metric('write_coalescer_batch_size', len(pending_insert_list))
+    except Exception:
+        session.rollback()
+        increment_metric('write_coalescer_fallbacks')
+        for pending_insert in pending_insert_list:
+            try:
+                session.add(pending_insert['transact_object'])
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                pending_insert['error'] = e
+    finally:
+        bump_table_version(pending_insert_list[0]['transact_object'].__table__.name)
+        publish_change_event(pending_insert_list[0]['transact_object'].__table__.name, 'insert', lambda: [
+            type(pending_insert['transact_object']).schema.dump([pending_insert['transact_object']])[0]
+            for pending_insert in pending_insert_list if pending_insert['error'] is None
+        ])
+        for pending_insert in pending_insert_list:
+            pending_insert['done'].set()
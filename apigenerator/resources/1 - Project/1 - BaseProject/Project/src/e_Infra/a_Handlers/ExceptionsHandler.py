@@ -5,6 +5,7 @@ import traceback
 from src.e_Infra.b_Builders.ProxyResponseBuilder import *
 from src.e_Infra.GlobalVariablesManager import *
 from src.e_Infra.a_Handlers.SystemMessagesHandler import *
+from src.e_Infra.StatementTimeoutManager import is_statement_timeout_error
 
 
 # Main method #
@@ -80,6 +81,10 @@ def handle_custom_exception(exception):
                 elif exception.response['Error']['Code'] == 'HTTPVersionNotSupported':
                     status_code = 505
 
+    # Validating statements cancelled by their timeout #
+    if is_statement_timeout_error(exception):
+        status_code = 504
+
     # Creating response body #
     body = get_system_empty_dict()
     body['ErrorMessage'] = str(exception)
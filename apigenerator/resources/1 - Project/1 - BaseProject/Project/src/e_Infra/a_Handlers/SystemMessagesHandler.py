@@ -23,7 +23,15 @@ def get_system_message(message_key):
         'id_not_found': 'Parameter id not found.',
         'foreign_key_mandatory': 'Foreign key is mandatory.',
         'cannot_update_with_id_only': 'Cannot update with id only.',
-        'invalid_connection_parameters': "Invalid database connection parameters"
+        'invalid_connection_parameters': "Invalid database connection parameters",
+        'server_busy': 'Server is busy, please retry later.',
+        'rate_limit_exceeded': 'Rate limit exceeded, please retry later.',
+        'statement_timeout': 'Statement timeout exceeded, query cancelled.',
+        'change_feed_busy': 'Change feed subscribers limit reached, please retry later.',
+        'batch_operation_not_run': 'Operation not run, a previous operation of the transaction failed.',
+        'idempotency_key_mismatch': 'Idempotency-Key already used by a different request.',
+        'idempotency_key_in_flight': 'A request with this Idempotency-Key is still in progress, please retry later.',
+        'route_not_found': 'Route not found.'
     }
 
     return system_messages.get(message_key, 'Unknown message')
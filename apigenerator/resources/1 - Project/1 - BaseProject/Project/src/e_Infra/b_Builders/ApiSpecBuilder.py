@@ -1,3 +1,25 @@
+# System Imports #
+import os
+import threading
+
+
+# Rendered documentation pages by route, rebuilt only when the swagger file changes #
+api_spec_pages = dict()
+api_spec_pages_lock = threading.Lock()
+
+
+# Method retrieves a documentation page from memory, building it again when the swagger file was modified #
+def get_api_spec_page(page_name, page_builder, spec_path="config/swagger.yaml"):
+    spec_modified_at = os.path.getmtime(spec_path)
+    with api_spec_pages_lock:
+        api_spec_page = api_spec_pages.get(page_name)
+    if api_spec_page is None or api_spec_page[0] != spec_modified_at:
+        api_spec_page = (spec_modified_at, page_builder())
+        with api_spec_pages_lock:
+            api_spec_pages[page_name] = api_spec_page
+    return api_spec_page[1]
+
+
 # Method that contains the Swagger html definition used on the Flask render template #
 def build_swagger_html(api_title, swagger_json):
     return f"""
@@ -1,5 +1,7 @@
 # SqlAlchemy Imports
-from sqlalchemy import inspect, func, Time, extract
+from sqlalchemy import inspect, func, Time, Integer, String, extract, select, update, delete, bindparam, and_, cast, \
+    any_, ARRAY, table, column, or_, tuple_, literal_column, Text, BigInteger, LargeBinary
+from sqlalchemy.orm import aliased
 
 # Resolver Imports #
 from src.e_Infra.c_Resolvers.SqlAlchemyStringFilterResolver import *
@@ -9,32 +11,331 @@ from src.e_Infra.b_Builders.DomainObjectBuilder import build_domain_object_from_
 
 # Variables Imports #
 from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.StatementCacheManager import get_cached_statement
 from src.e_Infra.b_Builders.StringBuilder import *
 import datetime
 import re
-from src.e_Infra.d_Validators.SqlAlchemyDataValidator import validate_all_datetime_types, validate_non_serializable_types
-
+from src.e_Infra.d_Validators.SqlAlchemyDataValidator import validate_all_datetime_types, validate_non_serializable_types, \
+    validate_datetime, validate_date, validate_time
+
+
+# Operator filters are sent as 'attribute[operator]' query params, e.g. price[gte]=10 or name[prefix]=abc #
+filter_operator_pattern = re.compile(r'^(\w+)\[(\w+)\]$')
+
+# Comparison filter operators by name #
+filter_comparison_operators = {
+    'gt': lambda field, value: field > value,
+    'gte': lambda field, value: field >= value,
+    'lt': lambda field, value: field < value,
+    'lte': lambda field, value: field <= value,
+    'ne': lambda field, value: field != value,
+}
+
+# Bind parameters of a SQL Server statement loading a batch of primary keys, below its limit of 2100 to leave room #
+# for the others #
+mssql_max_id_batch_parameters = 2000
+
+# Every filter operator, null takes true or false and nin takes values separated by [or] #
+filter_operators = tuple(filter_comparison_operators) + ('prefix', 'null', 'nin')
+
+
+# Method builds a select statement template (cached by the request shape) and its bind values from standard or #
+# custom definitions. With total_count, every row also carries the count of rows matching the request #
+def build_query_from_api_request(declarative_meta, request_args, header_args=None, limit=False, id_name_list=None,
+                                 id_value_list=None, total_count=False):
+    # Building filter shape and values for query args #
+    filter_shape, bind_values = get_filter_shape_and_values(declarative_meta, request_args)
+    # Building header shape and values for select, order by, group by, offset and limit #
+    header_shape, header_values = get_header_shape_and_values(header_args, limit)
+    bind_values.update(header_values)
+    # Adding primary key values #
+    id_name_list = id_name_list if id_name_list is not None else list()
+    for i in range(len(id_name_list)):
+        bind_values[f'id_{id_name_list[i]}'] = id_value_list[i]
+
+    shape = ('select', declarative_meta, filter_shape, tuple(id_name_list), header_shape, total_count)
+    statement = get_cached_statement(
+        shape, lambda: build_select_statement(declarative_meta, filter_shape, id_name_list, header_shape, total_count)
+    )
+    # Returning statement template and its values #
+    return statement, bind_values
+
+
+# Method builds a statement template (cached by the request shape) counting the rows a select request matches, #
+# groups included, regardless of its order by, offset and limit headers, and its bind values #
+def build_count_query_from_api_request(declarative_meta, request_args, header_args):
+    filter_shape, bind_values = get_filter_shape_and_values(declarative_meta, request_args)
+    (select_shape, _, group_by_shape, _, _), _ = get_header_shape_and_values(header_args, False)
+
+    shape = ('count', declarative_meta, filter_shape, select_shape, group_by_shape)
+    statement = get_cached_statement(
+        shape, lambda: select(func.count()).select_from(build_select_statement(
+            declarative_meta, filter_shape, list(), (select_shape, tuple(), group_by_shape, False, False)
+        ).subquery())
+    )
+    return statement, bind_values
+
+
+# Method builds an aggregate select statement template (cached by the request shape) and its bind values, grouping #
+# the filtered rows by the group by header columns #
+def build_aggregate_query_from_api_request(declarative_meta, request_args, header_args):
+    filter_shape, bind_values = get_filter_shape_and_values(declarative_meta, request_args)
+    aggregate_shape = tuple(header_args.get('HTTP_AGGREGATE') or (('count', '*'),))
+    group_by_shape = tuple(key for key in (header_args.get('HTTP_GROUPBY') or list()) if key != '')
+
+    shape = ('aggregate', declarative_meta, filter_shape, aggregate_shape, group_by_shape)
+    statement = get_cached_statement(
+        shape, lambda: build_aggregate_statement(declarative_meta, filter_shape, aggregate_shape, group_by_shape)
+    )
+    return statement, bind_values
+
+
+def build_aggregate_statement(declarative_meta, filter_shape, aggregate_shape, group_by_shape):
+    group_by_columns = [getattr(declarative_meta, key) for key in group_by_shape]
+    aggregate_columns = list()
+    for function_name, column_name in aggregate_shape:
+        # Only count accepts '*', as validated by the aggregate header validator #
+        aggregate_function = func.count() if column_name == '*' else \
+            getattr(func, function_name)(getattr(declarative_meta, column_name))
+        aggregate_columns.append(aggregate_function.label(get_aggregate_label(function_name, column_name)))
+    # count(*) alone references no column, so the table is given explicitly #
+    statement = select(*group_by_columns, *aggregate_columns).select_from(declarative_meta)
+    statement = statement.where(*build_filter_criteria(declarative_meta, filter_shape))
+    if group_by_columns:
+        statement = statement.group_by(*group_by_columns).order_by(*group_by_columns)
+    return statement
+
+
+# Method retrieves the result attributes of an aggregate request, its group by attributes followed by its aggregates #
+def get_aggregate_columns(header_args):
+    return [key for key in (header_args.get('HTTP_GROUPBY') or list()) if key != ''] + [
+        get_aggregate_label(function_name, column_name)
+        for function_name, column_name in (header_args.get('HTTP_AGGREGATE') or (('count', '*'),))
+    ]
+
+
+# Method retrieves the result attribute of an aggregate, e.g. count for count(*) and sum_amount for sum(amount) #
+def get_aggregate_label(function_name, column_name):
+    return function_name if column_name == '*' else f'{function_name}_{column_name}'
+
+
+# Method builds a delete statement template by full match of the given request_args and its bind values #
+def build_delete_query_from_api_request(declarative_meta, request_args):
+    filter_shape, bind_values = get_filter_shape_and_values(declarative_meta, request_args)
+    shape = ('delete', declarative_meta, filter_shape)
+    statement = get_cached_statement(
+        shape, lambda: delete(declarative_meta).where(
+            *build_filter_criteria(declarative_meta, filter_shape)
+        ).execution_options(synchronize_session=False)
+    )
+    return statement, bind_values
+
+
+# Method builds a delete statement template by primary key and its bind values #
+def build_delete_by_id_query(declarative_meta, id_value_list, id_name_list):
+    shape = ('delete_by_id', declarative_meta, tuple(id_name_list))
+    statement = get_cached_statement(
+        shape, lambda: delete(declarative_meta).where(
+            *build_id_criteria(declarative_meta, id_name_list)
+        ).execution_options(synchronize_session=False)
+    )
+    return statement, {f'id_{id_name_list[i]}': id_value_list[i] for i in range(len(id_name_list))}
+
+
+# Method retrieves the number of primary keys loaded by statement, keeping SQL Server statements below its bind #
+# parameters limit #
+def get_id_batch_chunk_size(id_name_list, chunk_size):
+    if get_main_dialect_name() == 'mssql':
+        return max(1, min(chunk_size, mssql_max_id_batch_parameters // len(id_name_list)))
+    return chunk_size
+
+
+# Method builds a select statement template of a batch of primary keys and its bind values. The primary key #
+# attributes are always selected, so each row can be matched to its requested key #
+def build_select_by_id_batch_query(declarative_meta, id_name_list, id_value_tuples, header_args):
+    select_shape = tuple(key for key in (header_args.get('HTTP_SELECT') or list()) if key != '')
+    if select_shape:
+        select_shape = select_shape + tuple(id_name for id_name in id_name_list if id_name not in select_shape)
+    # SQL Server has no tuple comparison, composite keys are matched one by one #
+    if len(id_name_list) > 1 and get_main_dialect_name() == 'mssql':
+        # Repeating the last key up to the next power of two keeps the same result with few distinct statements #
+        padded_length = min(
+            1 << (len(id_value_tuples) - 1).bit_length(),
+            max(len(id_value_tuples), mssql_max_id_batch_parameters // len(id_name_list))
+        )
+        id_value_tuples = list(id_value_tuples) + [id_value_tuples[-1]] * (padded_length - len(id_value_tuples))
+        shape = ('select_by_id_batch', declarative_meta, tuple(id_name_list), select_shape, len(id_value_tuples))
+        bind_values = {
+            f'id_{i}_{id_name}': id_value for i, id_value_tuple in enumerate(id_value_tuples)
+            for id_name, id_value in zip(id_name_list, id_value_tuple)
+        }
+        statement = get_cached_statement(shape, lambda: select(
+            *get_select_query_args({'HTTP_SELECT': list(select_shape)}, declarative_meta)
+        ).where(or_(*[
+            and_(*[getattr(declarative_meta, id_name) == bindparam(f'id_{i}_{id_name}') for id_name in id_name_list])
+            for i in range(len(id_value_tuples))
+        ])))
+        return statement, bind_values
+
+    shape = ('select_by_id_batch', declarative_meta, tuple(id_name_list), select_shape)
+    if len(id_name_list) > 1:
+        id_field = tuple_(*[getattr(declarative_meta, id_name) for id_name in id_name_list])
+        bind_values = {'id_batch': list(id_value_tuples)}
+    else:
+        id_field = getattr(declarative_meta, id_name_list[0])
+        bind_values = {'id_batch': [id_value_tuple[0] for id_value_tuple in id_value_tuples]}
+    statement = get_cached_statement(shape, lambda: select(
+        *get_select_query_args({'HTTP_SELECT': list(select_shape)}, declarative_meta)
+    ).where(id_field.in_(bindparam('id_batch', expanding=True))))
+    return statement, bind_values
+
+
+# Method builds the select statement template loading the related objects of an expanded relationship for a batch #
+# of keys. 'many' relationships load at most expand_fan_out objects by key, numbered in primary key order #
+def build_expand_query(declarative_meta, key, kind):
+    def build_statement():
+        field = getattr(declarative_meta, key)
+        if kind == 'one':
+            return select(declarative_meta).where(field.in_(bindparam('expand_keys', expanding=True)))
+        order_by_fields = [getattr(declarative_meta, column.key) for column in declarative_meta.__table__.primary_key]
+        row_number = func.row_number().over(
+            partition_by=field, order_by=order_by_fields or [field]
+        ).label('expand_row_number')
+        subquery = select(declarative_meta, row_number).where(
+            field.in_(bindparam('expand_keys', expanding=True))
+        ).subquery()
+        return select(aliased(declarative_meta, subquery)).where(
+            subquery.c.expand_row_number <= bindparam('expand_fan_out', type_=Integer)
+        ).order_by(subquery.c.expand_row_number)
+
+    return get_cached_statement(('expand', declarative_meta, key, kind), build_statement)
+
+
+# Method retrieves the watermark of the changes route. PostgreSQL tables may use 'xmin', the id of the transaction #
+# that last wrote each row, compared as a number as transaction ids have no ordering operators #
+def get_changes_watermark_field(declarative_meta):
+    if declarative_meta.changes_watermark == 'xmin':
+        return cast(cast(literal_column('xmin'), Text), BigInteger)
+    return getattr(declarative_meta, declarative_meta.changes_watermark)
+
+
+# Method builds the select statement template of the objects changed after a changes route position, given by the #
+# kinds of its watermark and primary key values. Objects are ordered by watermark then primary key, so objects sharing #
+# a watermark are paged through without gaps nor repetitions #
+def build_changes_query(declarative_meta, since_shape):
+    def build_statement():
+        watermark_field = get_changes_watermark_field(declarative_meta)
+        position_fields = [watermark_field] + [
+            getattr(declarative_meta, column.key) for column in declarative_meta.__table__.primary_key
+        ]
+        statement = select(declarative_meta, watermark_field.label('changes_watermark'))
+        if since_shape is not None:
+            statement = statement.where(build_changes_position_criterion(position_fields, since_shape))
+        # Rowversions are given on write, so rows of running transactions may commit below the ones already read. #
+        # Rows are only returned under the oldest rowversion still running #
+        if get_main_dialect_name() == 'mssql' and str(watermark_field.type).upper() in ('TIMESTAMP', 'ROWVERSION'):
+            statement = statement.where(watermark_field < func.min_active_rowversion())
+        return statement.order_by(*position_fields).limit(
+            bindparam('changes_limit', type_=Integer, literal_execute=True)
+        )
 
-# Method builds a domain query filter object from standard or custom definitions #
-def build_query_from_api_request(declarative_meta, request_args, session, header_args=None, limit=False):
+    return get_cached_statement(('changes', declarative_meta, since_shape), build_statement)
+
+
+# Method builds the select statement of the last changes route position of a table, the one change feeds start from #
+def build_changes_end_query(declarative_meta):
+    def build_statement():
+        watermark_field = get_changes_watermark_field(declarative_meta)
+        position_fields = [watermark_field] + [
+            getattr(declarative_meta, column.key) for column in declarative_meta.__table__.primary_key
+        ]
+        statement = select(*position_fields)
+        if get_main_dialect_name() == 'mssql' and str(watermark_field.type).upper() in ('TIMESTAMP', 'ROWVERSION'):
+            statement = statement.where(watermark_field < func.min_active_rowversion())
+        return statement.order_by(*[position_field.desc() for position_field in position_fields]).limit(1)
+
+    return get_cached_statement(('changes_end', declarative_meta), build_statement)
+
+
+# Method builds the criterion of the positions after a given one, (a, b) > (x, y) being a > x or a = x and b > y #
+def build_changes_position_criterion(position_fields, since_shape, index=0):
+    since_value = bindparam(f'changes_since_{index}', type_=LargeBinary if since_shape[index] == 'bytes' else None)
+    if index == len(position_fields) - 1:
+        return position_fields[index] > since_value
+    return or_(position_fields[index] > since_value, and_(
+        position_fields[index] == since_value,
+        build_changes_position_criterion(position_fields, since_shape, index + 1)
+    ))
+
+
+# Method builds an update statement template by primary key and its bind values #
+def build_update_by_id_query(declarative_meta, request_data, id_name_list):
+    update_keys = tuple(request_data)
+    shape = ('update_by_id', declarative_meta, tuple(id_name_list), update_keys)
+    statement = get_cached_statement(
+        shape, lambda: update(declarative_meta).where(
+            *build_id_criteria(declarative_meta, id_name_list)
+        ).values(
+            {getattr(declarative_meta, key): bindparam(f'set_{key}', type_=getattr(declarative_meta, key).type)
+             for key in update_keys}
+        ).execution_options(synchronize_session=False)
+    )
+    bind_values = {f'set_{key}': request_data[key] for key in update_keys}
+    for id_name in id_name_list:
+        bind_values[f'id_{id_name}'] = request_data[id_name]
+    return statement, bind_values
+
+
+# Method builds a select statement template from a request shape, every value is left as a bind parameter #
+def build_select_statement(declarative_meta, filter_shape, id_name_list, header_shape, total_count=False):
+    select_shape, order_by_shape, group_by_shape, has_offset, has_limit = header_shape
     # Building select for query args #
-    query_args = get_select_query_args(header_args, declarative_meta)
-    # Initializing query session by declarative_meta param #
-    query = session.query(*query_args)
+    statement = select(*get_select_query_args({'HTTP_SELECT': list(select_shape)}, declarative_meta))
+    # Window count is computed before offset and limit, so the same round trip brings the page and its total #
+    if total_count:
+        statement = statement.add_columns(func.count().over().label('total_count'))
+    # Applying filters and primary key criteria #
+    statement = statement.where(*build_filter_criteria(declarative_meta, filter_shape))
+    statement = statement.where(*build_id_criteria(declarative_meta, id_name_list))
+    # Apply order by to query #
+    statement = query_order_by(statement, {'HTTP_ORDERBY': list(order_by_shape) or None}, declarative_meta)
+    # Apply group by to query #
+    statement = query_group_by(statement, {'HTTP_GROUPBY': list(group_by_shape) or None}, declarative_meta)
+    # Apply pagination to query #
+    if has_offset:
+        statement = statement.offset(bindparam('pagination_offset', type_=Integer, literal_execute=True))
+    # Apply limit to query #
+    if has_limit:
+        statement = statement.limit(bindparam('pagination_limit', type_=Integer, literal_execute=True))
+    return statement
+
+
+# Method retrieves the filter shape and bind values of the given request_args #
+def get_filter_shape_and_values(declarative_meta, request_args):
+    filter_shape = list()
+    bind_values = dict()
 
     # Building class object from given param request_args #
-    class_object = build_domain_object_from_dict(declarative_meta, request_args)
+    class_object = build_domain_object_from_dict(declarative_meta, get_attribute_request_args(request_args))
 
     # Iterate over request_args
     for key, query_param in request_args.items():
 
         # Apply appropriate filter based on query_param
-        if type(query_param) == str and '[to]' in query_param.lower():
+        filter_operator_match = filter_operator_pattern.match(key)
+        if filter_operator_match is not None:
+            # Apply filter by operator, e.g. price[gte]=10 #
+            filter_shape.append(get_operator_filter_shape_and_values(
+                filter_operator_match.group(1), filter_operator_match.group(2), query_param, bind_values
+            ))
+        elif type(query_param) == str and '[to]' in query_param.lower():
             # Apply filter by interval datetime #
-            query = apply_query_filter_datetime(query, query_param, key, declarative_meta)
+            filter_shape.append(get_datetime_filter_shape_and_values(query_param, key, declarative_meta, bind_values))
         elif type(query_param) == str and '[or]' in query_param.lower():
             # Apply filter selecting multiple values #
-            query = apply_query_selecting_multiple_values(query, query_param, key, declarative_meta)
+            filter_shape.append(get_or_filter_shape_and_values(
+                key, re.sub(r'\s+\[or\]\s+', '[or]', query_param).split('[or]'), declarative_meta, bind_values
+            ))
         else:
             # Loop through class_object attributes #
             for attr in class_object.__dict__:
@@ -42,38 +343,150 @@ def build_query_from_api_request(declarative_meta, request_args, session, header
                     value = getattr(class_object, attr)
                     # Check if the value is NULL or null (case-insensitive) #
                     if str(value).lower() in ('null', 'null'):
-                        query = query.filter(getattr(declarative_meta, attr) == None)
+                        filter_shape.append(('null', attr))
                     # Checking if in global list for left-sided like filter #
                     elif str(getattr(declarative_meta, attr)) in get_global_variable('domain_like_left').replace(' ',
                                                                                                                    '').split(
                             ','):
-                        query = resolve_string_filter(
-                            declarative_meta, class_object, attr, query, 'left_like')
+                        filter_shape.append(('left_like', attr))
+                        bind_values[f'filter_{attr}'] = resolve_string_filter_value(value, 'left_like')
                     # Checking if in global list for right-sided like filter #
                     elif str(getattr(declarative_meta, attr)) in get_global_variable('domain_like_right').replace(
                             ' ', '').split(','):
-                        query = resolve_string_filter(
-                            declarative_meta, class_object, attr, query, 'right_like')
+                        filter_shape.append(('right_like', attr))
+                        bind_values[f'filter_{attr}'] = resolve_string_filter_value(value, 'right_like')
                     # Checking if in global list for full like filter #
                     elif str(getattr(declarative_meta, attr)) in get_global_variable('domain_like_full').replace(
                             ' ', '').split(','):
-                        query = resolve_string_filter(
-                            declarative_meta, class_object, attr, query, 'full_like')
+                        filter_shape.append(('full_like', attr))
+                        bind_values[f'filter_{attr}'] = resolve_string_filter_value(value, 'full_like')
                     else:
-                        query = resolve_string_filter(declarative_meta, class_object, attr, query, 'regular')
+                        filter_shape.append(('regular', attr))
+                        bind_values[f'filter_{attr}'] = resolve_string_filter_value(value, 'regular')
+
+    return tuple(filter_shape), bind_values
+
+
+# Method builds the where criteria of a filter shape with bind parameters in place of values #
+def build_filter_criteria(declarative_meta, filter_shape):
+    criteria = list()
+    for filter_definition in filter_shape:
+        filter_type, key = filter_definition[0], filter_definition[1]
+        field = getattr(declarative_meta, key)
+        if filter_type == 'to':
+            criteria.append(build_datetime_filter_criterion(field, filter_definition))
+        elif filter_type == 'or':
+            criteria.append(build_or_filter_criterion(field, filter_definition))
+        elif filter_type == 'null':
+            criteria.append(field == None)
+        elif filter_type == 'operator':
+            criteria.append(build_operator_filter_criterion(field, filter_definition))
+        else:
+            criteria.append(resolve_string_filter_criterion(field, bindparam(f'filter_{key}'), filter_type))
+    return criteria
+
+
+# Method retrieves the shape of an operator filter, adding its value to bind_values. Null filters have no value, #
+# their shape tells IS NULL from IS NOT NULL #
+def get_operator_filter_shape_and_values(key, operator, value, bind_values):
+    if operator == 'null':
+        return 'operator', key, operator, value
+    bind_values[f'filter_{key}_{operator}'] = value
+    return 'operator', key, operator, None
+
+
+# Method builds the where criterion of an operator filter shape #
+def build_operator_filter_criterion(field, filter_definition):
+    _, key, operator, is_null = filter_definition
+    if operator == 'null':
+        return field == None if is_null else field != None
+    if operator == 'prefix':
+        return resolve_string_filter_criterion(field, bindparam(f'filter_{key}_{operator}'), 'prefix')
+    if operator == 'nin':
+        return field.not_in(bindparam(f'filter_{key}_{operator}', expanding=True))
+    return filter_comparison_operators[operator](field, bindparam(f'filter_{key}_{operator}'))
+
+
+# Method retrieves the main database dialect name as named by SqlAlchemy #
+def get_main_dialect_name():
+    return {'pgsql': 'postgresql', 'mariadb': 'mysql'}.get(
+        get_global_variable('main_db_conn'), get_global_variable('main_db_conn')
+    )
+
+
+def get_or_filter_threshold(variable_name, default_value):
+    threshold = get_global_variable(variable_name)
+    return int(threshold) if threshold not in (None, '') else default_value
+
+
+# Method retrieves the shape of an [or] filter, adding its values to bind_values. Small lists are bound one value per #
+# parameter, medium lists as a single array parameter on PostgreSQL or padded to the next power of two elsewhere, so #
+# few distinct statements are sent, and large lists are loaded into a temporary table joined by the statement #
+def get_or_filter_shape_and_values(key, values, declarative_meta, bind_values):
+    if len(values) > get_or_filter_threshold('or_filter_temp_table_threshold', 1000):
+        bind_values.setdefault('filter_temp_tables', dict())[get_or_filter_table_name(declarative_meta.__table__.name, key)] = (
+            getattr(declarative_meta, key).type, values
+        )
+        return 'or', key, 'temp_table'
+    if len(values) > get_or_filter_threshold('or_filter_array_threshold', 32):
+        if get_main_dialect_name() == 'postgresql':
+            bind_values[f'filter_{key}'] = values
+            return 'or', key, 'array'
+        # Repeating the last value keeps the same result #
+        bind_values[f'filter_{key}'] = values + [values[-1]] * ((1 << (len(values) - 1).bit_length()) - len(values))
+        return 'or', key, 'inline'
+    bind_values[f'filter_{key}'] = values
+    return 'or', key, 'inline'
+
+
+# Method retrieves the temporary table name of an [or] filter, holding the table name so columns of different tables #
+# sharing a name, and maybe not a type, never share a temporary table on the session #
+def get_or_filter_table_name(table_name, key):
+    return f"{'#' if get_main_dialect_name() == 'mssql' else ''}or_filter_{table_name}_{key}"
+
+
+# Method builds the where criterion of an [or] filter shape #
+def build_or_filter_criterion(field, filter_definition):
+    _, key, strategy = filter_definition
+    if strategy == 'array':
+        # Values are bound as text and cast to the column type by the database #
+        return field == any_(cast(bindparam(f'filter_{key}', type_=ARRAY(String)), ARRAY(field.type)))
+    if strategy == 'temp_table':
+        return field.in_(select(column('value')).select_from(
+            table(get_or_filter_table_name(field.class_.__table__.name, key))
+        ))
+    return field.in_(bindparam(f'filter_{key}', expanding=True))
+
+
+def build_id_criteria(declarative_meta, id_name_list):
+    return [getattr(declarative_meta, id_name) == bindparam(f'id_{id_name}') for id_name in id_name_list]
+
+
+# Method retrieves the header shape and bind values of select, order by, group by, offset and limit headers #
+def get_header_shape_and_values(header_args, limit):
+    header_args = dict() if header_args is None else header_args
+    header_values = dict()
 
-    # Apply order by to query #
-    query = query_order_by(query, header_args, declarative_meta)
-    # Apply group by to query #
-    query = query_group_by(query, header_args, declarative_meta)
-    # Apply pagination to query #
-    query = apply_query_offset(query, header_args)
-    # Apply limit to query #
-    query = apply_query_limit(query, header_args, limit)
-    # Validate column type non serialiable #
-    query = validate_non_serializable_types(query, declarative_meta)
-    # Returning filtered query #
-    return query
+    select_shape = tuple(key for key in (header_args.get('HTTP_SELECT') or list()) if key != '')
+
+    order_by_shape = tuple()
+    if header_args.get('HTTP_ORDERBY') is not None and header_args.get('HTTP_ORDERBY')[0] != '':
+        order_by_shape = tuple(header_args['HTTP_ORDERBY'][:2])
+
+    group_by_shape = tuple()
+    if header_args.get('HTTP_GROUPBY') is not None and header_args.get('HTTP_GROUPBY')[0] != '':
+        group_by_shape = tuple(header_args['HTTP_GROUPBY'])
+
+    offset_value = get_query_offset_value(header_args)
+    if offset_value is not None:
+        header_values['pagination_offset'] = offset_value
+
+    limit_value = get_query_limit_value(header_args, limit)
+    if limit_value is not None:
+        header_values['pagination_limit'] = limit_value
+
+    return (select_shape, order_by_shape, group_by_shape, offset_value is not None,
+            limit_value is not None), header_values
 
 
 def query_order_by(query, header_args, declarative_meta):
@@ -103,81 +516,124 @@ def query_group_by(query, header_args, declarative_meta):
 
     return query
 
-def apply_query_limit(query, header_args, limit):
+def get_query_limit_value(header_args, limit):
     if limit:
         header_args = dict() if header_args is None else header_args
         limit_value = header_args.get('HTTP_LIMIT')
         limit_value = limit_value if limit_value is not None else get_global_variable(
             'query_limit')
         if limit_value == '*':
-            return query
+            return None
         else:
-            query = query.limit(int(limit_value))
-    return query
+            return int(limit_value)
+    return None
 
 
-def apply_query_filter_datetime(query, query_param, key, declarative_meta):
-    column_attributes = [getattr(declarative_meta, col.name)
-                         for col in declarative_meta.__table__.columns]
+# Method retrieves the datetime filter shape of a [to] query param, adding its interval to bind_values #
+def get_datetime_filter_shape_and_values(query_param, key, declarative_meta, bind_values):
     if query_param.count("[to]") == 1:
         start_and_end_dates = re.sub(
             r'\s+\[to\]\s+', '[to]', query_param).split('[to]')
-        for field in column_attributes:
-            if field.name == key:
-                start_datetime, end_datetime = start_and_end_dates
-                if field.type.python_type in (
-                    datetime.date, datetime.datetime, datetime.time, datetime.datetime.timestamp, datetime.date.year
-                ):
-                    date_type = validate_all_datetime_types(field,
-                                                            start_and_end_dates)
-                    if date_type == 'time':
-                        query = query.filter(func.cast(field, Time).between(
-                            start_datetime, end_datetime))
-                    elif date_type == 'year':
-                        query = query.filter(func.year(field).between(
-                            int(start_datetime), int(end_datetime)))
-                    elif date_type == 'year-month':
-                        if '-' in start_datetime and '-' in end_datetime:
-                            start_year_month = start_datetime.split('-')
-                            end_year_month = end_datetime.split('-')
-                            if len(start_year_month[0]) == 4 and len(end_year_month[0]) == 4:
-                                query = query.filter(func.date_format(
-                                    field, '%Y-%m').between(start_datetime, end_datetime))
-                            else:
-                                query = query.filter(func.date_format(
-                                    field, '%m-%Y').between(start_datetime, end_datetime))
-                        else:
-                            start_year_month = start_datetime.split('/')
-                            end_year_month = end_datetime.split('/')
-                            if len(start_year_month[0]) == 4 and len(end_year_month[0]) == 4:
-                                query = query.filter(func.date_format(
-                                    field, '%Y/%m').between(start_datetime, end_datetime))
-                            else:
-                                query = query.filter(func.date_format(
-                                    field, '%m/%Y').between(start_datetime, end_datetime))
-                    else:
-                        query = query.filter(
-                            field.between(str(start_datetime), str(end_datetime)))
-                        return query
-                else:
-                    date_type = validate_all_datetime_types(field,
-                                                            start_and_end_dates)
-                    if date_type == 'year':
-                        query = query.filter(
-                            field >= str(start_datetime), field <= str(end_datetime))
-                        return query
-                    else:
-                        raise Exception(
-                            f"[to] is not supported on given query param"
-                        )
+        field = getattr(declarative_meta, key)
+        start_datetime, end_datetime = start_and_end_dates
+        if field.type.python_type in (
+            datetime.date, datetime.datetime, datetime.time, datetime.datetime.timestamp, datetime.date.year
+        ):
+            date_type = validate_all_datetime_types(field,
+                                                    start_and_end_dates)
+            if date_type == 'time':
+                bind_values[f'filter_{key}_start'] = parse_time_filter_bound(field, start_datetime)
+                bind_values[f'filter_{key}_end'] = parse_time_filter_bound(field, end_datetime)
+                return 'to', key, 'time', None
+            elif date_type == 'year':
+                # Years are compared as a half-open range on the raw column, so its indexes can be used #
+                start_bound = datetime.date(int(start_datetime), 1, 1)
+                end_bound = datetime.date(int(end_datetime) + 1, 1, 1)
+                add_date_range_bind_values(field, key, start_bound, end_bound, bind_values)
+                return 'to', key, 'range', None
+            elif date_type == 'year-month':
+                # Months are compared as a half-open range on the raw column, so its indexes can be used #
+                start_bound = parse_year_month(start_datetime)
+                end_bound = add_one_month(parse_year_month(end_datetime))
+                add_date_range_bind_values(field, key, start_bound, end_bound, bind_values)
+                return 'to', key, 'range', None
+            else:
+                bind_values[f'filter_{key}_start'] = parse_datetime_filter_bound(field, start_datetime)
+                bind_values[f'filter_{key}_end'] = parse_datetime_filter_bound(field, end_datetime)
+                return 'to', key, 'between', None
+        else:
+            date_type = validate_all_datetime_types(field,
+                                                    start_and_end_dates)
+            if date_type == 'year':
+                bind_values[f'filter_{key}_start'] = int(start_datetime)
+                bind_values[f'filter_{key}_end'] = int(end_datetime)
+                return 'to', key, 'between', None
+            else:
+                raise Exception(
+                    f"[to] is not supported on given query param"
+                )
     else:
         raise Exception(
             f"datetime filter invalid, can only contain one [to]"
         )
-    return query
 
 
-def apply_query_offset(query, header_args):
+# Method parses a [to] bound by the datetime masks, or by the date masks when it has no time of day, into a value of #
+# the column type #
+def parse_datetime_filter_bound(field, value):
+    bound = {field.name: value}
+    try:
+        validate_datetime(field, bound)
+    except Exception:
+        validate_date(field, bound)
+    return bound[field.name].date() if field.type.python_type is datetime.date else bound[field.name]
+
+
+# Method parses a [to] time of day bound by the time masks #
+def parse_time_filter_bound(field, value):
+    bound = {field.name: value}
+    validate_time(field, bound)
+    return bound[field.name].time()
+
+
+# Method parses a year-month filter value ('2023-05', '05-2023', '2023/05' or '05/2023') into its first day #
+def parse_year_month(value):
+    separator = '-' if '-' in value else '/'
+    date_format = f'%Y{separator}%m' if len(value.split(separator)[0]) == 4 else f'%m{separator}%Y'
+    return datetime.datetime.strptime(value, date_format).date()
+
+
+def add_one_month(date_value):
+    if date_value.month == 12:
+        return datetime.date(date_value.year + 1, 1, 1)
+    return datetime.date(date_value.year, date_value.month + 1, 1)
+
+
+# Method adds the bounds of a half-open date range to bind_values, as datetimes on datetime columns #
+def add_date_range_bind_values(field, key, start_bound, end_bound, bind_values):
+    if field.type.python_type is datetime.datetime:
+        start_bound = datetime.datetime.combine(start_bound, datetime.time.min)
+        end_bound = datetime.datetime.combine(end_bound, datetime.time.min)
+    bind_values[f'filter_{key}_start'], bind_values[f'filter_{key}_end'] = start_bound, end_bound
+
+
+# Method builds the where criterion of a datetime filter shape. Only time of day intervals wrap the column, as they #
+# have no range equivalent on date columns. Bounds are bound with the type they are compared to, as drivers binding #
+# on the server, such as psycopg 3, send typed parameters the database will not compare to other types #
+def build_datetime_filter_criterion(field, filter_definition):
+    _, key, date_type, _ = filter_definition
+    if date_type == 'range':
+        return and_(field >= bindparam(f'filter_{key}_start'), field < bindparam(f'filter_{key}_end'))
+    if date_type == 'time':
+        return cast(field, Time).between(
+            bindparam(f'filter_{key}_start', type_=Time), bindparam(f'filter_{key}_end', type_=Time)
+        )
+    return field.between(
+        bindparam(f'filter_{key}_start', type_=field.type), bindparam(f'filter_{key}_end', type_=field.type)
+    )
+
+
+def get_query_offset_value(header_args):
     header_args = dict() if header_args is None else header_args
     if header_args.get('HTTP_PAGE') is not None:
         if header_args.get('HTTP_LIMIT') is not None:
@@ -185,24 +641,12 @@ def apply_query_offset(query, header_args):
             page = header_args.get('HTTP_PAGE')
             limit = header_args.get('HTTP_LIMIT')
 
-            query = query.offset((page-1)*limit)
+            return (page-1)*limit
         else:
             raise Exception(
                 f"page header can't be defined without limit header"
             )
-    return query
-
-
-def apply_query_selecting_multiple_values(query, query_param, key, declarative_meta):
-    column_attributes = [getattr(declarative_meta, col.name)
-                         for col in declarative_meta.__table__.columns]
-
-    query_param = re.sub(
-            r'\s+\[or\]\s+', '[or]', query_param).split('[or]')
-    for field in column_attributes:
-        if field.name == key:
-            query = query.where(field.in_(query_param))
-    return query
+    return None
 
 
 def auto_fill_guid_in_request_body(declarative_meta, dictionary):
@@ -232,12 +676,72 @@ def get_select_query_args(header_args, declarative_meta):
 
 def cast_request_args(request_args, declarative_meta):
     for key, value in request_args.items():
-        if hasattr(declarative_meta, key):
+        filter_operator_match = filter_operator_pattern.match(key)
+        if filter_operator_match is not None:
+            request_args[key] = cast_operator_filter_value(
+                declarative_meta, filter_operator_match.group(1), filter_operator_match.group(2), value
+            )
+        elif hasattr(declarative_meta, key):
             cast = declarative_meta.__annotations__[key]
             value = apply_custom_cast(cast, key, value)
             request_args[key] = cast(value)
 
 
+# Method retrieves the request args filtering by attribute value, leaving operator filters out #
+def get_attribute_request_args(request_args):
+    return {key: value for key, value in request_args.items() if filter_operator_pattern.match(key) is None}
+
+
+# Method casts the value of an operator filter to the type of the filtered column #
+def cast_operator_filter_value(declarative_meta, key, operator, value):
+    if key not in declarative_meta.__annotations__ or not hasattr(declarative_meta, key):
+        raise Exception(
+            f"'{key}' is not an attribute of __init__()"
+        )
+    if operator not in filter_operators:
+        raise Exception(
+            f"'{operator}' is not a filter operator, expected one of {', '.join(filter_operators)}"
+        )
+    if operator == 'null':
+        return apply_custom_cast(bool, f'{key}[{operator}]', value)
+    field = getattr(declarative_meta, key)
+    if operator == 'prefix':
+        if field.type.python_type is not str:
+            raise Exception(
+                f"[prefix] filter is only supported on string attributes"
+            )
+        return resolve_string_filter_value(value, 'prefix')
+    if operator == 'nin':
+        return [cast_filter_value(declarative_meta, field, key, item)
+                for item in re.sub(r'\s+\[or\]\s+', '[or]', value).split('[or]')]
+    return cast_filter_value(declarative_meta, field, key, value)
+
+
+# Method casts a filter value to its column type, parsing dates and times with the valid datetime masks #
+def cast_filter_value(declarative_meta, field, key, value):
+    try:
+        python_type = field.type.python_type
+    except NotImplementedError:
+        python_type = None
+    try:
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            parsed_value = {field.key: value}
+            if python_type is datetime.time:
+                validate_time(field, parsed_value)
+                return parsed_value[field.key].time()
+            try:
+                validate_datetime(field, parsed_value)
+            except Exception:
+                validate_date(field, parsed_value)
+            return parsed_value[field.key] if python_type is datetime.datetime else parsed_value[field.key].date()
+        cast = declarative_meta.__annotations__[key]
+        return cast(apply_custom_cast(cast, key, value))
+    except Exception:
+        raise Exception(
+            f"'{value}' is not a valid value for attribute '{key}'"
+        )
+
+
 def apply_custom_cast(cast, key, value):
     if cast == bool:
         if value.lower() == 'false':
@@ -269,6 +773,22 @@ def cast_headers_args(header_args):
         header_args['HTTP_GROUPBY'] = header_args['HTTP_GROUPBY'].replace(
             ' ', '').split(',')
 
+    if header_args.get('HTTP_AGGREGATE') is not None:
+        header_args['HTTP_AGGREGATE'] = cast_aggregate_header(header_args['HTTP_AGGREGATE'])
+
+    if header_args.get('HTTP_EXPAND') is not None:
+        header_args['HTTP_EXPAND'] = [
+            expand_path.split('.') for expand_path in header_args['HTTP_EXPAND'].replace(' ', '').split(',')
+            if expand_path != ''
+        ]
+
+    if header_args.get('HTTP_TOTALCOUNT') is not None:
+        if header_args['HTTP_TOTALCOUNT'].lower() not in ('true', 'false'):
+            raise Exception(
+                f"'{header_args['HTTP_TOTALCOUNT']}' is not a boolean"
+            )
+        header_args['HTTP_TOTALCOUNT'] = header_args['HTTP_TOTALCOUNT'].lower() == 'true'
+
     if header_args.get('HTTP_LIMIT') is not None:
         if header_args['HTTP_LIMIT'] == '*':
             return
@@ -286,3 +806,16 @@ def cast_headers_args(header_args):
             raise Exception(
                 f"'{header_args['HTTP_PAGE']}' is not an integer"
             )
+
+
+# Method parses an aggregate header such as 'count(*),sum(amount)' into (function, column) pairs #
+def cast_aggregate_header(aggregate_header):
+    aggregate_list = list()
+    for aggregate in aggregate_header.replace(' ', '').split(','):
+        aggregate_match = re.fullmatch(r'(\w+)\((\*|\w+)\)', aggregate)
+        if aggregate_match is None:
+            raise Exception(
+                f"'{aggregate}' is not a valid aggregate, expected function(column)"
+            )
+        aggregate_list.append((aggregate_match.group(1).lower(), aggregate_match.group(2)))
+    return aggregate_list
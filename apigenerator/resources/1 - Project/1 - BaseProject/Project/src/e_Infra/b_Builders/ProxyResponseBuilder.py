@@ -1,4 +1,6 @@
 # System Imports #
+import csv
+import io
 import json
 import re
 
@@ -9,6 +11,38 @@ from src.e_Infra.GlobalVariablesManager import *
 # Flask Imports #
 from flask import Response
 
+# Binary response formats are only negotiated when their optional library is installed #
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# Response formats of GET routes by media type, a JSON array of objects being the default one #
+response_format_media_types = {
+    'application/json': 'objects',
+    'application/x-ndjson': 'ndjson',
+    'text/csv': 'csv',
+    'application/vnd.pythonrest.compact+json': 'compact',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.apache.arrow.stream': 'arrow',
+}
+
+# Content types of the GET routes response formats #
+response_format_content_types = {
+    'objects': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'compact': 'application/vnd.pythonrest.compact+json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
 
 # Method builds a response with json.dumps and adding error list attribute #
 def build_proxy_response_insert_dumps_error_list(status_code, error_message_list):
@@ -50,6 +84,152 @@ def build_proxy_response_insert_dumps(status_code, body):
     )
 
 
+# Method builds a response sending the chunks of the given body generator as they are produced #
+def build_proxy_response_stream(status_code, body_generator, content_type='application/json', headers=None):
+    return Response(
+        response=body_generator,
+        status=status_code,
+        content_type=content_type,
+        headers=headers
+    )
+
+
+# Method retrieves the response format of a GET route from the Accept header, by its media types quality order. #
+# Wildcards, unknown media types and binary formats whose library is not installed fall back to JSON #
+def get_response_format(accept_header):
+    accepted_media_types = list()
+    for index, media_range in enumerate((accept_header or '').split(',')):
+        media_type, *parameters = [part.strip() for part in media_range.split(';')]
+        quality = 1.0
+        for parameter in parameters:
+            if parameter.startswith('q='):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted_media_types.append((-quality, index, media_type.lower()))
+
+    for _, _, media_type in sorted(accepted_media_types):
+        response_format = response_format_media_types.get(media_type)
+        if response_format == 'msgpack' and msgpack is None or response_format == 'arrow' and pyarrow is None:
+            continue
+        if response_format is not None:
+            return response_format
+        if media_type in ('*/*', 'application/*'):
+            return 'objects'
+    return 'objects'
+
+
+# Method builds a response streaming row chunks on the given format. Rows are dumped objects whose attributes are #
+# the given columns #
+def build_proxy_response_rows(status_code, response_format, columns, row_chunks, row_count):
+    response = build_proxy_response_stream(
+        status_code, stream_rows(response_format, columns, row_chunks, row_count),
+        response_format_content_types[response_format]
+    )
+    response.headers['Vary'] = 'Accept'
+    return response
+
+
+# Method serializes row chunks as they are produced. ndjson format is a row object per line, compact format is a #
+# JSON object with columns and rows attributes, msgpack format is the same object packed, its rows array header #
+# needing the row count, and arrow format is an Arrow IPC stream of record batches #
+def stream_rows(response_format, columns, row_chunks, row_count):
+    streamed_row_count = 0
+    try:
+        if response_format == 'compact':
+            yield '{"columns": ' + json.dumps(columns) + ', "rows": ['
+        elif response_format == 'csv':
+            csv_buffer = io.StringIO()
+            csv_writer = csv.writer(csv_buffer)
+            csv_writer.writerow(columns)
+        elif response_format == 'msgpack':
+            # Packing the rows array header up front lets every row be packed as soon as it is dumped #
+            packer = msgpack.Packer(default=str)
+            yield packer.pack_map_header(2) + packer.pack('columns') + packer.pack(columns) + packer.pack('rows') + \
+                packer.pack_array_header(row_count)
+        elif response_format == 'arrow':
+            arrow_buffer = io.BytesIO()
+            arrow_writer = None
+            arrow_schema = None
+            arrow_string_columns = set()
+
+        for rows in row_chunks:
+            if response_format == 'csv':
+                csv_writer.writerows([row.get(column) for column in columns] for row in rows)
+                chunk = csv_buffer.getvalue()
+                csv_buffer.seek(0)
+                csv_buffer.truncate()
+                yield chunk
+            elif response_format == 'msgpack':
+                yield b''.join(packer.pack([row.get(column) for column in columns]) for row in rows)
+            elif response_format == 'arrow':
+                record_batch = pyarrow.RecordBatch.from_pylist([{
+                    column: str(row.get(column)) if column in arrow_string_columns and row.get(column) is not None
+                    else row.get(column) for column in columns
+                } for row in rows], schema=arrow_schema)
+                if arrow_writer is None:
+                    # Columns without values on the first batch have no type to infer, so they are sent as strings #
+                    arrow_string_columns = {
+                        field.name for field in record_batch.schema if pyarrow.types.is_null(field.type)
+                    }
+                    arrow_schema = pyarrow.schema([
+                        field.with_type(pyarrow.string()) if field.name in arrow_string_columns else field
+                        for field in record_batch.schema
+                    ])
+                    record_batch = record_batch.cast(arrow_schema)
+                    arrow_writer = pyarrow.ipc.new_stream(arrow_buffer, arrow_schema)
+                arrow_writer.write_batch(record_batch)
+                chunk = arrow_buffer.getvalue()
+                arrow_buffer.seek(0)
+                arrow_buffer.truncate()
+                yield chunk
+            else:
+                chunk = list()
+                for row in rows:
+                    if response_format == 'compact':
+                        row_json = json.dumps([row.get(column) for column in columns], default=str)
+                    else:
+                        row_json = json.dumps(row, default=str)
+                    if response_format == 'ndjson':
+                        chunk.append(row_json + '\n')
+                    else:
+                        chunk.append(row_json if streamed_row_count == 0 and not chunk else ',' + row_json)
+                yield ''.join(chunk)
+            streamed_row_count += len(rows)
+
+        if response_format == 'compact':
+            yield ']}'
+        elif response_format == 'arrow' and arrow_writer is not None:
+            # Closing the writer writes the end of stream marker #
+            arrow_writer.close()
+            yield arrow_buffer.getvalue()
+    finally:
+        print_logs(json.dumps({"statusCode": 200, "body": f"{streamed_row_count} row(s) streamed as {response_format}"}))
+
+
+# Method builds a response with json.dumps telling the client when to retry the request #
+def build_proxy_response_retry_after(status_code, body, retry_after):
+    response = build_proxy_response_insert_dumps(status_code, body)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+# Method builds the stored response of a request sent with an Idempotency-Key header, replayed to its retries #
+def build_proxy_response_idempotent_replay(status_code, headers, body):
+    print_logs(json.dumps({"statusCode": status_code, "body": None, "idempotentReplay": True}))
+    response = Response(response=body, status=status_code, headers=headers)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+# Method builds an empty 304 Not Modified response carrying the entity tag headers of the client copy #
+def build_proxy_response_not_modified(headers):
+    print_logs(json.dumps({"statusCode": 304, "body": None}))
+    return Response(status=304, headers=headers)
+
+
 def build_dto_error_message(e):
     response = str(e).replace("'<class ", "").replace(">')", "")\
         .replace(">'", "").replace('__init__()', 'JSON body').replace("Parameter validation failed:", "")\
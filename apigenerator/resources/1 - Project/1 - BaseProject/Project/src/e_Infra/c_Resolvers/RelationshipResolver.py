@@ -0,0 +1,46 @@
+# System Imports #
+import threading
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+
+# SqlAlchemy Imports #
+from src.e_Infra.b_Builders.SqlAlchemyBuilder import Base
+
+
+# Global declarative metas keyed by table name, read from the declarative base once every domain is imported #
+declarative_metas_by_table_name = dict()
+declarative_metas_by_table_name_lock = threading.Lock()
+
+
+def get_expand_max_depth():
+    expand_max_depth = get_global_variable('expand_max_depth')
+    return int(expand_max_depth) if expand_max_depth not in (None, '') else 2
+
+
+def get_expand_max_fan_out():
+    expand_max_fan_out = get_global_variable('expand_max_fan_out')
+    return int(expand_max_fan_out) if expand_max_fan_out not in (None, '') else 100
+
+
+# Method retrieves the declarative meta mapped to a table name, None when the table has no generated domain #
+def get_declarative_meta_by_table_name(table_name):
+    with declarative_metas_by_table_name_lock:
+        if table_name not in declarative_metas_by_table_name:
+            for mapper in Base.registry.mappers:
+                declarative_metas_by_table_name[mapper.class_.__tablename__] = mapper.class_
+        return declarative_metas_by_table_name.get(table_name)
+
+
+# Method retrieves a domain relationship generated from the foreign keys metadata as (kind, attribute, related #
+# declarative meta, related attribute). 'one' relationships follow a foreign key of the domain to the object it #
+# references, while 'many' relationships follow the foreign keys referencing the domain to the objects holding them #
+def get_expand_relationship(declarative_meta, relationship_name):
+    relationship = getattr(declarative_meta, 'expand_relationships', dict()).get(relationship_name)
+    if relationship is None:
+        return None
+    kind, key, related_table_name, related_key = relationship
+    related_declarative_meta = get_declarative_meta_by_table_name(related_table_name)
+    if related_declarative_meta is None:
+        return None
+    return kind, key, related_declarative_meta, related_key
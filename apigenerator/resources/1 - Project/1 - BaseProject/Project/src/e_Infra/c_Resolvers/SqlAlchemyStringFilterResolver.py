@@ -1,17 +1,25 @@
-# Method resolves which filter will be applied to a string class attribute by default or custom definitions #
-def resolve_string_filter(declarative_meta, class_object, class_object_attr, query, equals_type_str):
-    # Returning filter for left-sided like strings #
+# Method resolves the bind value of a string filter by default or custom definitions #
+def resolve_string_filter_value(value, equals_type_str):
+    # Returning value for left-sided like strings #
     if equals_type_str == 'left_like':
-        return query.filter(getattr(declarative_meta, class_object_attr)
-                                        .like('%' + getattr(class_object, class_object_attr)))
-    # Returning filter for right-sided like strings #
+        return '%' + value
+    # Returning value for right-sided like strings #
     if equals_type_str == 'right_like':
-        return query.filter(getattr(declarative_meta, class_object_attr)
-                                        .like(getattr(class_object, class_object_attr) + '%'))
-    # Returning filter for both-sided like strings #
+        return value + '%'
+    # Returning value for both-sided like strings #
     if equals_type_str == 'full_like':
-        return query.filter(getattr(declarative_meta, class_object_attr)
-                                        .like('%' + getattr(class_object, class_object_attr) + '%'))
-    # Returning filter for both-sided like strings #
-    if equals_type_str == 'regular':
-        return query.filter(getattr(declarative_meta, class_object_attr) == getattr(class_object, class_object_attr))
\ No newline at end of file
+        return '%' + value + '%'
+    # Returning value for prefix strings, its wildcards matched literally #
+    if equals_type_str == 'prefix':
+        return value.replace('/', '//').replace('%', '/%').replace('_', '/_') + '%'
+    # Returning value for regular strings #
+    return value
+
+
+# Method resolves the criterion of a string filter, comparing the field against the given bind parameter #
+def resolve_string_filter_criterion(field, bind_parameter, equals_type_str):
+    if equals_type_str in ('left_like', 'right_like', 'full_like'):
+        return field.like(bind_parameter)
+    if equals_type_str == 'prefix':
+        return field.like(bind_parameter, escape='/')
+    return field == bind_parameter
@@ -0,0 +1,143 @@
+# System Imports #
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Global query verdicts keyed by query hash (least recently used ones are evicted first) #
+sql_verdict_cache = OrderedDict()
+sql_verdict_cache_lock = threading.Lock()
+
+# Closing characters of quoted identifiers #
+sql_identifier_quotes = {'"': '"', '`': '`', '[': ']'}
+
+
+def get_sql_verdict_cache_size():
+    sql_verdict_cache_size = get_global_variable('sql_verdict_cache_size')
+    return int(sql_verdict_cache_size) if sql_verdict_cache_size not in (None, '') else 256
+
+
+# Method retrieves the dialect of the main database, telling how its comments and quoted strings are read #
+def get_sql_dialect_name():
+    return {'pgsql': 'postgresql', 'mariadb': 'mysql'}.get(
+        get_global_variable('main_db_conn'), get_global_variable('main_db_conn')
+    )
+
+
+# Method finds the end of the block comment starting at a given index. Comments that are not closed or that nest #
+# another one are refused, as PostgreSQL and SQL Server close nested comments where MySQL does not #
+def find_sql_comment_end(query, index):
+    comment_end_index = query.find('*/', index + 2)
+    if comment_end_index == -1:
+        raise Exception('Unterminated comment in query')
+    if query.find('/*', index + 2, comment_end_index) != -1:
+        raise Exception('Nested comments are not allowed in query')
+    return comment_end_index
+
+
+# Method splits a query into its lowercase keywords and identifiers in a single pass, skipping string literals, #
+# quoted identifiers and comments as the given dialect reads them #
+def tokenize_sql_words(query, backslash_escapes=True, dialect_name=None):
+    words = list()
+    length = len(query)
+    index = 0
+    while index < length:
+        char = query[index]
+        if char.isalpha() or char == '_':
+            start = index
+            while index < length and (query[index].isalnum() or query[index] in '_$'):
+                index += 1
+            words.append(query[start:index].lower())
+            continue
+        if char.isdigit():
+            # Numeric literal #
+            while index < length and (query[index].isalnum() or query[index] in '_.'):
+                index += 1
+            continue
+        if char == "'" or (char == '"' and dialect_name == 'mysql'):
+            # String literal, quotes are escaped by doubling them or, on MySQL, by a backslash. MySQL reads double #
+            # quotes as strings too, unless ANSI_QUOTES is set, a reading vetted by the pass without backslash escapes #
+            index += 1
+            while index < length:
+                if backslash_escapes and query[index] == '\\' and index + 1 < length:
+                    index += 2
+                    continue
+                if query[index] == char:
+                    if index + 1 < length and query[index + 1] == char:
+                        index += 2
+                        continue
+                    break
+                index += 1
+        elif char in sql_identifier_quotes:
+            closing_quote = sql_identifier_quotes[char]
+            index += 1
+            while index < length:
+                if query[index] == closing_quote:
+                    if index + 1 < length and query[index + 1] == closing_quote:
+                        index += 2
+                        continue
+                    break
+                index += 1
+        elif (char == '-' and query.startswith('--', index) and (
+                # MySQL only reads -- as a comment when a whitespace follows it, 1--1 being a subtraction #
+                dialect_name != 'mysql' or index + 2 >= length or query[index + 2].isspace()
+        )) or (char == '#' and dialect_name == 'mysql'):
+            newline_index = query.find('\n', index)
+            index = length if newline_index == -1 else newline_index
+        elif char == '/' and query.startswith('/*', index):
+            comment_end_index = find_sql_comment_end(query, index)
+            # MySQL (/*! ... */) and MariaDB (/*M! ... */) executable comments run their content, so it is vetted #
+            if query.startswith(('/*!', '/*M!'), index):
+                words.extend(tokenize_sql_words(
+                    query[index + (3 if query.startswith('/*!', index) else 4):comment_end_index],
+                    backslash_escapes, dialect_name
+                ))
+            index = comment_end_index + 1
+        elif char == '$' and dialect_name == 'postgresql':
+            # PostgreSQL dollar-quoted string ($$...$$ or $tag$...$tag$) #
+            tag_end_index = index + 1
+            while tag_end_index < length and (query[tag_end_index].isalnum() or query[tag_end_index] == '_'):
+                tag_end_index += 1
+            if tag_end_index < length and query[tag_end_index] == '$':
+                tag = query[index:tag_end_index + 1]
+                closing_tag_index = query.find(tag, tag_end_index + 1)
+                index = length if closing_tag_index == -1 else closing_tag_index + len(tag) - 1
+        index += 1
+    return words
+
+
+# Method classifies a query, retrieving all of its words #
+def classify_sql_query(query, dialect_name=None):
+    dialect_name = dialect_name or get_sql_dialect_name()
+    words = tokenize_sql_words(query, True, dialect_name)
+    # Databases that don't treat backslash as escape end string literals earlier, so both readings are vetted #
+    if '\\' in query:
+        words.extend(tokenize_sql_words(query, False, dialect_name))
+    return {'words': frozenset(words)}
+
+
+# Method retrieves a query verdict from cache by its hash, classifying and caching it when not found #
+def get_sql_query_verdict(query):
+    query_hash = hashlib.blake2b(query.encode(), digest_size=16).digest()
+    with sql_verdict_cache_lock:
+        verdict = sql_verdict_cache.get(query_hash)
+        if verdict is not None:
+            sql_verdict_cache.move_to_end(query_hash)
+
+    if verdict is not None:
+        increment_metric('sql_verdict_cache_hits')
+        return verdict
+
+    increment_metric('sql_verdict_cache_misses')
+    verdict = classify_sql_query(query)
+
+    with sql_verdict_cache_lock:
+        sql_verdict_cache[query_hash] = verdict
+        while len(sql_verdict_cache) > get_sql_verdict_cache_size():
+            sql_verdict_cache.popitem(last=False)
+
+    return verdict
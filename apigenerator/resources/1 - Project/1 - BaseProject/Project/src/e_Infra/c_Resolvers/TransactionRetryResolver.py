@@ -0,0 +1,76 @@
+# System Imports #
+import random
+import time
+
+# Flask Imports #
+from flask import g, has_request_context
+
+# Infra Imports #
+from src.e_Infra.GlobalVariablesManager import *
+from src.e_Infra.MetricsManager import *
+
+
+# Database error codes meaning the transaction was chosen as a deadlock victim or failed serialization, by dialect #
+retryable_error_codes = {
+    # ER_LOCK_DEADLOCK and ER_LOCK_WAIT_TIMEOUT, also used by MariaDB #
+    'mysql': {1213, 1205},
+    # deadlock_detected and serialization_failure SQLSTATEs #
+    'postgresql': {'40P01', '40001'},
+    # Transaction was deadlocked on lock resources with another process and has been chosen as the deadlock victim #
+    'mssql': {1205},
+}
+
+
+def get_deadlock_retry_limit():
+    deadlock_retry_limit = get_global_variable('deadlock_retry_limit')
+    return int(deadlock_retry_limit) if deadlock_retry_limit not in (None, '') else 3
+
+
+def get_deadlock_retry_backoff():
+    deadlock_retry_backoff_ms = get_global_variable('deadlock_retry_backoff_ms')
+    return (int(deadlock_retry_backoff_ms) if deadlock_retry_backoff_ms not in (None, '') else 50) / 1000
+
+
+# Method retrieves the database error code of a SqlAlchemy exception from its original driver exception #
+def get_database_error_code(exception):
+    original_exception = getattr(exception, 'orig', None)
+    if original_exception is None:
+        return None
+    # psycopg2 exposes pgcode while psycopg 3 exposes sqlstate #
+    for attribute in ('sqlstate', 'pgcode'):
+        if getattr(original_exception, attribute, None) is not None:
+            return getattr(original_exception, attribute)
+    if original_exception.args and type(original_exception.args[0]) == int:
+        return original_exception.args[0]
+    return None
+
+
+# Method checks if an exception is a deadlock or serialization failure for the given dialect #
+def is_retryable_transaction_error(exception, dialect_name):
+    return get_database_error_code(exception) in retryable_error_codes.get(dialect_name, set())
+
+
+# Method tells if the current request runs inside a transactional batch, whose deadlocks are never retried: MySQL and #
+# SQL Server roll the whole batch transaction back with its victim, not only the savepoint of the operation #
+def is_in_batch_transaction():
+    return has_request_context() and g.get('batch_transaction') is not None
+
+
+# Method runs a transaction function, rolling it back and retrying with jittered backoff when it deadlocks. Inside a #
+# transactional batch the error is raised right away, so the batch fails as one unit #
+def run_with_transaction_retry(session, transaction):
+    attempt = 0
+    while True:
+        try:
+            return transaction()
+        except Exception as e:
+            session.rollback()
+            if is_in_batch_transaction() or not is_retryable_transaction_error(e, session.get_bind().dialect.name):
+                raise e
+            if attempt >= get_deadlock_retry_limit():
+                increment_metric('deadlock_retries_exhausted')
+                raise e
+            attempt += 1
+            increment_metric('deadlock_retries')
+            # Exponential backoff with full jitter so retried transactions do not collide again #
+            time.sleep(random.uniform(0, get_deadlock_retry_backoff() * 2 ** (attempt - 1)))
@@ -4,11 +4,15 @@ from src.e_Infra.b_Builders.DomainObjectBuilder import build_domain_object_from_
 # Infra Imports #
 from src.e_Infra.GlobalVariablesManager import *
 
+# Resolver Imports #
+from src.e_Infra.c_Resolvers.RelationshipResolver import get_expand_relationship, get_expand_max_depth
+
 # SqlAlchemy Imports #
 from sqlalchemy.inspection import inspect
 
 # System Imports #
 from datetime import datetime, timedelta, date
+import decimal
 import re
 
 # Flask Imports #
@@ -279,6 +283,8 @@ def validate_header_args(declarative_meta, header_args):
     validate_select_args(declarative_meta, header_args)
     validate_order_by(declarative_meta, header_args)
     validate_group_by(declarative_meta, header_args)
+    validate_aggregate_args(declarative_meta, header_args)
+    validate_expand_args(declarative_meta, header_args)
 
 
 def validate_select_args(declarative_meta, header_args):
@@ -318,3 +324,65 @@ def validate_group_by(declarative_meta, header_args):
                     raise Exception(
                         f"groupby got an unexpected keyword argument '{header}'"
                     )
+
+
+# Aggregate functions accepted by the aggregate header, sum and avg only being valid on numeric columns #
+aggregate_functions = ('count', 'sum', 'avg', 'min', 'max')
+numeric_aggregate_functions = ('sum', 'avg')
+
+
+def validate_aggregate_args(declarative_meta, header_args):
+    if header_args.get('HTTP_AGGREGATE') is not None:
+        declarative_meta_attr = [str(key) for key in declarative_meta.schema.dump_fields]
+        for function_name, column_name in header_args.get('HTTP_AGGREGATE'):
+            if function_name not in aggregate_functions:
+                raise Exception(
+                    f"aggregate got an unexpected function '{function_name}', "
+                    f"expected one of {', '.join(aggregate_functions)}"
+                )
+            if column_name == '*':
+                if function_name != 'count':
+                    raise Exception(f"aggregate function '{function_name}' can't be applied to '*'")
+                continue
+            if column_name not in declarative_meta_attr:
+                raise Exception(
+                    f"aggregate got an unexpected keyword argument '{column_name}'"
+                )
+            if function_name in numeric_aggregate_functions and not is_numeric_column(
+                    getattr(declarative_meta, column_name)):
+                raise Exception(
+                    f"aggregate function '{function_name}' can only be applied to numeric attributes, "
+                    f"'{column_name}' is not numeric"
+                )
+
+
+# Every expand path must follow the domain relationships within expand_max_depth, each relationship of the first level #
+# needing its attribute on the select header when there is one #
+def validate_expand_args(declarative_meta, header_args):
+    if header_args.get('HTTP_EXPAND') is not None:
+        select_args = [key for key in (header_args.get('HTTP_SELECT') or list()) if key != '']
+        for expand_path in header_args.get('HTTP_EXPAND'):
+            if len(expand_path) > get_expand_max_depth():
+                raise Exception(
+                    f"expand '{'.'.join(expand_path)}' is deeper than the maximum depth of {get_expand_max_depth()}"
+                )
+            path_declarative_meta = declarative_meta
+            for depth, relationship_name in enumerate(expand_path):
+                relationship = get_expand_relationship(path_declarative_meta, relationship_name)
+                if relationship is None:
+                    raise Exception(
+                        f"{path_declarative_meta.__table__.name} expand got an unexpected relationship "
+                        f"'{relationship_name}'"
+                    )
+                if depth == 0 and select_args and relationship[1] not in select_args:
+                    raise Exception(
+                        f"expand '{relationship_name}' requires the '{relationship[1]}' attribute to be selected"
+                    )
+                path_declarative_meta = relationship[2]
+
+
+def is_numeric_column(column):
+    try:
+        return column.type.python_type in (int, float, decimal.Decimal)
+    except NotImplementedError:
+        return False
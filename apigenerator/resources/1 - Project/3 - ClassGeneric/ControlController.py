@@ -18,7 +18,67 @@ def control_route_get():
                                      'HTTP_ORDERBY': request.environ.get('HTTP_ORDERBY'),
                                      'HTTP_GROUPBY': request.environ.get('HTTP_GROUPBY'),
                                      'HTTP_LIMIT': request.environ.get('HTTP_LIMIT'),
-                                     'HTTP_PAGE': request.environ.get('HTTP_PAGE')}
+                                     'HTTP_PAGE': request.environ.get('HTTP_PAGE'),
+                                     'HTTP_TOTALCOUNT': request.environ.get('HTTP_TOTALCOUNT'),
+                                     'HTTP_EXPAND': request.environ.get('HTTP_EXPAND'),
+                                     'HTTP_ACCEPT': request.environ.get('HTTP_ACCEPT'),
+                                     'HTTP_IF_NONE_MATCH': request.environ.get('HTTP_IF_NONE_MATCH'),
+                                     'HTTP_IF_MODIFIED_SINCE': request.environ.get('HTTP_IF_MODIFIED_SINCE')}
+        )
+        return result
+
+
+# /control/_aggregate route #
+@app_handler.route('/control/_aggregate', methods=['GET'])
+def control_route_get_aggregate():
+    # Routing request to /control/_aggregate GET method #
+    if request.method == 'GET':
+        result = get_control_aggregate(
+            request.args.to_dict(), {'HTTP_AGGREGATE': request.environ.get('HTTP_AGGREGATE'),
+                                     'HTTP_GROUPBY': request.environ.get('HTTP_GROUPBY'),
+                                     'HTTP_ACCEPT': request.environ.get('HTTP_ACCEPT')}
+        )
+        return result
+
+
+# /control/_changes route #
+@app_handler.route('/control/_changes', methods=['GET'])
+def control_route_get_changes():
+    # Routing request to /control/_changes GET method #
+    if request.method == 'GET':
+        result = get_control_changes(
+            request.args.to_dict(), {'HTTP_LIMIT': request.environ.get('HTTP_LIMIT')}
+        )
+        return result
+
+
+# /control/_stream route #
+@app_handler.route('/control/_stream', methods=['GET'])
+def control_route_get_stream():
+    # Routing request to /control/_stream GET method #
+    if request.method == 'GET':
+        result = get_control_stream(request.args.to_dict())
+        return result
+
+
+# /control/_import route #
+@app_handler.route('/control/_import', methods=['POST'])
+def control_route_post_import():
+    # Routing request to /control/_import POST method #
+    if request.method == 'POST':
+        result = import_control_set(
+            request.stream, {'CONTENT_TYPE': request.environ.get('CONTENT_TYPE')}
+        )
+        return result
+
+
+# /control/_get route #
+@app_handler.route('/control/_get', methods=['POST'])
+def control_route_post_get_batch():
+    # Routing request to /control/_get POST method #
+    if request.method == 'POST':
+        result = get_control_batch(
+            request.json, {'HTTP_SELECT': request.environ.get('HTTP_SELECT')}
         )
         return result
 
@@ -55,7 +115,11 @@ def control_route_get_by_id(id_args):
     if request.method == 'GET':
         result = get_control_by_id(
             id_list, request.args.to_dict(
-            ), {'HTTP_SELECT': request.environ.get('HTTP_SELECT')}
+            ), {'HTTP_SELECT': request.environ.get('HTTP_SELECT'),
+                'HTTP_EXPAND': request.environ.get('HTTP_EXPAND'),
+                'HTTP_ACCEPT': request.environ.get('HTTP_ACCEPT'),
+                'HTTP_IF_NONE_MATCH': request.environ.get('HTTP_IF_NONE_MATCH'),
+                'HTTP_IF_MODIFIED_SINCE': request.environ.get('HTTP_IF_MODIFIED_SINCE')}
         )
         return result
 
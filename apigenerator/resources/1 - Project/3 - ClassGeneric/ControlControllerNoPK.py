@@ -8,6 +8,17 @@ from src.b_Application.b_Service.a_Domain.ControlService import *
 from src.e_Infra.f_Decorators.JsonLoadsDecorator import *
 
 
+# /control/_import route #
+@app_handler.route('/control/_import', methods=['POST'])
+def control_route_post_import():
+    # Routing request to /control/_import POST method #
+    if request.method == 'POST':
+        result = import_control_set(
+            request.stream, {'CONTENT_TYPE': request.environ.get('CONTENT_TYPE')}
+        )
+        return result
+
+
 # /control route #
 @app_handler.route('/control', methods=['GET'])
 def control_route_get():
@@ -18,11 +29,38 @@ def control_route_get():
                                      'HTTP_LIMIT': request.environ.get('HTTP_LIMIT'),
                                      'HTTP_ORDERBY': request.environ.get('HTTP_ORDERBY'),
                                      'HTTP_GROUPBY': request.environ.get('HTTP_GROUPBY'),
-                                     'HTTP_PAGE': request.environ.get('HTTP_PAGE')}
+                                     'HTTP_PAGE': request.environ.get('HTTP_PAGE'),
+                                     'HTTP_TOTALCOUNT': request.environ.get('HTTP_TOTALCOUNT'),
+                                     'HTTP_EXPAND': request.environ.get('HTTP_EXPAND'),
+                                     'HTTP_ACCEPT': request.environ.get('HTTP_ACCEPT'),
+                                     'HTTP_IF_NONE_MATCH': request.environ.get('HTTP_IF_NONE_MATCH'),
+                                     'HTTP_IF_MODIFIED_SINCE': request.environ.get('HTTP_IF_MODIFIED_SINCE')}
         )
         return result
 
 
+# /control/_aggregate route #
+@app_handler.route('/control/_aggregate', methods=['GET'])
+def control_route_get_aggregate():
+    # Routing request to /control/_aggregate GET method #
+    if request.method == 'GET':
+        result = get_control_aggregate(
+            request.args.to_dict(), {'HTTP_AGGREGATE': request.environ.get('HTTP_AGGREGATE'),
+                                     'HTTP_GROUPBY': request.environ.get('HTTP_GROUPBY'),
+                                     'HTTP_ACCEPT': request.environ.get('HTTP_ACCEPT')}
+        )
+        return result
+
+
+# /control/_stream route #
+@app_handler.route('/control/_stream', methods=['GET'])
+def control_route_get_stream():
+    # Routing request to /control/_stream GET method #
+    if request.method == 'GET':
+        result = get_control_stream(request.args.to_dict())
+        return result
+
+
 # /control route #
 @app_handler.route('/control', methods=['POST'])
 def control_route_post_patch_put():
@@ -25,6 +25,51 @@ def get_control_by_id(id_value_list, request_args, header_args):
     )
 
 
+# Method retrieves Control domain objects by a batch of given ids #
+def get_control_batch(request_data, header_args):
+    return get_by_id_batch(
+        declarative_meta=Control,
+        request_data=request_data,
+        id_name_list=id_name_list,
+        header_args=header_args
+    )
+
+
+# Method retrieves aggregates of Control domain objects by given request_args param #
+def get_control_aggregate(request_args, header_args):
+    return get_aggregate(
+        declarative_meta=Control,
+        request_args=request_args,
+        header_args=header_args
+    )
+
+
+# Method retrieves the Control domain objects written after the given request_args since token #
+def get_control_changes(request_args, header_args):
+    return get_changes(
+        declarative_meta=Control,
+        request_args=request_args,
+        header_args=header_args
+    )
+
+
+# Method streams the insert, update and delete events of Control domain objects #
+def get_control_stream(request_args):
+    return get_change_stream(
+        declarative_meta=Control,
+        request_args=request_args
+    )
+
+
+# Method imports a CSV or NDJSON stream of Control domain objects #
+def import_control_set(stream, header_args):
+    return import_object_set(
+        declarative_meta=Control,
+        stream=stream,
+        header_args=header_args
+    )
+
+
 # Method inserts Control domain objects #
 def post_control_set(request_data):
     return insert_object_set(
@@ -14,6 +14,32 @@ def get_control_set(request_args, header_args):
     )
 
 
+# Method retrieves aggregates of Control domain objects by given request_args param #
+def get_control_aggregate(request_args, header_args):
+    return get_aggregate(
+        declarative_meta=Control,
+        request_args=request_args,
+        header_args=header_args
+    )
+
+
+# Method streams the insert, update and delete events of Control domain objects #
+def get_control_stream(request_args):
+    return get_change_stream(
+        declarative_meta=Control,
+        request_args=request_args
+    )
+
+
+# Method imports a CSV or NDJSON stream of Control domain objects #
+def import_control_set(stream, header_args):
+    return import_object_set(
+        declarative_meta=Control,
+        stream=stream,
+        header_args=header_args
+    )
+
+
 # Method inserts Control domain objects #
 def post_control_set(request_data):
     return insert_object_set(
@@ -12,7 +12,8 @@ os.environ['CYPHER_TEXT'] = ''
 
 # Configuration for database connection #
 
-
+# Executions of a statement on a connection before the psycopg driver prepares it server side #
+os.environ['pgsql_prepare_threshold'] = '5'
 
 # ------------------------------------------ Domain ------------------------------------------ #
 
@@ -29,6 +30,106 @@ os.environ['time_valid_masks'] = "%H:%M:%S, %I:%M:%S %p, %H:%M, %I:%M %p, %I:%M:
 
 os.environ['query_limit'] = '*'
 
+# Maximum number of cached CRUD statement templates #
+os.environ['statement_cache_size'] = '512'
+
+# Value counts from which [or] filters are bound as an array or loaded into a temporary table #
+os.environ['or_filter_array_threshold'] = '32'
+os.environ['or_filter_temp_table_threshold'] = '1000'
+
+# Maximum number of cached /sql query verdicts #
+os.environ['sql_verdict_cache_size'] = '256'
+
+# Row cap and fetch chunk size for /sql GET streamed results #
+os.environ['sql_max_rows'] = '10000'
+os.environ['sql_stream_chunk_size'] = '500'
+
+# Chunk size of GET routes responses streamed on formats negotiated by the Accept header #
+os.environ['response_stream_chunk_size'] = '500'
+
+# Total count of paginated GET routes, estimated from the database catalog on tables at least this large #
+os.environ['total_count_exact_threshold'] = '100000'
+os.environ['total_count_estimate_ttl'] = '60'
+
+# Entity tags of GET routes responses: 'version', 'hash' or 'False' #
+os.environ['etag_strategy'] = 'hash'
+
+# Batch get by primary keys routes #
+os.environ['batch_get_max_ids'] = '10000'
+os.environ['batch_get_chunk_size'] = '500'
+
+# Relationships expanded by the expand header #
+os.environ['expand_max_depth'] = '2'
+os.environ['expand_max_fan_out'] = '100'
+
+# Changes routes #
+os.environ['changes_page_size'] = '1000'
+
+# Change feed streams #
+os.environ['change_feed_source'] = ''
+os.environ['change_feed_buffer_size'] = '1000'
+os.environ['change_feed_max_subscribers'] = '100'
+os.environ['change_feed_heartbeat_interval'] = '15'
+os.environ['change_feed_poll_interval'] = '5'
+
+# Multi-operation /_batch route #
+os.environ['batch_max_operations'] = '100'
+
+# Idempotency-Key header store #
+os.environ['idempotency_enabled'] = 'True'
+os.environ['idempotency_store_path'] = 'idempotency.sqlite3'
+os.environ['idempotency_ttl'] = '86400'
+os.environ['idempotency_max_entries'] = '10000'
+os.environ['idempotency_wait_timeout'] = '30'
+
+# Bulk /_import routes #
+os.environ['import_chunk_size'] = '5000'
+os.environ['import_max_rejects'] = '1000'
+
+# Write coalescing for concurrent single object POST requests #
+os.environ['write_coalescing_enabled'] = 'False'
+os.environ['write_coalescing_window_ms'] = '5'
+os.environ['write_coalescing_max_batch'] = '500'
+
+# Retries for transactions chosen as deadlock victims #
+os.environ['deadlock_retry_limit'] = '3'
+os.environ['deadlock_retry_backoff_ms'] = '50'
+
+# ------------------------------------------ Admission Control ------------------------------------------ #
+
+# Concurrent requests allowed by route class, 0 means unlimited #
+os.environ['admission_read_concurrency'] = '0'
+os.environ['admission_write_concurrency'] = '0'
+os.environ['admission_sql_concurrency'] = '0'
+os.environ['admission_queue_size'] = '64'
+os.environ['admission_queue_timeout_ms'] = '1000'
+os.environ['admission_retry_after'] = '1'
+
+# Token bucket rate limit by client, 0 means disabled #
+os.environ['rate_limit_per_second'] = '0'
+os.environ['rate_limit_burst'] = '0'
+os.environ['rate_limit_key_header'] = ''
+os.environ['rate_limit_storage'] = ''
+
+# Statement timeouts in milliseconds by route class, 0 means no timeout #
+os.environ['statement_timeout_read_ms'] = '0'
+os.environ['statement_timeout_write_ms'] = '0'
+os.environ['statement_timeout_sql_ms'] = '0'
+os.environ['statement_timeout_max_ms'] = '0'
+
+# ------------------------------------------ Compression ------------------------------------------ #
+
+# Response compression negotiated by the Accept-Encoding header #
+os.environ['compression_enabled'] = 'True'
+os.environ['compression_min_size'] = '1024'
+os.environ['compression_encodings'] = 'zstd, br, gzip'
+os.environ['compression_levels'] = ''
+
+# ------------------------------------------ Metrics ------------------------------------------ #
+
+# Unauthenticated /metrics route, disabled unless set to 'True' #
+os.environ['metrics_enabled'] = 'False'
+
 # ------------------------------------------ Trace ------------------------------------------ #
 
 # Comment this variable bellow for NO STACKTRACE (production mode off) #
@@ -9,7 +9,8 @@ from src.b_Application.b_Service.b_Custom.SQLService import *
 def sql_direct_get_route():
     # Routing request to /sql many methods #
     result = execute_query(
-        {'HTTP_QUERY': request.environ.get('HTTP_QUERY')}, request.method)
+        {'HTTP_QUERY': request.environ.get('HTTP_QUERY'), 'HTTP_MAXROWS': request.environ.get('HTTP_MAXROWS'),
+         'HTTP_FORMAT': request.environ.get('HTTP_FORMAT')}, request.method)
     return result
 
 
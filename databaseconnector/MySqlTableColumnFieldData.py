@@ -1,6 +1,7 @@
 from databaseconnector.PythonTypesUtils import get_python_type
 from databaseconnector.SqlAlchemyTypesUtils import get_sa_type
 from databaseconnector.ColumnNameFormatter import adding_replace_in_column_name_with_spaces
+from databaseconnector.WatermarkColumnUtils import is_mysql_watermark_column
 
 
 class MySqlTableColumnFieldData:
@@ -15,6 +16,7 @@ class MySqlTableColumnFieldData:
         self.python_type = get_python_type(column['Type'], 'MYSQL')
         self.sa_type = get_sa_type(column['Type'], self.python_type, "MYSQL")
         self.default_value = handle_default_value(column['Default'], self.python_type)
+        self.change_watermark = is_mysql_watermark_column(column)
 
 
 def handle_default_value(default_value, python_type):
@@ -1,6 +1,7 @@
 from databaseconnector.PythonTypesUtils import get_python_type
 from databaseconnector.SqlAlchemyTypesUtils import get_sa_type
 from databaseconnector.ColumnNameFormatter import adding_replace_in_column_name_with_spaces
+from databaseconnector.WatermarkColumnUtils import is_postgresql_watermark_column
 
 class PostgreSqlTableColumnFieldData:
     def __init__(self, column_metadata, pk_status, u_status):
@@ -17,6 +18,7 @@ class PostgreSqlTableColumnFieldData:
             column_metadata['data_type'][:column_metadata['data_type'].index(' ')], self.python_type, 'PgSQL'), column_metadata['character_maximum_length'], column_metadata['numeric_precision'], column_metadata['numeric_scale'], column_metadata)
         self.default_value = self.handle_default_value(
             column_metadata['column_default'], self.python_type, self.auto_increment)
+        self.change_watermark = is_postgresql_watermark_column(column_metadata)
 
     def handle_default_value(self, default_value, python_type, auto_increment):
         if python_type == 'bool' and default_value is not None:
@@ -1,6 +1,7 @@
 from databaseconnector.PythonTypesUtils import get_python_type
 from databaseconnector.SqlAlchemyTypesUtils import get_sa_type
 from databaseconnector.ColumnNameFormatter import adding_replace_in_column_name_with_spaces
+from databaseconnector.WatermarkColumnUtils import is_sql_server_watermark_column
 
 class SqlServerTableColumnFieldData:
     def __init__(self, column_metadata, primary_key_column, unique_column, auto_increment):
@@ -19,6 +20,7 @@ class SqlServerTableColumnFieldData:
 
         self.default_value = handle_default_value(
             column_metadata['COLUMN_DEFAULT'], self.python_type)
+        self.change_watermark = is_sql_server_watermark_column(column_metadata)
 
 
 def handle_default_value(default_value, python_type):
@@ -0,0 +1,23 @@
+# Names of timestamp columns usually kept up to date on every write, by the application or by a trigger #
+watermark_column_names = (
+    'updated_at', 'updatedat', 'updated_on', 'updated', 'modified_at', 'modifiedat', 'modified_on', 'modified',
+    'last_modified', 'last_modified_at', 'last_update', 'last_updated', 'last_updated_at', 'date_updated',
+    'date_modified', 'row_version', 'rowversion'
+)
+
+
+# MySQL columns set to the current timestamp on every update of their row #
+def is_mysql_watermark_column(column):
+    return 'on update' in (column.get('Extra') or '').lower()
+
+
+# SQL Server rowversion columns, listed as timestamp by the information schema #
+def is_sql_server_watermark_column(column_metadata):
+    return (column_metadata.get('DATA_TYPE') or '').lower() in ('timestamp', 'rowversion')
+
+
+# PostgreSQL has no column updated by the database itself, timestamp columns named after an update date are taken as #
+# trigger maintained ones #
+def is_postgresql_watermark_column(column_metadata):
+    return (column_metadata.get('data_type') or '').lower().startswith('timestamp') and \
+        column_metadata['column_name'].lower() in watermark_column_names
@@ -1,3 +1,5 @@
+import re
+
 
 def get_columns_names_str(domain_dict):
     columns_list = [column['key'] for column in domain_dict['Columns']] + \
@@ -87,3 +89,61 @@ def get_self_columns(domain_dict):
                 column['key'] + ' = ' + column['key'] + '\n'
 
     return self_columns_str
+
+
+def get_referenced_column_key(constraint, domain_dict_list):
+    for domain_dict in domain_dict_list:
+        if domain_dict['TableName'] == constraint['referenced_table_name']:
+            for column in domain_dict['Columns'] + domain_dict['Constraints']:
+                if column['name'] == constraint['referenced_column_name']:
+                    return column['key']
+    return constraint['referenced_column_name']
+
+
+def get_relationship_name(name_candidates, used_names):
+    for name in name_candidates:
+        if name and name not in used_names:
+            used_names.add(name)
+            return name
+
+
+# Relationships are named after their foreign key without its id prefix or suffix (id_customer -> customer), the #
+# ones referencing the domain after the referencing table, falling back to longer names on clashes #
+def get_expand_relationships(domain_dict, domain_dict_list):
+    used_names = set(column['key'] for column in domain_dict['Columns'] + domain_dict['Constraints'])
+    relationships = list()
+
+    for constraint in domain_dict['Constraints']:
+        foreign_key_name = re.sub(r'^id_|_id$', '', constraint['key'], flags=re.IGNORECASE)
+        relationship_name = get_relationship_name([
+            foreign_key_name, constraint['referenced_table_name'],
+            f"{constraint['key']}_{constraint['referenced_table_name']}"
+        ], used_names)
+        relationships.append((relationship_name, 'one', constraint['key'], constraint['referenced_table_name'],
+                              get_referenced_column_key(constraint, domain_dict_list)))
+
+    for referencing_domain_dict in domain_dict_list:
+        for constraint in referencing_domain_dict['Constraints']:
+            if constraint['referenced_table_name'] != domain_dict['TableName']:
+                continue
+            relationship_name = get_relationship_name([
+                referencing_domain_dict['TableName'],
+                f"{referencing_domain_dict['TableName']}_{constraint['key']}"
+            ], used_names)
+            relationships.append((relationship_name, 'many', get_referenced_column_key(constraint, domain_dict_list),
+                                  referencing_domain_dict['TableName'], constraint['key']))
+
+    tab = '        '
+    relationships_str = ''
+    for relationship_name, kind, key, related_table_name, related_key in relationships:
+        relationships_str = relationships_str + tab + f'"{relationship_name}": ("{kind}", "{key}", ' \
+                                                      f'"{related_table_name}", "{related_key}"),\n'
+    return relationships_str
+
+
+# The first column detected as kept up to date on every write becomes the watermark of the domain changes route #
+def get_changes_watermark(domain_dict):
+    for column in domain_dict['Columns'] + domain_dict['Constraints']:
+        if column.get('change_watermark'):
+            return f'"{column["key"]}"'
+    return 'None'
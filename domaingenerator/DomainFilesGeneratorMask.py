@@ -21,6 +21,13 @@ class ${declarative_meta}(Base):
 ${sa_columns}
     def __init__(self${columns_init}):
 ${self_columns}
+    # ${declarative_meta} relationships expanded by the expand header #
+    expand_relationships = {
+${expand_relationships}    }
+
+    # ${declarative_meta} watermark attribute of the changes route, None when changes are not tracked #
+    changes_watermark = ${changes_watermark}
+
     # SqlAlchemy ${declarative_meta} JSON schema #
     schema = ${declarative_meta}Schema(many=True)
 
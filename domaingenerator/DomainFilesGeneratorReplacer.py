@@ -2,7 +2,7 @@ from domaingenerator.DomainFilesGeneratorDTOReplacer import *
 
 
 class DomainFilesGeneratorReplacer:
-    def __init__(self, domain_dict):
+    def __init__(self, domain_dict, domain_dict_list):
 
         self.domain_imports = 'import ujson\n'
         self.declarative_meta = domain_dict['ClassName']
@@ -11,3 +11,5 @@ class DomainFilesGeneratorReplacer:
         self.sa_columns = get_sa_columns(domain_dict)
         self.columns_init = get_columns_init(domain_dict)
         self.self_columns = get_self_columns(domain_dict)
+        self.expand_relationships = get_expand_relationships(domain_dict, domain_dict_list)
+        self.changes_watermark = get_changes_watermark(domain_dict)
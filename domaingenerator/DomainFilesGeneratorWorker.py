@@ -7,16 +7,19 @@ from domaingenerator.DomainFilesGeneratorBuilder import *
 
 def generate_domain_files(result_full_path, generated_domains_path):
     domain_list = get_domain_list(os.path.join(result_full_path, 'JSONMetadata'))
-    for domain_file in domain_list:
+    # Every domain is read beforehand, so the relationships referencing each one are known #
+    try:
+        domain_dict_list = [
+            get_domain_dict(os.path.join(result_full_path, 'JSONMetadata', domain_file)) for domain_file in domain_list
+        ]
+    except Exception as e:
+        print(e)
+        return
 
-        try:
-            domain_dict = get_domain_dict(os.path.join(result_full_path, 'JSONMetadata', domain_file))
-        except Exception as e:
-            print(e)
-            return
+    for domain_dict in domain_dict_list:
 
         try:
-            domain_replacer = DomainFilesGeneratorReplacer(domain_dict)
+            domain_replacer = DomainFilesGeneratorReplacer(domain_dict, domain_dict_list)
         except Exception as e:
             print(e)
             return
@@ -13,7 +13,7 @@ from databaseconnector.SqlServerMetadataGeneratorWorker import generate_sqlserve
 from domaingenerator.DomainFilesGeneratorWorker import generate_domain_files
 from apigenerator.b_Workers.DirectoryManager import check_if_base_project_exists
 from apigenerator.b_Workers.ApiGeneratorWorker import generate_python_rest_api
-from apigenerator.e_Enumerables.Enumerables import get_directory_data
+from apigenerator.e_Enumerables.Enumerables import get_directory_data, get_database_driver_relation
 
 
 app = typer.Typer()
@@ -38,12 +38,25 @@ def generate(
     ssh_password_authentication_string: Optional[str] = None,
     ssh_publickey_authentication_string: Optional[str] = None,
     ssl_authentication_string: Optional[str] = None,
+    database_driver: Optional[str] = None,
 ):
     # Application start and database connection
     if (mysql_connection_string or mysql_connection_parameters) and (postgres_connection_string or postgres_connection_parameters) and (sqlserver_connection_string or sqlserver_connection_parameters) and (mariadb_connection_string or mariadb_connection_parameters):
         typer.echo("Please specify only one of: MySQL, PostgreSQL, SQLServer, or MariaDB.")
         return
 
+    if database_driver:
+        selected_db = next((db for db, db_connection in (
+            ('mysql', mysql_connection_string or mysql_connection_parameters),
+            ('pgsql', postgres_connection_string or postgres_connection_parameters),
+            ('mssql', sqlserver_connection_string or sqlserver_connection_parameters),
+            ('mariadb', mariadb_connection_string or mariadb_connection_parameters)
+        ) if db_connection), None)
+        if selected_db and database_driver not in get_database_driver_relation()[selected_db]:
+            typer.echo(f"Database driver '{database_driver}' is not supported for the selected database, supported "
+                       f"drivers are: {', '.join(get_database_driver_relation()[selected_db])}")
+            return
+
     if result_path:
         if check_if_given_result_path_is_unsafe(result_path):
             typer.echo(f"Error: Given result path {result_path} is unsafe to generate API on, please provide another result path, API generation aborted!")
@@ -102,7 +115,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mysql', mysql_params,
-                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication',
+                                         database_driver=database_driver)
             elif ssh_publickey_authentication_string:
                 ssh_publickey_params = extract_ssh_publickey_params(ssh_publickey_authentication_string)
                 generate_mysql_database_metadata(
@@ -114,7 +128,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mysql', mysql_params,
-                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication',
+                                         database_driver=database_driver)
             elif ssl_authentication_string:
                 ssl_params = extract_ssl_params(ssl_authentication_string)
                 generate_mysql_database_metadata(
@@ -126,7 +141,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mysql', mysql_params,
-                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication')
+                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication',
+                                         database_driver=database_driver)
             else:
                 generate_mysql_database_metadata('mysql', mysql_params, use_pascal_case, result_full_path)
                 # Python Domain Files Generation
@@ -135,7 +151,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mysql', mysql_params,
-                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection')
+                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection',
+                                         database_driver=database_driver)
         except Exception as e:
             typer.echo(e)
             return
@@ -161,7 +178,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'pgsql',
                                          postgres_params,
-                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication',
+                                         database_driver=database_driver)
             elif ssh_publickey_authentication_string:
                 ssh_publickey_params = extract_ssh_publickey_params(ssh_publickey_authentication_string)
                 generate_postgresql_database_metadata('pgsql', postgres_params, use_pascal_case, result_full_path,
@@ -173,7 +191,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'pgsql',
                                          postgres_params,
-                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication',
+                                         database_driver=database_driver)
             elif ssl_authentication_string:
                 ssl_params = extract_ssl_params(ssl_authentication_string)
                 generate_postgresql_database_metadata('pgsql', postgres_params, use_pascal_case, result_full_path,
@@ -185,7 +204,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'pgsql',
                                          postgres_params,
-                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication')
+                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication',
+                                         database_driver=database_driver)
             else:
                 generate_postgresql_database_metadata('pgsql', postgres_params, use_pascal_case, result_full_path)
                 # Python Domain Files Generation
@@ -194,7 +214,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'pgsql', postgres_params,
-                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection')
+                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection',
+                                         database_driver=database_driver)
         except Exception as e:
             typer.echo(repr(e))
             return
@@ -220,7 +241,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mssql',
                                          sqlserver_params,
-                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication',
+                                         database_driver=database_driver)
             elif ssh_publickey_authentication_string:
                 ssh_publickey_params = extract_ssh_publickey_params(ssh_publickey_authentication_string)
                 generate_sqlserver_database_metadata('mssql', sqlserver_params, use_pascal_case, result_full_path,
@@ -232,7 +254,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mssql',
                                          sqlserver_params,
-                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication',
+                                         database_driver=database_driver)
             elif ssl_authentication_string:
                 ssl_params = extract_ssl_params(ssl_authentication_string)
                 generate_sqlserver_database_metadata('mssql', sqlserver_params, use_pascal_case, result_full_path,
@@ -244,7 +267,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mssql',
                                          sqlserver_params,
-                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication')
+                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication',
+                                         database_driver=database_driver)
             else:
                 generate_sqlserver_database_metadata('mssql', sqlserver_params, use_pascal_case, result_full_path)
                 # Python Domain Files Generation
@@ -253,7 +277,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mssql', sqlserver_params,
-                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection')
+                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection',
+                                         database_driver=database_driver)
         except Exception as e:
             typer.echo(e)
             return
@@ -279,7 +304,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mariadb',
                                          mariadb_params,
-                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_params, 'ssh_password_authentication',
+                                         database_driver=database_driver)
             elif ssh_publickey_authentication_string:
                 ssh_publickey_params = extract_ssh_publickey_params(ssh_publickey_authentication_string)
                 generate_mysql_database_metadata('mariadb', mariadb_params, use_pascal_case, result_full_path,
@@ -291,7 +317,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mariadb',
                                          mariadb_params,
-                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication')
+                                         base_project_exists, project_name, uid_type, ssh_publickey_params, 'ssh_publickey_authentication',
+                                         database_driver=database_driver)
             elif ssl_authentication_string:
                 ssl_params = extract_ssl_params(ssl_authentication_string)
                 generate_mysql_database_metadata('mariadb', mariadb_params, use_pascal_case, result_full_path,
@@ -303,7 +330,8 @@ def generate(
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mariadb',
                                          mariadb_params,
-                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication')
+                                         base_project_exists, project_name, uid_type, ssl_params, 'ssl_authentication',
+                                         database_driver=database_driver)
             else:
                 generate_mysql_database_metadata('mariadb', mariadb_params, use_pascal_case, result_full_path)
                 # Python Domain Files Generation
@@ -312,7 +340,8 @@ def generate(
                 generate_domain_files(result_full_path, generated_domains_path)
                 # PythonRest API Generation
                 generate_python_rest_api(result_full_path, generated_domains_path, us_datetime, 'mariadb', mariadb_params,
-                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection')
+                                         base_project_exists, project_name, uid_type, db_authentication_method='direct_connection',
+                                         database_driver=database_driver)
         except Exception as e:
             typer.echo(e)
             return
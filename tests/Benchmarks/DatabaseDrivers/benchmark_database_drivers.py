@@ -0,0 +1,156 @@
+# System Imports #
+import argparse
+import datetime
+import importlib
+import random
+import time
+
+# SqlAlchemy Imports #
+import sqlalchemy as sa
+
+
+# Drivers available for each database type and their SqlAlchemy dialect #
+DATABASE_DRIVERS = {
+    'pgsql': {'psycopg2': 'postgresql+psycopg2', 'psycopg': 'postgresql+psycopg'},
+    'mysql': {'pymysql': 'mysql+pymysql', 'mysqlclient': 'mysql+mysqldb'},
+}
+
+DRIVER_MODULES = {
+    'psycopg2': 'psycopg2',
+    'psycopg': 'psycopg',
+    'pymysql': 'pymysql',
+    'mysqlclient': 'MySQLdb',
+}
+
+BENCHMARK_TABLE_NAME = 'pythonrest_driver_benchmark'
+
+
+def build_benchmark_table(metadata):
+    return sa.Table(
+        BENCHMARK_TABLE_NAME, metadata,
+        sa.Column('id_benchmark', sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column('name', sa.String(64), nullable=False),
+        sa.Column('amount', sa.Numeric(12, 2), nullable=False),
+        sa.Column('quantity', sa.Integer, nullable=False),
+        sa.Column('created_at', sa.DateTime, nullable=False)
+    )
+
+
+# Method builds the same synthetic row set for every driver so their timings are comparable #
+def build_synthetic_rows(rows, seed):
+    random_generator = random.Random(seed)
+    base_datetime = datetime.datetime(2024, 1, 1)
+    return [
+        {
+            'id_benchmark': i,
+            'name': f'item_{random_generator.randint(0, 10 ** 6)}',
+            'amount': round(random_generator.uniform(0, 10 ** 5), 2),
+            'quantity': random_generator.randint(0, 1000),
+            'created_at': base_datetime + datetime.timedelta(seconds=random_generator.randint(0, 10 ** 7))
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def timed(step):
+    start = time.perf_counter()
+    step()
+    return time.perf_counter() - start
+
+
+# Method runs the synthetic workload against one driver and returns each step elapsed time in seconds #
+def run_workload(connection_url, synthetic_rows, lookups, single_inserts):
+    engine = sa.create_engine(connection_url)
+    metadata = sa.MetaData()
+    table = build_benchmark_table(metadata)
+    metadata.drop_all(engine, checkfirst=True)
+    metadata.create_all(engine)
+
+    results = dict()
+    try:
+        def bulk_insert():
+            with engine.begin() as con:
+                con.execute(table.insert(), synthetic_rows)
+
+        def full_scan():
+            with engine.connect() as con:
+                con.execute(sa.select(table)).fetchall()
+
+        def point_lookups():
+            lookup_ids = [synthetic_rows[i % len(synthetic_rows)]['id_benchmark'] for i in range(lookups)]
+            statement = sa.select(table).where(table.c.id_benchmark == sa.bindparam('lookup_id'))
+            with engine.connect() as con:
+                for lookup_id in lookup_ids:
+                    con.execute(statement, {'lookup_id': lookup_id}).fetchall()
+
+        def single_row_inserts():
+            first_id = len(synthetic_rows) + 1
+            for i in range(single_inserts):
+                row = dict(synthetic_rows[i % len(synthetic_rows)], id_benchmark=first_id + i)
+                with engine.begin() as con:
+                    con.execute(table.insert(), row)
+
+        results['bulk_insert'] = timed(bulk_insert)
+        results['full_scan'] = timed(full_scan)
+        results['point_lookups'] = timed(point_lookups)
+        results['single_row_inserts'] = timed(single_row_inserts)
+    finally:
+        metadata.drop_all(engine, checkfirst=True)
+        engine.dispose()
+    return results
+
+
+def is_driver_installed(driver):
+    try:
+        importlib.import_module(DRIVER_MODULES[driver])
+        return True
+    except ImportError:
+        return False
+
+
+def print_results(db, results, rows, lookups, single_inserts):
+    print(f'\n{db} ({rows} rows, {lookups} point lookups, {single_inserts} single row inserts)')
+    print(f"{'driver':<14}{'bulk_insert':>14}{'full_scan':>14}{'point_lookups':>16}{'single_inserts':>16}{'scan rows/s':>14}")
+    for driver, driver_results in results.items():
+        print(f"{driver:<14}"
+              f"{driver_results['bulk_insert'] * 1000:>12.1f}ms"
+              f"{driver_results['full_scan'] * 1000:>12.1f}ms"
+              f"{driver_results['point_lookups'] * 1000:>14.1f}ms"
+              f"{driver_results['single_row_inserts'] * 1000:>14.1f}ms"
+              f"{rows / driver_results['full_scan']:>14.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the database drivers supported by PythonREST generated APIs '
+                                                 'on the same synthetic workload')
+    parser.add_argument('--pgsql-url', help='user:password@host:port/database of a PostgreSQL instance')
+    parser.add_argument('--mysql-url', help='user:password@host:port/schema of a MySQL or MariaDB instance')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--single-inserts', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs is reported for each driver')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_urls = {'pgsql': args.pgsql_url, 'mysql': args.mysql_url}
+    if not any(database_urls.values()):
+        parser.error('at least one of --pgsql-url or --mysql-url must be provided')
+
+    synthetic_rows = build_synthetic_rows(args.rows, args.seed)
+
+    for db, database_url in database_urls.items():
+        if not database_url:
+            continue
+        db_results = dict()
+        for driver, dialect in DATABASE_DRIVERS[db].items():
+            if not is_driver_installed(driver):
+                print(f'Skipping {driver}: driver is not installed')
+                continue
+            runs = [run_workload(f'{dialect}://{database_url}', synthetic_rows, args.lookups, args.single_inserts)
+                    for _ in range(args.repeat)]
+            db_results[driver] = {step: min(run[step] for run in runs) for step in runs[0]}
+        print_results(db, db_results, args.rows, args.lookups, args.single_inserts)
+
+
+if __name__ == '__main__':
+    main()